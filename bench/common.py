@@ -0,0 +1,33 @@
+"""Общие помощники бенчмарков (без pygame)."""
+import subprocess
+
+
+def parse_size(text: str):
+    w, h = text.lower().split("x")
+    return int(w), int(h)
+
+
+def stats(samples):
+    ordered = sorted(samples)
+    n = len(ordered)
+
+    def pct(q):
+        return ordered[min(n - 1, int(round(q * (n - 1))))]
+
+    return {
+        "mean": sum(ordered) / n,
+        "p50": pct(0.50),
+        "p99": pct(0.99),
+        "max": ordered[-1],
+    }
+
+
+def git_revision():
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        )
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
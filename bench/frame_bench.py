@@ -0,0 +1,208 @@
+"""Headless-бенчмарк игрового цикла.
+
+Строит Engine на dummy-дисплее SDL, прогоняет сценарий (ходьба,
+копка/посадка/сбор) при постоянном зуме максимально быстро и пишет
+статистику времени кадра по Engine.update и Engine.render в JSON:
+
+    python -m bench.frame_bench --frames 600 --worlds 50x50,200x200,inf \\
+        --tiles 48 --zooms 1.0,1.5 --resolutions 1280x720,1920x1080 \\
+        --output bench_output.json
+
+inf в --worlds — неограниченный потоковый мир (StreamingWorld).
+--phases добавляет разбивку по фазам кадра из FrameProfiler.
+--zoom-steps — отдельный сценарий: колесо мыши попеременно меняет зум
+на ±0.1 от заданного (каждая смена — полный кадр и новый уровень спрайтов).
+"""
+import argparse
+import itertools
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+# окно не нужно: до инициализации pygame переключаемся на dummy-драйвер
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+from core.engine import Engine
+
+from .common import git_revision, parse_size, stats
+
+
+DT = 1.0 / 60.0
+
+# направления ходьбы по кругу, по 90 кадров на каждое
+WALK_SCRIPT = (
+    (pygame.K_d,),
+    (pygame.K_s,),
+    (pygame.K_a,),
+    (pygame.K_w,),
+    (),
+)
+
+
+class ScriptedKeys:
+    """Замена pygame.key.get_pressed() с заданным набором нажатых клавиш."""
+
+    def __init__(self, pressed=()):
+        self.pressed = set(pressed)
+
+    def __getitem__(self, key):
+        return key in self.pressed
+
+
+def _parse_world(text: str):
+    """'WxH' или 'inf' (None — потоковый мир)."""
+    return None if text.lower() == "inf" else parse_size(text)
+
+
+def _world_label(world_size):
+    return "inf" if world_size is None else f"{world_size[0]}x{world_size[1]}"
+
+
+def _scripted_action(engine: Engine):
+    """Копать / сажать / собирать на клетке под героем."""
+    if engine.current_action is not None:
+        return
+    ts = engine.tile_size
+    px, py = engine.player.pos
+    tx, ty = int(px // ts), int(py // ts)
+    world = engine.world
+    if world.can_harvest(tx, ty):
+        engine.start_harvest(tx, ty)
+    elif world.can_plant(tx, ty, "wheat", engine.inventory):
+        engine.start_plant(tx, ty, "wheat")
+    elif world.can_dig(tx, ty):
+        engine.start_dig(tx, ty)
+
+
+def run_config(world_size, tile_size, zoom, resolution, frames, warmup, seed,
+               phases=False, dirty_rects=True, zoom_steps=False):
+    screen = pygame.display.set_mode(resolution)
+    random.seed(seed)
+    engine = Engine(screen, world_size=world_size, tile_size=tile_size, world_seed=seed)
+    engine.zoom = zoom
+    engine.renderer.dirty_rects = dirty_rects
+    engine.inventory.seeds_wheat = 10 ** 6
+
+    profiler = engine.profiler
+    profiler.enabled = phases
+
+    keys = ScriptedKeys()
+    update_ms = []
+    render_ms = []
+    frame_ms = []
+    phase_ms = {name: [] for name in profiler.PHASES}
+
+    for i in range(warmup + frames):
+        keys.pressed = set(WALK_SCRIPT[(i // 90) % len(WALK_SCRIPT)])
+        if zoom_steps and i % 120 == 60:
+            # колесо мыши: попеременно приближаем и отдаляем
+            engine.handle_mousewheel(1 if (i // 120) % 2 == 0 else -1)
+        if i % 30 == 0:
+            _scripted_action(engine)
+        pygame.event.pump()
+
+        profiler.begin_frame()
+        t0 = time.perf_counter()
+        engine.update(DT, keys)
+        t1 = time.perf_counter()
+        engine.render()
+        t2 = time.perf_counter()
+        profiler.end_frame()
+
+        if i >= warmup:
+            update_ms.append((t1 - t0) * 1000.0)
+            render_ms.append((t2 - t1) * 1000.0)
+            frame_ms.append((t2 - t0) * 1000.0)
+            if phases:
+                for name, samples in phase_ms.items():
+                    samples.append(profiler.recent(name, 1)[0] * 1000.0)
+
+    engine.close()
+
+    result = {
+        "world": "inf" if world_size is None else list(world_size),
+        "tile_size": tile_size,
+        "zoom": zoom,
+        "zoom_steps": zoom_steps,
+        "resolution": list(resolution),
+        "frames": frames,
+        "update_ms": stats(update_ms),
+        "render_ms": stats(render_ms),
+        "frame_ms": stats(frame_ms),
+    }
+    if phases:
+        result["phases_ms"] = {name: stats(samples) for name, samples in phase_ms.items()}
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless-бенчмарк кадра Farm Engine")
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--warmup", type=int, default=30)
+    parser.add_argument("--worlds", default="50x50")
+    parser.add_argument("--tiles", default="48")
+    parser.add_argument("--zooms", default="1.0")
+    parser.add_argument("--resolutions", default="1280x720")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--phases", action="store_true",
+                        help="добавить статистику по фазам кадра (FrameProfiler)")
+    parser.add_argument("--full-flip", action="store_true",
+                        help="показывать каждый кадр целиком, без dirty-прямоугольников")
+    parser.add_argument("--zoom-steps", action="store_true",
+                        help="сценарий с шагами зума колесом мыши (±0.1 от --zooms)")
+    parser.add_argument("--output", help="путь к JSON (по умолчанию stdout)")
+    args = parser.parse_args(argv)
+
+    worlds = [_parse_world(v) for v in args.worlds.split(",")]
+    tiles = [int(v) for v in args.tiles.split(",")]
+    zooms = [float(v) for v in args.zooms.split(",")]
+    resolutions = [parse_size(v) for v in args.resolutions.split(",")]
+
+    pygame.init()
+    results = []
+    for world_size, tile_size, zoom, resolution in itertools.product(worlds, tiles, zooms, resolutions):
+        result = run_config(world_size, tile_size, zoom, resolution,
+                            args.frames, args.warmup, args.seed, args.phases,
+                            not args.full_flip, args.zoom_steps)
+        results.append(result)
+        print(
+            f"world={_world_label(world_size)} tile={tile_size} "
+            f"zoom={zoom}{'±0.1' if args.zoom_steps else ''} "
+            f"res={resolution[0]}x{resolution[1]}: "
+            f"update {result['update_ms']['mean']:.3f} ms, "
+            f"render {result['render_ms']['mean']:.3f} ms, "
+            f"p99 {result['frame_ms']['p99']:.3f} ms",
+            file=sys.stderr,
+        )
+    pygame.quit()
+
+    report = {
+        "meta": {
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "platform": platform.platform(),
+            "frames": args.frames,
+            "warmup": args.warmup,
+            "seed": args.seed,
+            "dirty_rects": not args.full_flip,
+            "zoom_steps": args.zoom_steps,
+        },
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""Бенчмарк параллельного роста (ParallelWorld) на огромных картах.
+
+Засаживает всю карту пшеницей со сдвигом по столбцам, чтобы каждый тик
+созревала своя доля культур во всех полосах, и меряет World.update()
+при разном числе процессов пула, плюс одну перемотку advance():
+
+    python -m bench.parallel_bench --size 4096x4096 --workers 0,1,2,4,8 \\
+        --ticks 600 --output parallel_output.json
+
+workers=0 — те же полосы в главном процессе; serial в --workers —
+обычный World(backend="numpy") с кучей дедлайнов (для сравнения,
+заметно дольше строится и требует много памяти).
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+from entities.crop import GROWTH_STAGE_TIME
+from ui.inventory import Inventory
+from world.map import World
+from world.parallel import ParallelWorld
+
+from .common import git_revision, parse_size, stats
+
+
+# шаг симуляции, как у Engine по умолчанию
+DT = 1.0 / 60.0
+
+
+def _default_workers():
+    counts = [0]
+    n = 1
+    while n <= (os.cpu_count() or 1):
+        counts.append(n)
+        n *= 2
+    return ",".join(map(str, counts))
+
+
+def build_world(size, workers, waves):
+    width, height = size
+    if workers == "serial":
+        world = World(width, height, 16, backend="numpy")
+    else:
+        world = ParallelWorld(width, height, 16, workers=int(workers))
+
+    inventory = Inventory()
+    inventory.seeds_wheat = width * height
+    world.dig_area(0, 0, width, height)
+    # волна k сажает столбцы x % waves == k, между волнами — один тик
+    for wave in range(waves):
+        for x in range(wave, width, waves):
+            world.plant_area(x, 0, x + 1, height, "wheat", inventory)
+        world.update(GROWTH_STAGE_TIME / waves)
+    return world
+
+
+def run_config(size, workers, ticks, waves):
+    t0 = time.perf_counter()
+    world = build_world(size, workers, waves)
+    build_s = time.perf_counter() - t0
+
+    tick_ms = []
+    for _ in range(ticks):
+        t0 = time.perf_counter()
+        world.update(DT)
+        tick_ms.append((time.perf_counter() - t0) * 1000.0)
+
+    # перемотка: все культуры проходят по нескольку фаз сразу
+    t0 = time.perf_counter()
+    world.advance(2 * GROWTH_STAGE_TIME)
+    advance_ms = (time.perf_counter() - t0) * 1000.0
+    world.close()
+
+    return {
+        "world": list(size),
+        "workers": workers if workers == "serial" else int(workers),
+        "ticks": ticks,
+        "build_s": build_s,
+        "update_ms": stats(tick_ms),
+        "advance_ms": advance_ms,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Бенчмарк параллельного роста Farm Engine")
+    parser.add_argument("--size", default="4096x4096")
+    parser.add_argument("--workers", default=_default_workers(),
+                        help="число процессов через запятую; 0 — без пула, serial — World")
+    parser.add_argument("--ticks", type=int, default=600)
+    parser.add_argument("--waves", type=int, default=int(GROWTH_STAGE_TIME / DT),
+                        help="на сколько волн разбита посадка (по умолчанию — волна на тик)")
+    parser.add_argument("--output", help="путь к JSON (по умолчанию stdout)")
+    args = parser.parse_args(argv)
+
+    size = parse_size(args.size)
+    results = []
+    for workers in args.workers.split(","):
+        result = run_config(size, workers.strip(), args.ticks, args.waves)
+        results.append(result)
+        print(
+            f"world={size[0]}x{size[1]} workers={result['workers']}: "
+            f"update {result['update_ms']['mean']:.3f} ms, "
+            f"p99 {result['update_ms']['p99']:.3f} ms, "
+            f"advance {result['advance_ms']:.1f} ms",
+            file=sys.stderr,
+        )
+
+    # ускорение относительно одного процесса пула
+    base = next((r for r in results if r["workers"] == 1), None)
+    if base is not None:
+        for result in results:
+            result["speedup"] = base["update_ms"]["mean"] / result["update_ms"]["mean"]
+
+    report = {
+        "meta": {
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "ticks": args.ticks,
+            "waves": args.waves,
+        },
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
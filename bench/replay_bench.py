@@ -0,0 +1,90 @@
+"""Воспроизведение записанной сессии как бенчмарк.
+
+Сессия записывается из игры (python main.py --record session.ferp) и
+прогоняется здесь headless без ожидания реального времени; в конце
+состояние сверяется с записанным:
+
+    python -m bench.replay_bench session.ferp --repeat 3 --output replay_output.json
+
+Код выхода 1, если состояние хоть раз разошлось с записью.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+# окно не нужно: до инициализации pygame переключаемся на dummy-драйвер
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+from core.replay import replay
+
+from .common import git_revision, stats
+
+
+def run_replay(path: str):
+    timings = []
+    t0 = time.perf_counter()
+    _, identical = replay(path, timings)
+    wall_s = time.perf_counter() - t0
+
+    tick_ms = [tick * 1000.0 for tick, _ in timings]
+    render_ms = [render * 1000.0 for _, render in timings]
+    return {
+        "frames": len(timings),
+        "wall_s": wall_s,
+        "identical": identical,
+        "update_ms": stats(tick_ms),
+        "render_ms": stats(render_ms),
+        "frame_ms": stats([a + b for a, b in zip(tick_ms, render_ms)]),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Воспроизведение сессии Farm Engine")
+    parser.add_argument("session", help="лог, записанный main.py --record")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--output", help="путь к JSON (по умолчанию stdout)")
+    args = parser.parse_args(argv)
+
+    pygame.init()
+    results = []
+    for run in range(args.repeat):
+        result = run_replay(args.session)
+        results.append(result)
+        print(
+            f"run {run + 1}: {result['frames']} frames in {result['wall_s']:.2f} s, "
+            f"update {result['update_ms']['mean']:.3f} ms, "
+            f"render {result['render_ms']['mean']:.3f} ms, "
+            f"identical={result['identical']}",
+            file=sys.stderr,
+        )
+    pygame.quit()
+
+    report = {
+        "meta": {
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "platform": platform.platform(),
+            "session": os.path.basename(args.session),
+        },
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if any(result["identical"] is False for result in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""Бенчмарк сервера ферм: сколько ферм одно ядро тикает на 20 Гц.
+
+Поднимает FarmServer в процессе (без сокетов), на каждой ферме — бот,
+который ходит и копает / сажает / собирает через FarmServer.handle_message,
+и подписчик, получающий закодированные изменения. Меряет время тика
+(симуляция всех ферм + команды + кодирование состояния):
+
+    python -m bench.server_bench --farms 100,200,400,800 --ticks 400 \\
+        --output server_output.json
+
+farms_per_core — оценка по самой большой конфигурации: столько ферм
+укладывается в шаг 1 / tick_rate при среднем времени тика.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+from server.host import FarmServer
+
+from .common import git_revision, parse_size, stats
+
+
+# бот отдаёт команду раз в полсекунды игрового времени
+COMMAND_INTERVAL = 0.5
+
+
+def _bot_command(farm, rng: random.Random):
+    if farm.current_action is not None:
+        return None
+    if rng.random() < 0.3:
+        return {"op": "move", "dx": rng.choice((-1, 0, 1)), "dy": rng.choice((-1, 0, 1))}
+    ts = farm.world.tile_size
+    tx, ty = int(farm.player.x // ts), int(farm.player.y // ts)
+    world = farm.world
+    if world.can_harvest(tx, ty):
+        return {"op": "harvest", "x": tx, "y": ty}
+    if world.can_plant(tx, ty, "wheat", farm.inventory):
+        return {"op": "plant", "x": tx, "y": ty, "crop": "wheat"}
+    if world.can_dig(tx, ty):
+        return {"op": "dig", "x": tx, "y": ty}
+    return None
+
+
+def run_config(farm_count, tick_rate, world_size, ticks, warmup, seed):
+    server = FarmServer(tick_rate, world_size)
+    rng = random.Random(seed)
+    sent = [0]
+
+    def send(data: bytes):
+        sent[0] += len(data)
+
+    farms = [server.subscribe(f"farm{i}", send) for i in range(farm_count)]
+    for farm in farms:
+        farm.inventory.seeds_wheat = 10 ** 6
+    command_every = max(1, round(COMMAND_INTERVAL * tick_rate))
+
+    tick_ms = []
+    for i in range(warmup + ticks):
+        if i == warmup:
+            sent[0] = 0
+        t0 = time.perf_counter()
+        # боты разнесены по тикам, как независимые клиенты
+        for index in range(i % command_every, farm_count, command_every):
+            message = _bot_command(farms[index], rng)
+            if message is not None:
+                server.handle_message(farms[index], message)
+        server.tick(server.tick_dt)
+        if i >= warmup:
+            tick_ms.append((time.perf_counter() - t0) * 1000.0)
+
+    result = {
+        "farms": farm_count,
+        "world": list(world_size),
+        "ticks": ticks,
+        "tick_ms": stats(tick_ms),
+        "bytes_per_tick": sent[0] / ticks,
+    }
+    budget_ms = 1000.0 / tick_rate
+    result["fits"] = result["tick_ms"]["p99"] <= budget_ms
+    result["farms_per_core"] = int(farm_count * budget_ms / result["tick_ms"]["mean"])
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Бенчмарк сервера ферм")
+    parser.add_argument("--farms", default="100,200,400")
+    parser.add_argument("--tick-rate", type=float, default=20.0)
+    parser.add_argument("--world", default="32x32")
+    parser.add_argument("--ticks", type=int, default=400)
+    parser.add_argument("--warmup", type=int, default=40)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="путь к JSON (по умолчанию stdout)")
+    args = parser.parse_args(argv)
+
+    world_size = parse_size(args.world)
+    results = []
+    for farm_count in (int(v) for v in args.farms.split(",")):
+        result = run_config(farm_count, args.tick_rate, world_size, args.ticks, args.warmup,
+                            args.seed)
+        results.append(result)
+        print(
+            f"farms={farm_count} world={args.world}: "
+            f"tick {result['tick_ms']['mean']:.3f} ms, p99 {result['tick_ms']['p99']:.3f} ms, "
+            f"{result['bytes_per_tick'] / 1024:.1f} KiB/tick, "
+            f"~{result['farms_per_core']} farms/core at {args.tick_rate:g} Hz",
+            file=sys.stderr,
+        )
+
+    report = {
+        "meta": {
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "tick_rate": args.tick_rate,
+            "ticks": args.ticks,
+            "warmup": args.warmup,
+            "seed": args.seed,
+        },
+        "results": results,
+        "farms_per_core": results[-1]["farms_per_core"] if results else None,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""Бенчмарк представления тайлов: память и горячие циклы по тайлам.
+
+    python -m bench.tile_bench --size 1000x1000 --backends objects,numpy
+
+Для каждого backend сетки пишет в JSON:
+
+    bytes_per_tile  прирост памяти (tracemalloc) на один тайл сетки
+    scan_ms         can_dig + can_harvest по всей карте
+    update_ms       World.update, в котором сменяется фаза у всей карты
+    render_ms       запекание чанков рендера для окна render_tiles²
+
+Сценарий опирается только на публичный API World и Renderer, поэтому
+тот же файл можно прогнать на старой ревизии и сравнить числа.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+# окно не нужно: до инициализации pygame переключаемся на dummy-драйвер
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+from core.renderer import Renderer
+from entities.crop import GROWTH_STAGE_TIME
+from entities.player import Player
+from ui.inventory import Inventory
+from world.grid import make_grid
+from world.map import World
+
+from .common import git_revision, parse_size
+
+
+TILE_SIZE = 48
+
+
+def measure_memory(width: int, height: int, backend: str) -> float:
+    """Байт на тайл у свежей сетки."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        grid = make_grid(width, height, backend)
+        used = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del grid
+    return used / (width * height)
+
+
+def _planted_world(width: int, height: int, backend: str) -> World:
+    """Карта, целиком засаженная за одно действие (у всех один дедлайн)."""
+    world = World(width, height, TILE_SIZE, backend=backend)
+    inventory = Inventory()
+    inventory.seeds_wheat = width * height
+    world.dig_area(0, 0, width, height)
+    world.plant_area(0, 0, width, height, "wheat", inventory)
+    return world
+
+
+def measure_scan(world: World) -> float:
+    t0 = time.perf_counter()
+    for y in range(world.height):
+        for x in range(world.width):
+            world.can_dig(x, y)
+            world.can_harvest(x, y)
+    return (time.perf_counter() - t0) * 1000.0
+
+
+def measure_update(world: World) -> float:
+    t0 = time.perf_counter()
+    world.update(GROWTH_STAGE_TIME)
+    return (time.perf_counter() - t0) * 1000.0
+
+
+def measure_render(world: World, screen, tiles: int) -> float:
+    renderer = Renderer(screen, world, Player(0, 0), Inventory(), dirty_rects=False)
+    chunks = renderer.chunks
+    chunks.max_chunks = 1 << 20
+    n = -(-min(tiles, world.width, world.height) // chunks.chunk_tiles)
+    t0 = time.perf_counter()
+    for cy in range(n):
+        for cx in range(n):
+            chunks.get(cx, cy)
+    return (time.perf_counter() - t0) * 1000.0
+
+
+def run(args):
+    width, height = parse_size(args.size)
+    pygame.init()
+    screen = pygame.display.set_mode((1280, 720))
+
+    results = []
+    for backend in args.backends.split(","):
+        bytes_per_tile = measure_memory(width, height, backend)
+        world = _planted_world(width, height, backend)
+        row = {
+            "backend": backend,
+            "bytes_per_tile": round(bytes_per_tile, 1),
+            "scan_ms": round(measure_scan(world), 1),
+            "update_ms": round(measure_update(world), 1),
+            "render_ms": round(measure_render(world, screen, args.render_tiles), 1),
+        }
+        results.append(row)
+        print(json.dumps(row), file=sys.stderr)
+        world.close()
+
+    pygame.quit()
+    return {
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "size": [width, height],
+        "render_tiles": args.render_tiles,
+        "results": results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Бенчмарк представления тайлов")
+    parser.add_argument("--size", default="1000x1000")
+    parser.add_argument("--backends", default="objects,numpy")
+    parser.add_argument("--render-tiles", type=int, default=256,
+                        help="сторона окна карты (в тайлах), чанки которого запекаются")
+    parser.add_argument("--output", help="файл для JSON (по умолчанию stdout)")
+    args = parser.parse_args(argv)
+
+    report = run(args)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+import math
+from collections import OrderedDict
+
+import pygame
+
+
+def pixel_edge(t: int, tile_size: int, scale: float) -> int:
+    """Пиксель границы тайлов t в мире, масштабированном на scale.
+
+    Тайл tx занимает [edge(tx), edge(tx + 1)): соседние тайлы и чанки
+    стыкуются без щелей, при scale 1.0 это ровно tx * tile_size.
+    """
+    return math.floor(t * tile_size * scale + 0.5)
+
+
+class ChunkCache:
+    """Кэш статического слоя мира, запечённого в поверхности по чанкам.
+
+    Каждый чанк (chunk_tiles x chunk_tiles тайлов) рисуется один раз на
+    каждый масштаб (уровень зума), сразу в экранном разрешении.
+    Когда мир сообщает об изменении тайла, в готовых чанках перерисовывается
+    только этот тайл — при следующем обращении к чанку.
+    """
+
+    def __init__(self, world, draw_tiles, chunk_tiles: int = 16, max_chunks: int = 48):
+        self.world = world
+        # draw_tiles(surface, x0, y0, tiles, scale): тайлы (tx, ty)
+        # в поверхность, левый верхний угол которой — тайл (x0, y0)
+        self.draw_tiles = draw_tiles
+        self.tile_size = world.tile_size
+        self.chunk_tiles = chunk_tiles
+        self.chunk_px = chunk_tiles * self.tile_size
+        self.max_chunks = max_chunks
+
+        # (scale, cx, cy) -> Surface; порядок = давность использования (LRU)
+        self._chunks = OrderedDict()
+        # (scale, cx, cy) -> множество (x, y) тайлов для перерисовки
+        self._dirty = {}
+        # масштабы, для которых запекались чанки
+        self._scales = set()
+
+        world.add_tile_listener(self.invalidate_tile, self.invalidate_area)
+
+    # --- инвалидация ---
+
+    def invalidate_tile(self, x: int, y: int):
+        cx, cy = x // self.chunk_tiles, y // self.chunk_tiles
+        for scale in self._scales:
+            key = (scale, cx, cy)
+            if key in self._chunks:
+                self._dirty.setdefault(key, set()).add((x, y))
+
+    def invalidate_area(self, x0: int, y0: int, x1: int, y1: int):
+        # массовое изменение: задетые чанки проще запечь заново целиком
+        n = self.chunk_tiles
+        for cy in range(y0 // n, (y1 - 1) // n + 1):
+            for cx in range(x0 // n, (x1 - 1) // n + 1):
+                for scale in self._scales:
+                    self._chunks.pop((scale, cx, cy), None)
+                    self._dirty.pop((scale, cx, cy), None)
+
+    def clear(self):
+        self._chunks.clear()
+        self._dirty.clear()
+        self._scales.clear()
+
+    # --- доступ ---
+
+    def edge(self, t: int, scale: float = 1.0) -> int:
+        return pixel_edge(t, self.tile_size, scale)
+
+    def get(self, cx: int, cy: int, scale: float = 1.0):
+        """Готовая поверхность чанка или None, если чанк вне карты или не загружен."""
+        key = (scale, cx, cy)
+        surf = self._chunks.get(key)
+        if surf is None:
+            surf = self._build(cx, cy, scale)
+            if surf is None:
+                return None
+            self._scales.add(scale)
+            self._chunks[key] = surf
+            while len(self._chunks) > self.max_chunks:
+                old_key, _ = self._chunks.popitem(last=False)
+                self._dirty.pop(old_key, None)
+        else:
+            self._chunks.move_to_end(key)
+            dirty = self._dirty.pop(key, None)
+            if dirty:
+                self._redraw_tiles(surf, cx, cy, scale, dirty)
+        return surf
+
+    def _chunk_tile_range(self, cx: int, cy: int):
+        n = self.chunk_tiles
+        x0 = cx * n
+        y0 = cy * n
+        x1 = x0 + n
+        y1 = y0 + n
+        if self.world.bounded:
+            x1 = min(self.world.width, x1)
+            y1 = min(self.world.height, y1)
+        return x0, y0, x1, y1
+
+    def _build(self, cx: int, cy: int, scale: float):
+        x0, y0, x1, y1 = self._chunk_tile_range(cx, cy)
+        if x0 >= x1 or y0 >= y1:
+            return None
+        # вне карты или ещё не загружено (потоковый мир): чанк мира не
+        # меньше чанка рендера, поэтому достаточно проверить углы
+        corners = ((x0, y0), (x1 - 1, y0), (x0, y1 - 1), (x1 - 1, y1 - 1))
+        if not all(self.world.in_bounds(x, y) for x, y in corners):
+            return None
+
+        size = (self.edge(x1, scale) - self.edge(x0, scale),
+                self.edge(y1, scale) - self.edge(y0, scale))
+        surf = pygame.Surface(size)
+        if pygame.display.get_surface() is not None:
+            surf = surf.convert()
+
+        tiles = ((tx, ty) for ty in range(y0, y1) for tx in range(x0, x1))
+        self.draw_tiles(surf, x0, y0, tiles, scale)
+        return surf
+
+    def _redraw_tiles(self, surf, cx: int, cy: int, scale: float, tiles):
+        x0, y0, _, _ = self._chunk_tile_range(cx, cy)
+        self.draw_tiles(surf, x0, y0, tiles, scale)
@@ -1,46 +1,80 @@
-import math
+import time
+
 import pygame
 
 from entities.player import Player
 from ui.inventory import Inventory
+from world.actions import FarmActions
 from world.map import World
+from world.parallel import ParallelWorld
+from world.streaming import StreamingWorld
 from graphics.animations import oscillate
+from .profiler import FrameProfiler
 from .renderer import Renderer
 
 
 class Engine:
-    def __init__(self, screen):
+    def __init__(self, screen, world_size=(50, 50), tile_size: int = 48,
+                 world_backend: str = "objects", sim_rate: float = 60.0,
+                 max_catchup_steps: int = 5, world_seed: int = 0, chunk_store_dir=None,
+                 world_workers: int = 0):
         self.screen = screen
 
         # базовые настройки
         self.windowed_size = screen.get_size()
         self.fullscreen = False
 
-        self.tile_size = 48
-        self.world = World(50, 50, self.tile_size)
-        self.player = Player(self.world.width_px // 2, self.world.height_px // 2)
+        self.tile_size = tile_size
+        # world_size=None — неограниченный потоковый мир
+        if world_size is None:
+            self.world = StreamingWorld(self.tile_size, seed=world_seed, backend=world_backend,
+                                        store_dir=chunk_store_dir)
+        elif world_workers:
+            # огромные карты: рост полосами в пуле процессов (всегда backend numpy)
+            self.world = ParallelWorld(world_size[0], world_size[1], self.tile_size,
+                                       workers=world_workers, seed=world_seed)
+        else:
+            self.world = World(world_size[0], world_size[1], self.tile_size,
+                               backend=world_backend, seed=world_seed)
+        spawn_x, spawn_y = self.world.spawn_point()
+        if not self.world.bounded:
+            self.world.preload(spawn_x, spawn_y)
+        self.player = Player(spawn_x, spawn_y)
         self.inventory = Inventory()
 
-        self.renderer = Renderer(self.screen, self.world, self.player, self.inventory)
+        # зум (рендер масштабирует спрайты под уровни в этих пределах)
+        self.zoom = 1.0
+        self.zoom_min = 0.6
+        self.zoom_max = 2.0
+
+        # замеры фаз кадра (F3 — оверлей, F4 — экспорт трассы)
+        self.profiler = FrameProfiler()
+        self.renderer = Renderer(self.screen, self.world, self.player, self.inventory,
+                                 self.profiler, zoom_range=(self.zoom_min, self.zoom_max))
 
         self.camera_x = 0.0
         self.camera_y = 0.0
 
-        # взаимодействие
-        self.current_action = None
+        # взаимодействие: правила действий — в FarmActions (общие с server.Farm)
+        self.actions = FarmActions(self.world, self.player, self.inventory)
         self.action_menu = None
-        self.interact_range_tiles = 3.0
-
-        # зум
-        self.zoom = 1.0
-        self.zoom_min = 0.6
-        self.zoom_max = 2.0
+        # выделение области мышью: {"start": (tx, ty), "end": (tx, ty)}
+        self.drag_select = None
 
         # время
         self.global_time = 0.0
         self.time_of_day = 0.0
         self.day_length = 120.0  # полный цикл, сек
 
+        # фиксированный шаг симуляции: tick() копит реальное время кадра
+        # и прогоняет update() шагами sim_dt, рендер интерполирует
+        # героя и камеру между двумя последними шагами
+        self.sim_dt = 1.0 / sim_rate
+        self.max_catchup_steps = max_catchup_steps
+        self._accumulator = 0.0
+        self.interp_alpha = 1.0
+        self._prev_state = self._interp_state()
+
     # --- служебные методы ---
 
     def toggle_fullscreen(self):
@@ -51,17 +85,62 @@ class Engine:
             self.screen = pygame.display.set_mode(self.windowed_size)
         self.renderer.screen = self.screen
 
+    def set_screen_size(self, size):
+        """Меняет размер экрана, не трогая режим дисплея (воспроизведение сессии).
+
+        Кадры рисуются во внеэкранную поверхность нужного размера.
+        """
+        size = tuple(size)
+        if size != self.screen.get_size():
+            self.screen = pygame.Surface(size)
+            self.renderer.screen = self.screen
+
+    def install_world(self, world, player, inventory):
+        """Подменяет мир, героя и инвентарь (загрузка сохранения)."""
+        if world is not self.world:
+            self.world.close()
+        self.world = world
+        self.player = player
+        self.inventory = inventory
+        self.tile_size = world.tile_size
+        self.actions = FarmActions(world, player, inventory)
+        self.renderer = Renderer(self.screen, world, player, inventory, self.profiler,
+                                 dirty_rects=self.renderer.dirty_rects,
+                                 zoom_range=(self.zoom_min, self.zoom_max))
+
+        self.action_menu = None
+        self.update_camera()
+        self._accumulator = 0.0
+        self.interp_alpha = 1.0
+        self._prev_state = self._interp_state()
+
+    def close(self):
+        """Освобождает ресурсы мира (чанки на диск, пул процессов)."""
+        self.world.close()
+
+    def toggle_profiler(self):
+        self.profiler.enabled = not self.profiler.enabled
+
+    def export_profile(self):
+        """Сохраняет последние кадры профайлера в Chrome trace JSON."""
+        if not self.profiler.frame_count:
+            return None
+        path = time.strftime("profile_trace_%Y%m%d_%H%M%S.json")
+        self.profiler.export_chrome_trace(path)
+        return path
+
     def handle_mousewheel(self, delta: int):
-        self.zoom += 0.1 * delta
+        # округляем, чтобы шаги по 0.1 попадали ровно в 1.0 без накопления ошибки
+        self.zoom = round(self.zoom + 0.1 * delta, 2)
         self.zoom = max(self.zoom_min, min(self.zoom_max, self.zoom))
 
+    @property
+    def current_action(self):
+        """Текущее действие героя (FarmActions.current) или None."""
+        return self.actions.current
+
     def tile_in_range(self, tile_x: int, tile_y: int) -> bool:
-        ts = self.tile_size
-        px, py = self.player.pos
-        center_x = (tile_x + 0.5) * ts
-        center_y = (tile_y + 0.5) * ts
-        dist = math.hypot(px - center_x, py - center_y)
-        return dist <= self.interact_range_tiles * ts
+        return self.actions.tile_in_range(tile_x, tile_y)
 
     # --- обработка событий ---
 
@@ -71,6 +150,19 @@ class Engine:
                 self.handle_left_click(event.pos)
             elif event.button == 3:
                 self.handle_right_click(event.pos)
+        elif event.type == pygame.MOUSEMOTION:
+            if self.drag_select is not None:
+                self.drag_select["end"] = self.screen_to_tile(event.pos)
+        elif event.type == pygame.MOUSEBUTTONUP:
+            if event.button == 1 and self.drag_select is not None:
+                self.finish_drag_select(event.pos)
+
+    def screen_to_tile(self, screen_pos):
+        mx, my = screen_pos
+        # учёт зума при переводе в мировые координаты
+        world_x = self.camera_x + mx / self.zoom
+        world_y = self.camera_y + my / self.zoom
+        return int(world_x // self.tile_size), int(world_y // self.tile_size)
 
     def handle_left_click(self, pos):
         # сначала HUD
@@ -86,6 +178,30 @@ class Engine:
                     option = self.action_menu["options"][index]
                     self.execute_action(option["id"])
             self.action_menu = None
+            return
+
+        # иначе — начало выделения области
+        tile = self.screen_to_tile(pos)
+        self.drag_select = {"start": tile, "end": tile}
+
+    def selection_area(self):
+        """Выделенный прямоугольник тайлов (x0, y0, x1, y1) или None."""
+        if self.drag_select is None:
+            return None
+        (sx, sy), (ex, ey) = self.drag_select["start"], self.drag_select["end"]
+        return min(sx, ex), min(sy, ey), max(sx, ex) + 1, max(sy, ey) + 1
+
+    def finish_drag_select(self, screen_pos):
+        x0, y0, x1, y1 = self.selection_area()
+        self.drag_select = None
+        if (x1 - x0) * (y1 - y0) <= 1:
+            return
+        # как и одиночные действия — только в радиусе досягаемости (area_range_tiles)
+        reachable = self.actions.area_in_range((x0, y0, x1, y1))
+        if reachable is None:
+            self.action_menu = None
+            return
+        self.open_area_menu(screen_pos, reachable[:4])
 
     def handle_right_click(self, pos):
         # открываем контекстное меню
@@ -94,13 +210,7 @@ class Engine:
     # --- логика контекстного меню и действий ---
 
     def open_action_menu(self, screen_pos):
-        mx, my = screen_pos
-        # учёт зума при переводе в мировые координаты
-        world_x = self.camera_x + mx / self.zoom
-        world_y = self.camera_y + my / self.zoom
-
-        tile_x = int(world_x // self.tile_size)
-        tile_y = int(world_y // self.tile_size)
+        tile_x, tile_y = self.screen_to_tile(screen_pos)
 
         if not self.world.in_bounds(tile_x, tile_y):
             self.action_menu = None
@@ -130,11 +240,44 @@ class Engine:
         if self.world.can_harvest(tile_x, tile_y):
             options.append({"id": "harvest", "label": "Собрать урожай", "tile_x": tile_x, "tile_y": tile_y})
 
+        self._show_menu(screen_pos, options)
+
+    def open_area_menu(self, screen_pos, area):
+        """Меню массовых действий над выделенной областью (в пределах досягаемости)."""
+        actions = self.actions
+        options = []
+        reachable = actions.area_in_range(area)
+        if reachable is None:
+            self.action_menu = None
+            return
+
+        count = actions.count_area("dig", reachable)
+        if count:
+            options.append({"id": "area_dig", "label": f"Вскопать ({count})", "area": area})
+
+        count = actions.count_area("plant", reachable)
+        for crop_type, label in (("wheat", "Посадить пшеницу"), ("tomato", "Посадить томаты")):
+            seeds = min(count, self.inventory.seed_count(crop_type))
+            if seeds:
+                options.append({
+                    "id": f"area_plant_{crop_type}",
+                    "label": f"{label} ({seeds})",
+                    "area": area,
+                })
+
+        count = actions.count_area("harvest", reachable)
+        if count:
+            options.append({"id": "area_harvest", "label": f"Собрать урожай ({count})", "area": area})
+
+        self._show_menu(screen_pos, options)
+
+    def _show_menu(self, screen_pos, options):
         if not options:
             self.action_menu = None
             return
 
         # прямоугольник меню
+        mx, my = screen_pos
         option_height = 26
         width = 200
         height = 10 + option_height * len(options)
@@ -147,7 +290,14 @@ class Engine:
         }
 
     def execute_action(self, action_id: str):
-        if action_id == "dig":
+        if action_id.startswith("area_"):
+            opt = next(o for o in self.action_menu["options"] if o["id"] == action_id)
+            kind = action_id[len("area_"):]
+            crop_type = None
+            if kind.startswith("plant_"):
+                kind, crop_type = kind.split("_", 1)
+            self.start_area_action(kind, opt["area"], crop_type)
+        elif action_id == "dig":
             tx = self.action_menu["options"][0]["tile_x"]
             ty = self.action_menu["options"][0]["tile_y"]
             self.start_dig(tx, ty)
@@ -162,69 +312,85 @@ class Engine:
         self.action_menu = None
 
     def start_dig(self, tile_x: int, tile_y: int):
-        if not self.tile_in_range(tile_x, tile_y):
-            return
-        if not self.world.can_dig(tile_x, tile_y):
-            return
-        self.current_action = {
-            "kind": "dig",
-            "tile_x": tile_x,
-            "tile_y": tile_y,
-            "elapsed": 0.0,
-            "duration": 1.5,
-        }
+        self.actions.start("dig", tile_x, tile_y)
 
     def start_plant(self, tile_x: int, tile_y: int, crop_type: str):
-        if not self.tile_in_range(tile_x, tile_y):
-            return
         # посадка мгновенная, но можно позже добавить прогресс
-        self.world.plant(tile_x, tile_y, crop_type, self.inventory)
+        self.actions.start("plant", tile_x, tile_y, crop_type)
 
     def start_harvest(self, tile_x: int, tile_y: int):
-        if not self.tile_in_range(tile_x, tile_y):
-            return
-        if not self.world.can_harvest(tile_x, tile_y):
-            return
-        self.current_action = {
-            "kind": "harvest",
-            "tile_x": tile_x,
-            "tile_y": tile_y,
-            "elapsed": 0.0,
-            "duration": 2.0,
-        }
+        self.actions.start("harvest", tile_x, tile_y)
+
+    def start_area_action(self, kind: str, area, crop_type=None):
+        """Массовое действие над прямоугольником (см. FarmActions.start_area)."""
+        self.actions.start_area(kind, area, crop_type)
 
     # --- цикл обновления ---
 
-    def update(self, dt: float):
+    def tick(self, frame_dt: float, keys=None) -> int:
+        """Продвигает симуляцию на реальное время кадра фиксированными шагами.
+
+        Возвращает число выполненных шагов. После долгой паузы выполняется
+        не больше max_catchup_steps шагов, остаток отставания отбрасывается.
+        """
+        self._accumulator += frame_dt
+        steps = 0
+        while self._accumulator >= self.sim_dt:
+            if steps >= self.max_catchup_steps:
+                self._accumulator %= self.sim_dt
+                break
+            self._prev_state = self._interp_state()
+            self.update(self.sim_dt, keys)
+            self._accumulator -= self.sim_dt
+            steps += 1
+        self.interp_alpha = self._accumulator / self.sim_dt
+        return steps
+
+    def _interp_state(self):
+        p = self.player
+        return p.x, p.y, p.anim_time, self.camera_x, self.camera_y
+
+    def update(self, dt: float, keys=None):
         self.global_time += dt
         self.time_of_day = (self.time_of_day + dt) % self.day_length
 
-        # действия: пока копаем/собираем, герой не двигается
-        keys = pygame.key.get_pressed()
+        # действия: пока копаем/собираем, герой не двигается.
+        # keys можно передать явно (бенчмарки, воспроизведение ввода).
+        if keys is None:
+            keys = pygame.key.get_pressed()
 
-        if self.current_action is not None:
-            self.current_action["elapsed"] += dt
-            if self.current_action["elapsed"] >= self.current_action["duration"]:
-                self.finish_current_action()
-        else:
+        if not self.actions.update(dt):
             self.player.update(dt, self.world, keys)
+        self.world.stream_around(*self.player.pos)
 
-        self.world.update(dt)
+        with self.profiler.phase("world_update"):
+            self.world.update(dt)
         self.update_camera()
 
-    def finish_current_action(self):
-        if self.current_action is None:
+    def skip_time(self, seconds: float):
+        """Мгновенно проматывает seconds игровых секунд (сон, догонка после загрузки)."""
+        if seconds <= 0:
             return
-        kind = self.current_action["kind"]
-        tx = self.current_action["tile_x"]
-        ty = self.current_action["tile_y"]
 
-        if kind == "dig":
-            self.world.dig(tx, ty)
-        elif kind == "harvest":
-            self.world.harvest(tx, ty, self.inventory)
+        # начатое действие за это время либо завершается, либо продвигается
+        self.actions.advance(seconds)
+        self.action_menu = None
+
+        self.world.advance(seconds)
+        self.global_time += seconds
+        self.time_of_day = (self.time_of_day + seconds) % self.day_length
+
+        # интерполяция не должна "проезжать" через пропущенное время
+        self._accumulator = 0.0
+        self.interp_alpha = 1.0
+        self._prev_state = self._interp_state()
 
-        self.current_action = None
+    def sleep_until_morning(self):
+        # утро — начало цикла суток (первая ключевая точка day/night)
+        self.skip_time((self.day_length - self.time_of_day) % self.day_length)
+
+    def finish_current_action(self):
+        self.actions.finish()
 
     def update_camera(self):
         ts = self.tile_size
@@ -236,6 +402,10 @@ class Engine:
 
         cx = px - view_w / 2
         cy = py - view_h / 2
+        if not self.world.bounded:
+            self.camera_x = cx
+            self.camera_y = cy
+            return
 
         max_x = max(0.0, self.world.width_px - view_w)
         max_y = max(0.0, self.world.height_px - view_h)
@@ -244,13 +414,21 @@ class Engine:
         self.camera_y = max(0.0, min(cy, max_y))
 
     def render(self):
+        # между шагами симуляции показываем промежуточное положение
+        a = self.interp_alpha
+        prev = self._prev_state
+        cur = self._interp_state()
+        px, py, anim_t, cam_x, cam_y = (p + (c - p) * a for p, c in zip(prev, cur))
+
         self.renderer.render(
-            self.camera_x,
-            self.camera_y,
+            cam_x,
+            cam_y,
             self.current_action,
             self.action_menu,
             self.global_time,
             self.zoom,
             self.time_of_day,
             self.day_length,
+            player_state=(px, py, anim_t),
+            selection=self.selection_area(),
         )
@@ -5,8 +5,11 @@ class InputHandler:
     def __init__(self, engine):
         self.engine = engine
 
-    def process_events(self):
-        for event in pygame.event.get():
+    def process_events(self, events=None):
+        """Обрабатывает события кадра; events=None — очередь pygame (иначе — запись сессии)."""
+        if events is None:
+            events = pygame.event.get()
+        for event in events:
             if event.type == pygame.QUIT:
                 return False
 
@@ -18,6 +21,14 @@ class InputHandler:
                     event.key == pygame.K_RETURN and (event.mod & pygame.KMOD_ALT)
                 ):
                     self.engine.toggle_fullscreen()
+                # профайлер кадра: F3 — вкл/выкл с оверлеем, F4 — экспорт трассы
+                if event.key == pygame.K_F3:
+                    self.engine.toggle_profiler()
+                if event.key == pygame.K_F4:
+                    self.engine.export_profile()
+                # сон до утра
+                if event.key == pygame.K_n:
+                    self.engine.sleep_until_morning()
 
             if event.type == pygame.MOUSEWHEEL:
                 self.engine.handle_mousewheel(event.y)
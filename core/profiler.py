@@ -0,0 +1,140 @@
+import json
+import time
+from array import array
+
+
+class _Phase:
+    """Контекст замера одной фазы кадра; переиспользуется, не аллоцируется."""
+
+    __slots__ = ("profiler", "name", "started")
+
+    def __init__(self, profiler, name: str):
+        self.profiler = profiler
+        self.name = name
+        self.started = 0.0
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.profiler._record(self.name, self.started, time.perf_counter())
+        return False
+
+
+class _NullPhase:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class FrameProfiler:
+    """Замеры фаз кадра в кольцевые буферы.
+
+    Выключенный профайлер почти ничего не стоит: phase() сразу отдаёт
+    общий пустой контекст. Фаза может выполняться в кадре несколько раз
+    (шаги симуляции, отрисовка по dirty-прямоугольникам): в durations
+    длительности суммируются, а в трассу уходит каждый вызов отдельно.
+    """
+
+    PHASES = (
+        "events",
+        "world_update",
+        "render_world",
+        "render_player",
+        "day_night",
+        "hud",
+        "flip",
+    )
+
+    def __init__(self, history: int = 300):
+        self.history = history
+        self.enabled = False
+        self.frame_count = 0  # сколько кадров записано всего
+
+        self._in_frame = False
+        self._slot = 0
+        self._epoch = time.perf_counter()
+        self._phases = {name: _Phase(self, name) for name in self.PHASES}
+        self._index = {name: float(i) for i, name in enumerate(self.PHASES)}
+
+        zeros = bytes(8 * history)
+        self.frame_starts = array("d", zeros)
+        self.frame_times = array("d", zeros)
+        self.durations = {name: array("d", zeros) for name in self.PHASES}
+        # вызовы фаз по кадрам: тройки (индекс в PHASES, начало, длительность)
+        self.calls = [array("d") for _ in range(history)]
+
+    # --- запись ---
+
+    def begin_frame(self):
+        self._in_frame = self.enabled
+        if not self._in_frame:
+            return
+        slot = self.frame_count % self.history
+        self._slot = slot
+        self.frame_starts[slot] = time.perf_counter() - self._epoch
+        for name in self.PHASES:
+            self.durations[name][slot] = 0.0
+        del self.calls[slot][:]
+
+    def end_frame(self):
+        if not self._in_frame:
+            return
+        slot = self._slot
+        self.frame_times[slot] = time.perf_counter() - self._epoch - self.frame_starts[slot]
+        self.frame_count += 1
+        self._in_frame = False
+
+    def phase(self, name: str):
+        if not self._in_frame:
+            return _NULL_PHASE
+        return self._phases[name]
+
+    def _record(self, name: str, started: float, finished: float):
+        slot = self._slot
+        self.durations[name][slot] += finished - started
+        self.calls[slot].extend((self._index[name], started - self._epoch, finished - started))
+
+    # --- чтение ---
+
+    def _recent_slots(self, count: int):
+        count = min(count, self.frame_count, self.history)
+        first = self.frame_count - count
+        return [i % self.history for i in range(first, self.frame_count)]
+
+    def recent(self, name: str, count: int):
+        """Длительности фазы (сек) за последние count кадров, от старых к новым."""
+        values = self.frame_times if name == "frame" else self.durations[name]
+        return [values[slot] for slot in self._recent_slots(count)]
+
+    def export_chrome_trace(self, path: str, frames=None):
+        """Пишет последние frames кадров в формате Chrome trace (JSON).
+
+        Файл открывается в chrome://tracing, Perfetto и speedscope.
+        """
+        slots = self._recent_slots(self.history if frames is None else frames)
+        events = []
+        for slot in slots:
+            start = self.frame_starts[slot]
+            events.append({
+                "name": "frame", "ph": "X", "pid": 1, "tid": 1,
+                "ts": start * 1e6, "dur": self.frame_times[slot] * 1e6,
+            })
+            calls = self.calls[slot]
+            for i in range(0, len(calls), 3):
+                events.append({
+                    "name": self.PHASES[int(calls[i])], "ph": "X", "pid": 1, "tid": 1,
+                    "ts": calls[i + 1] * 1e6, "dur": calls[i + 2] * 1e6,
+                })
+
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        return len(slots)
@@ -1,174 +1,529 @@
 import math
+from collections import OrderedDict
+
 import pygame
 
-from graphics.sprite_generator import (
-    create_grass_tile,
-    create_dry_grass_tile,
-    create_soil_tile,
-    create_crop_sprites,
-)
+from graphics.asset_cache import load_sprites
 from graphics.animations import oscillate
+from graphics.mip_cache import MipCache
 from ui.hud import HUD
+from ui.profiler_overlay import ProfilerOverlay
+from world.grid import CROP_TYPES, GROUND_TYPES, STATE_CROP, STATE_GROUND
+from .chunk_cache import ChunkCache, pixel_edge
+from .profiler import FrameProfiler
+
+
+# ключевые точки дня: утро, день, вечер, ночь (цвет, альфа)
+DAY_NIGHT_KEYS = (
+    ((255, 225, 190), 80),   # утро
+    ((255, 255, 255), 0),    # день
+    ((255, 170, 130), 100),  # вечер
+    ((20, 40, 80), 160),     # ночь
+    ((255, 225, 190), 80),   # утро снова, для плавного цикла
+)
+
+# шаг квантования оттенка: меньше перезаливок, разница на глаз незаметна
+TINT_COLOR_STEP = 4
+TINT_ALPHA_STEP = 2
 
 
 class Renderer:
-    def __init__(self, screen, world, player, inventory):
+    # исходный размер спрайта героя до масштабирования
+    HERO_BASE_SIZE = (54, 80)
+    # верх тела без покачивания: feet_y - body_h - 10 = (80 - 6) - 38 - 10
+    HERO_BODY_BASE = 26
+
+    # больше этой доли экрана изменилось — дешевле показать кадр целиком
+    DIRTY_AREA_LIMIT = 0.5
+    # больше прямоугольников — сливаем в один охватывающий
+    MAX_DIRTY_RECTS = 8
+
+    # шаг уровней зума, под которые масштабируются спрайты
+    ZOOM_STEP = 0.05
+
+    def __init__(self, screen, world, player, inventory, profiler=None,
+                 dirty_rects: bool = True, zoom_range=(0.6, 2.0)):
         self.screen = screen
         self.world = world
         self.player = player
         self.inventory = inventory
+        self.profiler = profiler if profiler is not None else FrameProfiler()
 
         self.tile_size = world.tile_size
-        self.grass_tile = create_grass_tile(self.tile_size)
-        self.dry_grass_tile = create_dry_grass_tile(self.tile_size)
-        self.soil_tile = create_soil_tile(self.tile_size)
-        self.crop_sprites = create_crop_sprites(self.tile_size)
+        # спрайты берутся из кэша на диске, генерируются только при первом запуске
+        sprites = load_sprites(self.tile_size)
+        self.grass_tile = sprites["grass"]
+        self.ground_tiles = {name: sprites[name] for name in GROUND_TYPES}
+        self.soil_tile = sprites["soil"]
+        self.crop_sprites = sprites["crops"]
+
+        # статичный слой мира рисуется из атласа пачками Surface.blits:
+        # области атласа по кодам тайла (см. _draw_tiles)
+        self.atlas = sprites["atlas"]
+        rects = sprites["atlas_rects"]
+        self._ground_rects = [rects[name] for name in GROUND_TYPES]
+        self._soil_rect = rects["soil"]
+        self._crop_rects = [None] + [
+            [None] + [self._crop_placement(rects[f"{name}/{stage}"])
+                      for stage in range(1, len(self.crop_sprites[name]))]
+            for name in CROP_TYPES[1:]
+        ]
+        # непрозрачные биомы и грядку дешевле копировать без смешивания альфы
+        self._base_atlas = self.atlas
+        base_rects = (*self._ground_rects, self._soil_rect)
+        if pygame.display.get_surface() is not None and all(
+                self._opaque(self.atlas.subsurface(rect)) for rect in base_rects):
+            self._base_atlas = self.atlas.convert()
+
+        # при зуме != 1 спрайты берутся масштабированными под уровень зума
+        # (см. graphics.mip_cache), мир рисуется сразу в разрешении окна
+        self._sprite_sources = {name: self.atlas.subsurface(rect) for name, rect in rects.items()}
+        self._crop_names = [None] + [
+            [None] + [f"{name}/{stage}" for stage in range(1, len(self.crop_sprites[name]))]
+            for name in CROP_TYPES[1:]
+        ]
+        first, last = (round(z / self.ZOOM_STEP) for z in zoom_range)
+        self.zoom_levels = tuple(round(n * self.ZOOM_STEP, 2) for n in range(first, last + 1))
+        self.mips = MipCache()
+
+        # статичный слой мира (земля, грядки, культуры) кэшируется по чанкам
+        self.chunks = ChunkCache(world, self._draw_tiles)
+        # видимые чанки: пересчитываются, только когда камера уходит с тайла
+        self._visible_key = None
+        self._visible_chunks = []
+
+        # готовые спрайты героя по квантованной позе (LRU)
+        self.hero_cache = OrderedDict()
+        self.hero_cache_size = 256
+
+        # постоянная поверхность для наложения дня/ночи
+        self._tint_surface = None
+        self._tint_color = None
 
         self.hud = HUD()
+        self.profiler_overlay = ProfilerOverlay()
         self.font_menu = pygame.font.SysFont("arial", 14)
 
+        # вывод только изменившихся областей через display.update(rects);
+        # при сдвиге камеры, зуме и шаге оттенка кадр показывается целиком
+        self.dirty_rects = dirty_rects
+        self._frame_key = None
+        self._regions = {}        # имя -> (прямоугольник, подпись содержимого)
+        self._changed_tiles = []  # тайлы, изменённые с прошлого кадра
+        self._changed_areas = []  # прямоугольники тайлов от массовых операций
+        world.add_tile_listener(self._tile_changed, self._area_changed)
+
     # --- основной рендер ---
 
+    def zoom_level(self, zoom: float) -> float:
+        """Ближайший к zoom уровень из zoom_levels — масштаб, в котором рисуется мир."""
+        return min(self.zoom_levels, key=lambda level: abs(level - zoom))
+
     def render(self, camera_x, camera_y, current_action, action_menu,
-               global_time, zoom, time_of_day, day_length):
-        screen_w, screen_h = self.screen.get_size()
+               global_time, zoom, time_of_day, day_length, player_state=None,
+               selection=None):
+        """player_state — (x, y, anim_time) героя для отрисовки, если
+        позиция интерполируется между шагами симуляции; иначе берётся из Player.
+        selection — выделяемый мышью прямоугольник тайлов (x0, y0, x1, y1)."""
+        # мир рисуется прямо в экран спрайтами, масштабированными под уровень
+        # зума, — без буфера и smoothscale всего кадра
+        scale = self.zoom_level(zoom)
+        world_args = (camera_x, camera_y, scale, current_action, global_time,
+                      time_of_day, day_length, player_state, selection)
+        profiler = self.profiler
+
+        if self.dirty_rects:
+            rects = self._dirty_regions(*world_args, action_menu)
+            if rects is not None:
+                if not rects:
+                    return  # ничего не изменилось — экран остаётся прежним
+                for rect in rects:
+                    self.screen.set_clip(rect)
+                    self._draw_world_layers(*world_args)
+                    self._draw_screen_layers(action_menu)
+                self.screen.set_clip(None)
+                with profiler.phase("flip"):
+                    pygame.display.update(rects)
+                return
+
+        self._draw_world_layers(*world_args)
+        self._draw_screen_layers(action_menu)
+
+        with profiler.phase("flip"):
+            pygame.display.flip()
+
+    def _draw_world_layers(self, camera_x, camera_y, scale, current_action,
+                           global_time, time_of_day, day_length, player_state, selection):
+        """Мир, герой, полоска действия и оттенок суток — всё, что зависит от зума."""
+        profiler = self.profiler
+
+        with profiler.phase("render_world"):
+            self.screen.fill((5, 5, 10))
+            self.render_world(camera_x, camera_y, scale)
+            if selection is not None:
+                self.render_selection(selection, camera_x, camera_y, scale)
+        with profiler.phase("render_player"):
+            self.render_player(camera_x, camera_y, global_time, current_action, player_state,
+                               scale)
 
-        # размеры окна мира в зависимости от зума
-        view_w = max(1, int(screen_w / zoom))
-        view_h = max(1, int(screen_h / zoom))
+        if current_action:
+            self.render_action_progress(current_action, camera_x, camera_y, scale)
 
-        world_surface = pygame.Surface((view_w, view_h), pygame.SRCALPHA)
+        # Наложение по времени суток
+        with profiler.phase("day_night"):
+            self.apply_day_night(self.screen, time_of_day, day_length)
 
-        # Временная подмена self.screen, чтобы использовать существующие методы
-        original_screen = self.screen
-        self.screen = world_surface
+    def _draw_screen_layers(self, action_menu):
+        # HUD и контекстное меню не зависят от зума
+        with self.profiler.phase("hud"):
+            self.hud.draw(self.screen, self.inventory)
+        if action_menu:
+            self.render_action_menu(action_menu)
 
-        self.screen.fill((5, 5, 10))
-        self.render_world(camera_x, camera_y)
-        self.render_player(camera_x, camera_y, global_time, current_action)
+        if self.profiler.enabled:
+            self.profiler_overlay.draw(self.screen, self.profiler)
 
-        if current_action:
-            self.render_action_progress(current_action, camera_x, camera_y)
+    # --- изменившиеся области ---
 
-        # Наложение по времени суток
-        self.apply_day_night(world_surface, time_of_day, day_length)
+    def _tile_changed(self, x: int, y: int):
+        self._changed_tiles.append((x, y))
 
-        # Возвращаем основной экран
-        self.screen = original_screen
+    def _area_changed(self, x0: int, y0: int, x1: int, y1: int):
+        self._changed_areas.append((x0, y0, x1, y1))
 
-        # Масштабируем мир под фактический размер окна
-        scaled_world = pygame.transform.smoothscale(world_surface, (screen_w, screen_h))
-        self.screen.blit(scaled_world, (0, 0))
+    def _dirty_regions(self, camera_x, camera_y, scale, current_action, global_time,
+                       time_of_day, day_length, player_state, selection, action_menu):
+        """Прямоугольники экрана, изменившиеся с прошлого кадра.
 
-        # HUD и контекстное меню не зависят от зума
-        self.hud.draw(self.screen, self.inventory)
-        if action_menu:
-            self.render_action_menu(action_menu)
+        None — нужен полный кадр: сдвинулась камера, сменился зум, окно
+        или квантованный оттенок суток, либо изменений слишком много.
+        """
+        screen = self.screen
+        frame_key = (camera_x, camera_y, scale, id(screen), screen.get_size(),
+                     self.day_night_tint(time_of_day, day_length))
+        full = frame_key != self._frame_key
+        self._frame_key = frame_key
 
-        pygame.display.flip()
+        # (прямоугольник, подпись): область грязная, если изменилось любое из двух
+        pose, _, hero_rect = self._player_sprite(camera_x, camera_y, global_time,
+                                                 current_action, player_state, scale)
+        regions = {"player": (hero_rect, pose)}
+        if current_action:
+            bg_rect, inner_rect = self._progress_rects(current_action, camera_x, camera_y, scale)
+            regions["progress"] = (bg_rect, inner_rect.width)
+        if action_menu:
+            regions["menu"] = (action_menu["rect"].inflate(6, 6), id(action_menu))
+        if selection is not None:
+            regions["selection"] = (self._tile_rect(*selection, camera_x, camera_y, scale), selection)
+        hud_key, hud_rect = self.hud.layer_key(screen, self.inventory)
+        regions["hud"] = (hud_rect, hud_key)
+        if self.profiler.enabled:
+            regions["overlay"] = (self.profiler_overlay.rect(self.profiler), self.profiler.frame_count)
+
+        previous = self._regions
+        self._regions = regions
+        changed_tiles = self._changed_tiles
+        self._changed_tiles = []
+        changed_areas = self._changed_areas
+        self._changed_areas = []
+        if full:
+            return None
+
+        rects = []
+        for name in previous.keys() | regions.keys():
+            old = previous.get(name)
+            new = regions.get(name)
+            if old == new:
+                continue
+            rects.extend(region[0] for region in (old, new) if region is not None)
+
+        # культура может выступать над своим тайлом
+        overhang = pixel_edge(1, self.tile_size, scale) // 2
+        for tx, ty in changed_tiles:
+            changed_areas.append((tx, ty, tx + 1, ty + 1))
+        for area in changed_areas:
+            rect = self._tile_rect(*area, camera_x, camera_y, scale)
+            rects.append(pygame.Rect(rect.x, rect.y - overhang, rect.w, rect.h + overhang))
+
+        return self._merge_rects(rects, screen.get_rect())
+
+    def _merge_rects(self, rects, screen_rect):
+        rects = [r.clip(screen_rect) for r in rects]
+        rects = [r for r in rects if r.w > 0 and r.h > 0]
+
+        merged = []
+        for rect in rects:
+            # поглощаем всё, что пересекается с новым прямоугольником
+            hits = rect.collidelistall(merged)
+            while hits:
+                for i in reversed(hits):
+                    rect.union_ip(merged.pop(i))
+                hits = rect.collidelistall(merged)
+            merged.append(rect)
+
+        if len(merged) > self.MAX_DIRTY_RECTS:
+            merged = [merged[0].unionall(merged[1:])]
+        area = sum(r.w * r.h for r in merged)
+        if area > self.DIRTY_AREA_LIMIT * screen_rect.w * screen_rect.h:
+            return None
+        return merged
 
     # --- день/ночь ---
 
     def apply_day_night(self, surface: pygame.Surface, time_of_day: float, day_length: float):
-        if day_length <= 0:
+        tint = self.day_night_tint(time_of_day, day_length)
+        if tint is None:
             return
-        t = (time_of_day % day_length) / day_length  # 0..1
 
-        # ключевые точки: утро, день, вечер, ночь
-        key = [
-            ((255, 225, 190), 80),   # утро
-            ((255, 255, 255), 0),    # день
-            ((255, 170, 130), 100),  # вечер
-            ((20, 40, 80), 160),     # ночь
-            ((255, 225, 190), 80),   # утро снова, для плавного цикла
-        ]
+        # Постоянная поверхность без попиксельной альфы: заливаем её только
+        # при смене квантованного цвета, прозрачность задаётся set_alpha.
+        size = surface.get_size()
+        overlay = self._tint_surface
+        if overlay is None or overlay.get_size() != size:
+            overlay = pygame.Surface(size)
+            if pygame.display.get_surface() is not None:
+                overlay = overlay.convert()
+            self._tint_surface = overlay
+            self._tint_color = None
+
+        r, g, b, a = tint
+        if self._tint_color != (r, g, b):
+            overlay.fill((r, g, b))
+            self._tint_color = (r, g, b)
+        overlay.set_alpha(a)
+        surface.blit(overlay, (0, 0))
+
+    @staticmethod
+    def day_night_tint(time_of_day: float, day_length: float):
+        """Квантованный (r, g, b, a) оттенок времени суток или None днём."""
+        if day_length <= 0:
+            return None
+        t = (time_of_day % day_length) / day_length  # 0..1
 
         pos = t * 4.0
         i = int(pos)
         frac = pos - i
         i = max(0, min(3, i))
 
-        (c1, a1) = key[i]
-        (c2, a2) = key[i + 1]
+        (c1, a1) = DAY_NIGHT_KEYS[i]
+        (c2, a2) = DAY_NIGHT_KEYS[i + 1]
+
+        a = int(a1 + (a2 - a1) * frac)
+        a -= a % TINT_ALPHA_STEP
+        if a <= 0:
+            return None
 
+        step = TINT_COLOR_STEP
         r = int(c1[0] + (c2[0] - c1[0]) * frac)
         g = int(c1[1] + (c2[1] - c1[1]) * frac)
         b = int(c1[2] + (c2[2] - c1[2]) * frac)
-        a = int(a1 + (a2 - a1) * frac)
+        return r - r % step, g - g % step, b - b % step, a
 
-        if a <= 0:
-            return
+    # --- мир ---
 
-        overlay = pygame.Surface(surface.get_size(), pygame.SRCALPHA)
-        overlay.fill((r, g, b, a))
-        surface.blit(overlay, (0, 0))
+    def render_world(self, camera_x, camera_y, scale: float = 1.0):
+        ts = self.tile_size
+        key = (int(camera_x // ts), int(camera_y // ts), self.screen.get_size(), scale)
+        if key != self._visible_key:
+            self._visible_key = key
+            self._visible_chunks = self._visible_chunk_range(*key)
+
+        chunks = self.chunks
+        n = chunks.chunk_tiles
+        # пиксель экрана = пиксель масштабированного мира - origin
+        origin_x = math.ceil(camera_x * scale)
+        origin_y = math.ceil(camera_y * scale)
+        batch = []
+        for cx, cy in self._visible_chunks:
+            chunk = chunks.get(cx, cy, scale)
+            if chunk is None:
+                continue
+            batch.append((chunk, (chunks.edge(cx * n, scale) - origin_x,
+                                  chunks.edge(cy * n, scale) - origin_y)))
+        self.screen.blits(batch, doreturn=False)
+
+    def _tile_rect(self, x0, y0, x1, y1, camera_x, camera_y, scale):
+        """Прямоугольник экрана, занятый тайлами [x0, x1) x [y0, y1)."""
+        ts = self.tile_size
+        left = pixel_edge(x0, ts, scale)
+        top = pixel_edge(y0, ts, scale)
+        return pygame.Rect(left - math.ceil(camera_x * scale), top - math.ceil(camera_y * scale),
+                           pixel_edge(x1, ts, scale) - left, pixel_edge(y1, ts, scale) - top)
+
+    def _visible_chunk_range(self, tile_x, tile_y, size, scale):
+        """Чанки, которые может задеть экран size, если камера внутри тайла (tile_x, tile_y)."""
+        n = self.chunks.chunk_tiles
+        # последний видимый тайл — не дальше tile + ceil(size / тайл на экране)
+        tile_px = self.tile_size * scale
+        end_x = tile_x + math.ceil(size[0] / tile_px)
+        end_y = tile_y + math.ceil(size[1] / tile_px)
+        return [
+            (cx, cy)
+            for cy in range(tile_y // n, end_y // n + 1)
+            for cx in range(tile_x // n, end_x // n + 1)
+        ]
 
-    # --- мир ---
+    @staticmethod
+    def _opaque(surface) -> bool:
+        w, h = surface.get_size()
+        return pygame.mask.from_surface(surface, 254).count() == w * h
+
+    def _crop_placement(self, rect):
+        """(область атласа, сдвиг) спрайта культуры: низ по центру тайла."""
+        ts = self.tile_size
+        return rect, (ts // 2 - rect.w // 2, ts - rect.h)
+
+    def _draw_tiles(self, surface, x0, y0, tiles, scale: float = 1.0):
+        """Рисует тайлы (tx, ty); левый верхний угол surface — тайл (x0, y0).
+
+        Слои (биом, грядка, культура) уходят тремя вызовами Surface.blits
+        из атласа. Культура не выходит за свой тайл, поэтому картинка та
+        же, что при отрисовке тайл за тайлом.
+        """
+        if scale != 1.0:
+            self._draw_tiles_scaled(surface, x0, y0, tiles, scale)
+            return
 
-    def render_world(self, camera_x, camera_y):
-        screen_w, screen_h = self.screen.get_size()
+        atlas = self.atlas
+        base_atlas = self._base_atlas
+        ground_rects = self._ground_rects
+        soil_rect = self._soil_rect
+        crop_rects = self._crop_rects
+        get_tile = self.world.get_tile
         ts = self.tile_size
 
-        start_x = int(camera_x // ts)
-        start_y = int(camera_y // ts)
-        end_x = int((camera_x + screen_w) // ts) + 1
-        end_y = int((camera_y + screen_h) // ts) + 1
-
-        for ty in range(start_y, end_y):
-            for tx in range(start_x, end_x):
-                tile = self.world.get_tile(tx, ty)
-                if tile is None:
-                    continue
-
-                sx = int(tx * ts - camera_x)
-                sy = int(ty * ts - camera_y)
-
-                # базовая поверхность (трава / сухая трава)
-                base = self.grass_tile
-                if getattr(tile, "ground_type", "grass") == "dry_grass":
-                    base = self.dry_grass_tile
-                self.screen.blit(base, (sx, sy))
-
-                # грядка / растение
-                if tile.type in ("soil", "crop"):
-                    self.screen.blit(self.soil_tile, (sx, sy))
-
-                if tile.type == "crop" and tile.crop_type and tile.growth_stage > 0:
-                    sprites = self.crop_sprites.get(tile.crop_type)
-                    if sprites:
-                        idx = min(tile.growth_stage, len(sprites) - 1)
-                        sprite = sprites[idx]
-                        if sprite:
-                            rect = sprite.get_rect()
-                            rect.midbottom = (sx + ts // 2, sy + ts)
-                            self.screen.blit(sprite, rect)
+        ground, soil, crops = [], [], []
+        for tx, ty in tiles:
+            tile = get_tile(tx, ty)
+            if tile is None:
+                continue
+            sx = (tx - x0) * ts
+            sy = (ty - y0) * ts
+            ground.append((base_atlas, (sx, sy), ground_rects[tile.ground]))
+
+            state = tile.state
+            if state == STATE_GROUND:
+                continue
+            soil.append((base_atlas, (sx, sy), soil_rect))
+
+            stage = tile.growth_stage
+            stages = crop_rects[tile.crop]
+            if state == STATE_CROP and stages and stage > 0:
+                area, (dx, dy) = stages[min(stage, len(stages) - 1)]
+                crops.append((atlas, (sx + dx, sy + dy), area))
+
+        for layer in (ground, soil, crops):
+            surface.blits(layer, doreturn=False)
+
+    def _draw_tiles_scaled(self, surface, x0, y0, tiles, scale):
+        """_draw_tiles в масштабе scale: спрайты из уровня MipCache.
+
+        Тайл занимает [pixel_edge(tx), pixel_edge(tx + 1)), поэтому соседние
+        клетки могут различаться на пиксель — под каждый размер свой спрайт.
+        """
+        level = self.mips.level(scale)
+        sources = self._sprite_sources
+        crop_names = self._crop_names
+        get_tile = self.world.get_tile
+        ts = self.tile_size
+        opaque = self._base_atlas is not self.atlas
+        base_flags = 0 if opaque else pygame.BLEND_PREMULTIPLIED
+        origin_x = pixel_edge(x0, ts, scale)
+        origin_y = pixel_edge(y0, ts, scale)
+
+        ground, soil, crops = [], [], []
+        for tx, ty in tiles:
+            tile = get_tile(tx, ty)
+            if tile is None:
+                continue
+            left = pixel_edge(tx, ts, scale)
+            top = pixel_edge(ty, ts, scale)
+            w = pixel_edge(tx + 1, ts, scale) - left
+            h = pixel_edge(ty + 1, ts, scale) - top
+            dest = (left - origin_x, top - origin_y)
+            name = GROUND_TYPES[tile.ground]
+            ground.append((level.sprite(name, sources[name], (w, h), opaque), dest, None, base_flags))
+
+            state = tile.state
+            if state == STATE_GROUND:
+                continue
+            soil.append((level.sprite("soil", sources["soil"], (w, h), opaque), dest, None, base_flags))
+
+            stage = tile.growth_stage
+            names = crop_names[tile.crop]
+            if state == STATE_CROP and names and stage > 0:
+                name = names[min(stage, len(names) - 1)]
+                source = sources[name]
+                # размер культуры — в той же доле клетки, что и у исходника
+                cw = w * source.get_width() // ts
+                ch = h * source.get_height() // ts
+                sprite = level.sprite(name, source, (cw, ch))
+                crops.append((sprite, (dest[0] + w // 2 - cw // 2, dest[1] + h - ch), None,
+                              pygame.BLEND_PREMULTIPLIED))
+
+        for layer in (ground, soil, crops):
+            surface.blits(layer, doreturn=False)
 
     # --- герой ---
 
-    def render_player(self, camera_x, camera_y, global_time, current_action):
-        px, py = self.player.pos
+    def render_player(self, camera_x, camera_y, global_time, current_action, player_state=None,
+                      scale: float = 1.0):
+        _, sprite, dest_rect = self._player_sprite(camera_x, camera_y, global_time,
+                                                   current_action, player_state, scale)
+        self.screen.blit(sprite, dest_rect)
+
+    def _player_sprite(self, camera_x, camera_y, global_time, current_action, player_state,
+                       scale: float = 1.0):
+        """(поза, спрайт, прямоугольник) героя на экране при масштабе мира scale."""
+        if player_state is None:
+            player_state = (self.player.x, self.player.y, getattr(self.player, "anim_time", 0.0))
+        px, py, anim_t = player_state
         # позиция ног героя в мировой системе
         world_feet_x = px
         world_feet_y = py
 
-        # перевод в координаты поверхности мира
-        screen_feet_x = world_feet_x - camera_x
-        screen_feet_y = world_feet_y - camera_y
+        # перевод в координаты экрана
+        screen_feet_x = (world_feet_x - camera_x) * scale
+        screen_feet_y = (world_feet_y - camera_y) * scale
+
+        pose = self._hero_pose(global_time, current_action, anim_t)
+        # спрайт сразу нужного размера: ключ — поза и уровень зума
+        key = (pose, scale)
+        hero_small = self.hero_cache.get(key)
+        if hero_small is None:
+            hero_small = self._draw_hero(*pose, scale=scale)
+            self.hero_cache[key] = hero_small
+            if len(self.hero_cache) > self.hero_cache_size:
+                self.hero_cache.popitem(last=False)
+        else:
+            self.hero_cache.move_to_end(key)
+
+        dest_rect = hero_small.get_rect()
+        dest_rect.midbottom = (screen_feet_x, screen_feet_y)
+        return pose, hero_small, dest_rect
+
+    def _hero_pose(self, global_time, current_action, anim_t):
+        """Квантованная поза героя — ключ кэша спрайтов.
 
+        Содержит ровно те целые величины, от которых зависит рисунок,
+        поэтому спрайт из кэша совпадает с нарисованным заново.
+        """
         moving = getattr(self.player, "is_moving", False)
-        anim_t = getattr(self.player, "anim_time", 0.0)
 
         action_kind = current_action["kind"] if current_action else None
         action_elapsed = current_action["elapsed"] if current_action else 0.0
 
+        walking = bool(moving and not action_kind)
+        working = action_kind in ("dig", "harvest")
+
         # --- параметры анимации ---
 
-        if moving and not action_kind:
+        if walking:
             # обычная ходьба
             bob = oscillate(anim_t, speed=4.0, magnitude=3.0)
             leg_swing = oscillate(anim_t, speed=9.0, magnitude=5.0)
             arm_swing = oscillate(anim_t, speed=8.5, magnitude=4.0)
-        elif action_kind in ("dig", "harvest"):
+        elif working:
             # герой стоит и работает лопатой — без дёрганий ногами
             cycle_period = 0.8
             phase = (action_elapsed % cycle_period) / cycle_period
@@ -189,8 +544,43 @@ class Renderer:
             leg_swing = 0.0
             arm_swing = 0.0
 
+        body_top = int(self.HERO_BODY_BASE - bob)
+        leg_off = int(leg_swing) if walking else 0
+        arm_off = 0 if working else int(arm_swing)
+
+        shovel = None
+        if working:
+            cycle_period = 0.8
+            phase = (action_elapsed % cycle_period) / cycle_period
+
+            base_len = 42
+
+            if phase < 0.35:  # опускаем лопату в землю
+                angle_deg = 110
+                k = phase / 0.35
+                length = base_len * (0.6 + 0.4 * k)
+            elif phase < 0.7:  # поднимаем с землёй
+                angle_deg = 75
+                k = (phase - 0.35) / 0.35
+                length = base_len * (1.0 - 0.2 * k)
+            else:  # высыпаем землю вперёд
+                angle_deg = 40
+                k = (phase - 0.7) / 0.3
+                length = base_len * (0.8 - 0.4 * k)
+
+            angle = math.radians(angle_deg)
+            # кисть всегда в положительных координатах спрайта,
+            # поэтому int(hand + d) == hand + floor(d)
+            shovel = (
+                math.floor(math.cos(angle) * length),
+                math.floor(math.sin(angle) * length),
+            )
+
+        return working, body_top, leg_off, arm_off, shovel
+
+    def _draw_hero(self, working, body_top, leg_off, arm_off, shovel, scale: float = 1.0):
         # рисуем в более высоком разрешении и скейлим вниз
-        base_w, base_h = 54, 80
+        base_w, base_h = self.HERO_BASE_SIZE
         hero_surf = pygame.Surface((base_w, base_h), pygame.SRCALPHA)
 
         feet_x = base_w // 2
@@ -218,11 +608,8 @@ class Renderer:
         leg_w = 8
         leg_gap = 4
 
-        if moving and not action_kind:
-            left_off = -int(leg_swing)
-            right_off = int(leg_swing)
-        else:
-            left_off = right_off = 0
+        left_off = -leg_off
+        right_off = leg_off
 
         left_leg_rect = pygame.Rect(
             feet_x - leg_gap - leg_w, feet_y - leg_h + left_off, leg_w, leg_h
@@ -253,8 +640,7 @@ class Renderer:
         # --- тело ---
         body_h = 38
         body_w = 26
-        # уменьшаем отступ, чтобы голова точно не вылезала за пределы спрайта
-        body_top = int(feet_y - body_h - 10 - bob)
+        # body_top = feet_y - body_h - 10 - bob (см. HERO_BODY_BASE)
         body_rect = pygame.Rect(feet_x - body_w // 2, body_top, body_w, body_h)
 
         pygame.draw.rect(hero_surf, shirt_mid, body_rect)
@@ -279,13 +665,13 @@ class Renderer:
         arm_h = 18
         arm_w = 6
 
-        if action_kind in ("dig", "harvest"):
+        if working:
             # руки чуть ниже и статичнее, когда держит лопату
             left_arm_y = body_rect.y + 12
             right_arm_y = body_rect.y + 12
         else:
-            left_arm_y = body_rect.y + 10 + int(arm_swing)
-            right_arm_y = body_rect.y + 10 - int(arm_swing)
+            left_arm_y = body_rect.y + 10 + arm_off
+            right_arm_y = body_rect.y + 10 - arm_off
 
         left_arm_rect = pygame.Rect(body_rect.x - arm_w + 2, left_arm_y, arm_w, arm_h)
         right_arm_rect = pygame.Rect(body_rect.right - 2, right_arm_y, arm_w, arm_h)
@@ -343,37 +729,15 @@ class Renderer:
         pygame.draw.ellipse(hero_surf, (210, 190, 150), shine_rect)
 
         # --- лопата при действиях ---
-        if action_kind in ("dig", "harvest"):
+        if shovel is not None:
             shaft_color = (130, 100, 60)
             blade_color = (190, 190, 200)
 
             hand_x = right_arm_rect.centerx + 2
             hand_y = right_arm_rect.centery + 2
 
-            cycle_period = 0.8
-            phase = (action_elapsed % cycle_period) / cycle_period
-
-            base_len = 42
-
-            if phase < 0.35:  # опускаем лопату в землю
-                angle_deg = 110
-                k = phase / 0.35
-                length = base_len * (0.6 + 0.4 * k)
-            elif phase < 0.7:  # поднимаем с землёй
-                angle_deg = 75
-                k = (phase - 0.35) / 0.35
-                length = base_len * (1.0 - 0.2 * k)
-            else:  # высыпаем землю вперёд
-                angle_deg = 40
-                k = (phase - 0.7) / 0.3
-                length = base_len * (0.8 - 0.4 * k)
-
-            angle = math.radians(angle_deg)
-            dx = math.cos(angle) * length
-            dy = math.sin(angle) * length
-
-            end_x = int(hand_x + dx)
-            end_y = int(hand_y + dy)
+            end_x = hand_x + shovel[0]
+            end_y = hand_y + shovel[1]
 
             pygame.draw.line(hero_surf, shaft_color, (hand_x, hand_y), (end_x, end_y), 3)
 
@@ -383,19 +747,23 @@ class Renderer:
             inner = blade_rect.inflate(-4, -3)
             pygame.draw.ellipse(hero_surf, (230, 230, 240), inner)
 
-        # --- масштабируем и рисуем ---
+        # --- масштабируем ---
         # Делаем героя по высоте ~1.5 тайла, чтобы голова и анимация лопаты не обрезались
-        target_h = int(self.tile_size * 1.5)
+        # (в пикселях экрана при масштабе мира scale)
+        target_h = int(self.tile_size * 1.5 * scale)
         scale = target_h / float(base_h) if base_h > 0 else 1.0
         disp_w = int(base_w * scale)
         disp_h = target_h
-        hero_small = pygame.transform.smoothscale(hero_surf, (disp_w, disp_h))
-        dest_rect = hero_small.get_rect()
-        dest_rect.midbottom = (screen_feet_x, screen_feet_y)
-        self.screen.blit(hero_small, dest_rect)
+        return pygame.transform.smoothscale(hero_surf, (disp_w, disp_h))
 
+    def render_action_progress(self, action, camera_x, camera_y, scale: float = 1.0):
+        bg_rect, inner_rect = self._progress_rects(action, camera_x, camera_y, scale)
+        pygame.draw.rect(self.screen, (10, 10, 16), bg_rect)
+        pygame.draw.rect(self.screen, (91, 196, 107), inner_rect)
+        pygame.draw.rect(self.screen, (255, 255, 255), bg_rect, 1)
 
-    def render_action_progress(self, action, camera_x, camera_y):
+    def _progress_rects(self, action, camera_x, camera_y, scale: float = 1.0):
+        """Фон и заполненная часть полоски прогресса действия."""
         tile_x = action["tile_x"]
         tile_y = action["tile_y"]
         elapsed = action["elapsed"]
@@ -405,18 +773,29 @@ class Renderer:
         world_x = tile_x * self.tile_size + self.tile_size // 2
         world_y = tile_y * self.tile_size + 4
 
-        sx = int(world_x - camera_x)
-        sy = int(world_y - camera_y) - 24
+        # полоска висит над тайлом и масштабируется вместе с миром
+        sx = int((world_x - camera_x) * scale)
+        sy = int((world_y - camera_y) * scale) - round(24 * scale)
 
-        bar_width = 70
-        bar_height = 9
+        bar_width = round(70 * scale)
+        bar_height = round(9 * scale)
         bg_rect = pygame.Rect(sx - bar_width // 2, sy, bar_width, bar_height)
-
-        pygame.draw.rect(self.screen, (10, 10, 16), bg_rect)
         inner_rect = pygame.Rect(bg_rect.x + 1, bg_rect.y + 1,
                                  int((bar_width - 2) * t), bar_height - 2)
-        pygame.draw.rect(self.screen, (91, 196, 107), inner_rect)
-        pygame.draw.rect(self.screen, (255, 255, 255), bg_rect, 1)
+        return bg_rect, inner_rect
+
+    # --- выделение области ---
+
+    def render_selection(self, selection, camera_x, camera_y, scale: float = 1.0):
+        rect = self._tile_rect(*selection, camera_x, camera_y, scale)
+        visible = rect.clip(self.screen.get_rect())
+        if visible.w <= 0 or visible.h <= 0:
+            return
+        shade = pygame.Surface(visible.size)
+        shade.fill((255, 255, 255))
+        shade.set_alpha(40)
+        self.screen.blit(shade, visible)
+        pygame.draw.rect(self.screen, (255, 255, 255), rect, max(1, round(2 * scale)))
 
     # --- контекстное меню ---
 
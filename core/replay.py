@@ -0,0 +1,294 @@
+"""Запись ввода и воспроизведение сессии.
+
+Сессия полностью определяется начальными настройками Engine, зерном
+random (броски урожая) и по кадрам: dt кадра, состояние клавиш ходьбы и
+события pygame, которые читают InputHandler и Engine (кроме клавиш
+профайлера и полноэкранного режима, см. SIDE_EFFECT_KEYS). Вместо
+переключения режима экрана пишется его итог — событие VIDEORESIZE с
+новым размером окна (камера и HUD от него зависят); при воспроизведении
+оно меняет только размер внеэкранной поверхности Engine, режим дисплея
+не трогается. Всё это пишется в компактный бинарный лог; replay() прогоняет лог через новый Engine
+без ожидания реального времени и сверяет итоговое состояние с дайджестом,
+записанным в конце сессии.
+
+Формат файла (little-endian), версия 2 (в версии 1 нет VIDEORESIZE):
+
+    заголовок   MAGIC, версия, зерно random, ширина, высота и тайл мира,
+                backend, зерно мира, размер окна, sim_dt, max_catchup_steps
+    кадр        b"F", dt f64, маска клавиш u16, число событий u16,
+                события (тип u8, три поля i32)
+    конец       b"E", SHA-256 состояния (state_digest)
+
+Биомы генерируются из зерна мира и от random не зависят. Потоковый мир
+не записывается: чанки приходят из фонового потока в недетерминированные
+моменты.
+"""
+import hashlib
+import random
+import struct
+import time
+
+import numpy as np
+import pygame
+
+from entities.registry import STATE_CROP
+from world.grid import ArrayTileGrid
+from .engine import Engine
+from .input_handler import InputHandler
+
+
+MAGIC = b"FERP"
+FORMAT_VERSION = 2
+# версии, которые читает read_session
+READ_VERSIONS = (1, 2)
+
+HEADER = struct.Struct("<4sHqIIIBqIIdI")
+FRAME = struct.Struct("<dHH")
+EVENT = struct.Struct("<Biii")
+
+FRAME_TAG = b"F"
+END_TAG = b"E"
+
+BACKENDS = ("objects", "numpy")
+
+# клавиши, которые читает Player.update
+MOVE_KEYS = (
+    pygame.K_w, pygame.K_UP,
+    pygame.K_s, pygame.K_DOWN,
+    pygame.K_a, pygame.K_LEFT,
+    pygame.K_d, pygame.K_RIGHT,
+)
+
+# события, от которых зависит состояние игры, и их поля
+EVENT_TYPES = (
+    pygame.QUIT,
+    pygame.KEYDOWN,
+    pygame.MOUSEBUTTONDOWN,
+    pygame.MOUSEBUTTONUP,
+    pygame.MOUSEMOTION,
+    pygame.MOUSEWHEEL,
+    # новый размер экрана: пишет InputRecorder, не _encode_event
+    pygame.VIDEORESIZE,
+)
+
+# клавиши с побочными эффектами вне симуляции (оверлей профайлера,
+# файл трассы, полноэкранный режим) не пишутся и не воспроизводятся
+SIDE_EFFECT_KEYS = (pygame.K_F3, pygame.K_F4, pygame.K_F11)
+
+class RecordedKeys:
+    """Состояние клавиш ходьбы из лога вместо pygame.key.get_pressed()."""
+
+    def __init__(self, mask: int):
+        self.mask = mask
+
+    def __getitem__(self, key):
+        try:
+            return bool(self.mask >> MOVE_KEYS.index(key) & 1)
+        except ValueError:
+            return False
+
+
+def _key_mask(keys) -> int:
+    return sum(1 << bit for bit, key in enumerate(MOVE_KEYS) if keys[key])
+
+
+def _side_effect(key: int, mod: int) -> bool:
+    # Alt+Enter — тоже полноэкранный режим (см. InputHandler)
+    return key in SIDE_EFFECT_KEYS or (key == pygame.K_RETURN and bool(mod & pygame.KMOD_ALT))
+
+
+def _encode_event(event):
+    kind = event.type
+    if kind == pygame.QUIT:
+        fields = (0, 0, 0)
+    elif kind == pygame.KEYDOWN:
+        if _side_effect(event.key, event.mod):
+            return None
+        fields = (event.key, event.mod, 0)
+    elif kind in (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP):
+        fields = (event.button, *event.pos)
+    elif kind == pygame.MOUSEMOTION:
+        fields = (*event.pos, 0)
+    elif kind == pygame.MOUSEWHEEL:
+        fields = (event.x, event.y, 0)
+    else:
+        return None
+    return EVENT.pack(EVENT_TYPES.index(kind), *fields)
+
+
+def _decode_event(code: int, a: int, b: int, c: int):
+    kind = EVENT_TYPES[code]
+    if kind == pygame.KEYDOWN:
+        return pygame.event.Event(kind, key=a, mod=b)
+    if kind in (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP):
+        return pygame.event.Event(kind, button=a, pos=(b, c))
+    if kind == pygame.MOUSEMOTION:
+        return pygame.event.Event(kind, pos=(a, b))
+    if kind == pygame.MOUSEWHEEL:
+        return pygame.event.Event(kind, x=a, y=b)
+    if kind == pygame.VIDEORESIZE:
+        return pygame.event.Event(kind, size=(a, b), w=a, h=b)
+    return pygame.event.Event(kind)
+
+
+def state_digest(engine) -> bytes:
+    """SHA-256 всего состояния игры, которое может разойтись при воспроизведении."""
+    world = engine.world
+    h = hashlib.sha256()
+
+    states, crops, stages = world.grid.region_codes(0, 0, world.width, world.height)
+    for codes in (states, crops, stages, world.grid.ground_codes()):
+        h.update(np.ascontiguousarray(codes).tobytes())
+    ys, xs = np.nonzero(states == STATE_CROP)
+    deadlines = [world.growth_deadline(x, y) or 0.0 for x, y in zip(xs.tolist(), ys.tolist())]
+    h.update(np.array(deadlines, dtype=np.float64).tobytes())
+
+    player = engine.player
+    inv = engine.inventory
+    h.update(struct.pack(
+        "<9d4I",
+        world.sim_time, engine.global_time, engine.time_of_day,
+        player.x, player.y, player.anim_time,
+        engine.camera_x, engine.camera_y, engine.zoom,
+        inv.seeds_wheat, inv.seeds_tomato, inv.harvest_wheat, inv.harvest_tomato,
+    ))
+    h.update(repr((
+        inv.selected_seed, engine.current_action, engine.drag_select,
+        None if engine.action_menu is None else [o["id"] for o in engine.action_menu["options"]],
+    )).encode("utf-8"))
+    return h.digest()
+
+
+class InputRecorder:
+    """Пишет сессию, начатую с нового Engine, в лог.
+
+    Перед созданием Engine вызывающий засевает random тем же seed
+    (см. main.py), каждый кадр передаёт сюда dt, события и клавиши —
+    те же, что InputHandler уже обработал и что уйдут в Engine.tick.
+    Если за обработку событий размер экрана изменился (F11, Alt+Enter,
+    окно изменили извне), кадр заканчивается событием VIDEORESIZE.
+    """
+
+    def __init__(self, path: str, engine, seed: int):
+        world = engine.world
+        if not world.bounded:
+            raise ValueError("Потоковый мир не записывается: загрузка чанков недетерминирована")
+        self.engine = engine
+        backend = "numpy" if isinstance(world.grid, ArrayTileGrid) else "objects"
+        width, height = engine.screen.get_size()
+        self._size = (width, height)
+
+        self._file = open(path, "wb")
+        self._file.write(HEADER.pack(
+            MAGIC, FORMAT_VERSION, seed, world.width, world.height, world.tile_size,
+            BACKENDS.index(backend), world.seed, width, height,
+            engine.sim_dt, engine.max_catchup_steps,
+        ))
+        self.frames = 0
+
+    def record_frame(self, frame_dt: float, events, keys):
+        encoded = [data for data in map(_encode_event, events) if data is not None]
+        # размер экрана читают только update_camera и рендер, а они идут
+        # после событий кадра — смена размера пишется в конец кадра
+        size = self.engine.screen.get_size()
+        if size != self._size:
+            self._size = size
+            encoded.append(EVENT.pack(EVENT_TYPES.index(pygame.VIDEORESIZE), *size, 0))
+        self._file.write(FRAME_TAG + FRAME.pack(frame_dt, _key_mask(keys), len(encoded)))
+        self._file.write(b"".join(encoded))
+        self.frames += 1
+
+    def close(self):
+        """Завершает лог дайджестом текущего состояния."""
+        if self._file.closed:
+            return
+        self._file.write(END_TAG + state_digest(self.engine))
+        self._file.close()
+
+
+def read_session(path: str):
+    """(настройки, список кадров (dt, RecordedKeys, события), дайджест или None)."""
+    with open(path, "rb") as f:
+        blob = f.read()
+
+    try:
+        (magic, version, seed, width, height, tile_size, backend, world_seed,
+         window_w, window_h, sim_dt, max_catchup_steps) = HEADER.unpack_from(blob, 0)
+    except struct.error:
+        raise ValueError("Лог сессии обрезан") from None
+    if magic != MAGIC or version not in READ_VERSIONS:
+        raise ValueError(f"Неподдерживаемый лог сессии: {magic!r} v{version}")
+    settings = {
+        "seed": seed,
+        "world_size": (width, height),
+        "tile_size": tile_size,
+        "world_backend": BACKENDS[backend],
+        "world_seed": world_seed,
+        "window": (window_w, window_h),
+        "sim_dt": sim_dt,
+        "max_catchup_steps": max_catchup_steps,
+    }
+
+    frames = []
+    digest = None
+    offset = HEADER.size
+    while offset < len(blob):
+        tag = blob[offset:offset + 1]
+        offset += 1
+        if tag == END_TAG:
+            digest = blob[offset:offset + 32]
+            break
+        if tag != FRAME_TAG or offset + FRAME.size > len(blob):
+            break  # сессия оборвалась на записи кадра
+        dt, mask, count = FRAME.unpack_from(blob, offset)
+        offset += FRAME.size
+        if offset + count * EVENT.size > len(blob):
+            break
+        # старые логи могли записать клавиши с побочными эффектами
+        events = [_decode_event(*fields) for fields in EVENT.iter_unpack(
+            blob[offset:offset + count * EVENT.size])
+            if not (EVENT_TYPES[fields[0]] == pygame.KEYDOWN and _side_effect(*fields[1:3]))]
+        offset += count * EVENT.size
+        frames.append((dt, RecordedKeys(mask), events))
+    return settings, frames, digest
+
+
+def replay(path: str, timings=None):
+    """Воспроизводит сессию в новом Engine так быстро, как получится.
+
+    Кадр — как в main.py: события, Engine.tick, рендер (HUD кликабелен
+    только после отрисовки, поэтому рендер обязателен). VIDEORESIZE из лога
+    меняет размер экрана через Engine.set_screen_size, без set_mode. timings, если
+    передан список, получает (tick, render) в секундах на каждый кадр.
+    Возвращает (engine, совпало ли состояние с записанным; None — лог без конца).
+    """
+    settings, frames, digest = read_session(path)
+
+    random.seed(settings["seed"])
+    screen = pygame.display.set_mode(settings["window"])
+    engine = Engine(
+        screen, world_size=settings["world_size"], tile_size=settings["tile_size"],
+        world_backend=settings["world_backend"], sim_rate=1.0 / settings["sim_dt"],
+        max_catchup_steps=settings["max_catchup_steps"], world_seed=settings["world_seed"],
+    )
+    # шаг — ровно записанный, без округления через sim_rate
+    engine.sim_dt = settings["sim_dt"]
+    handler = InputHandler(engine)
+
+    for dt, keys, events in frames:
+        t0 = time.perf_counter()
+        running = handler.process_events(events)
+        for event in events:
+            if event.type == pygame.VIDEORESIZE:
+                engine.set_screen_size(event.size)
+        engine.tick(dt, keys)
+        t1 = time.perf_counter()
+        engine.render()
+        if timings is not None:
+            timings.append((t1 - t0, time.perf_counter() - t1))
+        if not running:
+            break
+    engine.close()
+
+    identical = None if digest is None else state_digest(engine) == digest
+    return engine, identical
@@ -0,0 +1,468 @@
+"""Сохранения: компактный бинарный формат и фоновый автосейв.
+
+Формат файла (little-endian), версия 1:
+
+    заголовок   MAGIC, версия, width, height, tile_size, region_size,
+                смещения блока регионов и слоя биомов
+    состояние   время движка и мира, герой, инвентарь, момент записи
+    регионы     region_size x region_size упакованных записей тайла
+                (state u8, crop u8, stage u8, deadline f64) на регион;
+                слоты фиксированного размера, поэтому изменённые регионы
+                перезаписываются на месте
+    биомы       ground_type, сжатый RLE: серии (длина u32, код u8)
+
+deadline — время симуляции следующей смены фазы (0 — культура не растёт).
+Он не меняется, пока тайл не тронут, поэтому нетронутые регионы в файле
+остаются верными между инкрементальными сохранениями.
+
+Инкрементальное сохранение сначала пишет все изменения в журнал рядом
+с файлом (<path>.journal: JOURNAL_MAGIC, заголовок сохранения, число
+регионов u32, состояние, пары (индекс u32, слот), CRC32 всего
+предыдущего) и только потом переписывает слоты на месте. Если запись
+оборвалась, load_game дописывает целый журнал в файл, а недописанный
+отбрасывает — файл тогда ещё не тронут.
+"""
+import math
+import os
+import struct
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from entities.crop import MAX_GROWTH_STAGE
+from entities.player import Player
+from entities.registry import STATE_CROP
+from ui.inventory import Inventory
+from world.grid import CROP_TYPES, GROUND_TYPES, TILE_STATES
+from world.map import World
+
+
+MAGIC = b"FESV"
+FORMAT_VERSION = 1
+REGION_SIZE = 32
+
+HEADER = struct.Struct("<4sHIIIHQQ")
+STATE = struct.Struct("<6d4IBd")
+TILE_RECORD = np.dtype([
+    ("state", "u1"),
+    ("crop", "u1"),
+    ("stage", "u1"),
+    ("deadline", "<f8"),
+])
+GROUND_RUN = np.dtype([("run", "<u4"), ("code", "u1")])
+
+JOURNAL_MAGIC = b"FESJ"
+JOURNAL_COUNT = struct.Struct("<I")
+JOURNAL_CRC = struct.Struct("<I")
+
+
+class SaveLayout:
+    """Геометрия файла для карты заданного размера."""
+
+    def __init__(self, width: int, height: int, tile_size: int, region_size: int = REGION_SIZE):
+        self.width = width
+        self.height = height
+        self.tile_size = tile_size
+        self.region_size = region_size
+
+        self.regions_x = -(-width // region_size)
+        self.regions_y = -(-height // region_size)
+        self.region_count = self.regions_x * self.regions_y
+        self.slot_size = region_size * region_size * TILE_RECORD.itemsize
+
+        self.state_offset = HEADER.size
+        self.regions_offset = self.state_offset + STATE.size
+        self.ground_offset = self.regions_offset + self.region_count * self.slot_size
+
+    def header(self) -> bytes:
+        return HEADER.pack(
+            MAGIC, FORMAT_VERSION, self.width, self.height, self.tile_size,
+            self.region_size, self.regions_offset, self.ground_offset,
+        )
+
+    def region_of(self, x: int, y: int) -> int:
+        rs = self.region_size
+        return (y // rs) * self.regions_x + x // rs
+
+    def region_bounds(self, index: int):
+        ry, rx = divmod(index, self.regions_x)
+        rs = self.region_size
+        x0, y0 = rx * rs, ry * rs
+        return x0, y0, min(self.width, x0 + rs), min(self.height, y0 + rs)
+
+
+def layout_for(world) -> SaveLayout:
+    if not world.bounded:
+        raise ValueError("Потоковый мир сохраняется по чанкам через ChunkStore")
+    return SaveLayout(world.width, world.height, world.tile_size)
+
+
+# --- упаковка ---
+
+def pack_state(engine) -> bytes:
+    inv = engine.inventory
+    return STATE.pack(
+        engine.global_time,
+        engine.time_of_day,
+        engine.day_length,
+        engine.world.sim_time,
+        engine.player.x,
+        engine.player.y,
+        inv.seeds_wheat,
+        inv.seeds_tomato,
+        inv.harvest_wheat,
+        inv.harvest_tomato,
+        CROP_TYPES.index(inv.selected_seed),
+        time.time(),
+    )
+
+
+def pack_region(world, layout: SaveLayout, index: int) -> bytes:
+    x0, y0, x1, y1 = layout.region_bounds(index)
+    states, crops, stages = world.grid.region_codes(x0, y0, x1, y1)
+
+    rs = layout.region_size
+    records = np.zeros((rs, rs), dtype=TILE_RECORD)
+    h, w = states.shape
+    records["state"][:h, :w] = states
+    records["crop"][:h, :w] = crops
+    records["stage"][:h, :w] = stages
+
+    # дедлайны есть только у растущих культур — их немного
+    for ly, lx in zip(*np.nonzero(states == STATE_CROP)):
+        deadline = world.growth_deadline(x0 + int(lx), y0 + int(ly))
+        if deadline is not None:
+            records["deadline"][ly, lx] = deadline
+    return records.tobytes()
+
+
+def encode_ground_rle(codes: np.ndarray) -> bytes:
+    flat = codes.ravel()
+    starts = np.concatenate(([0], np.flatnonzero(flat[1:] != flat[:-1]) + 1))
+    runs = np.zeros(len(starts), dtype=GROUND_RUN)
+    runs["run"] = np.diff(np.append(starts, len(flat)))
+    runs["code"] = flat[starts]
+    return runs.tobytes()
+
+
+def decode_ground_rle(data: bytes, count: int) -> np.ndarray:
+    runs = np.frombuffer(data, dtype=GROUND_RUN)
+    # сумму проверяем до repeat: испорченная длина серии не раздует память
+    if int(runs["run"].sum(dtype=np.uint64)) != count:
+        raise ValueError("Повреждённый слой биомов в сохранении")
+    return np.repeat(runs["code"], runs["run"])
+
+
+def take_snapshot(engine, layout: SaveLayout, regions=None) -> dict:
+    """Снимок для записи. regions=None — полный снимок со всеми регионами и биомами.
+
+    Вызывается в главном потоке; дальше снимок — только байты, и его можно
+    писать в фоне, пока мир продолжает меняться.
+    """
+    world = engine.world
+    full = regions is None
+    indices = range(layout.region_count) if full else sorted(regions)
+    return {
+        "full": full,
+        "layout": layout,
+        "state": pack_state(engine),
+        "regions": {index: pack_region(world, layout, index) for index in indices},
+        "ground": encode_ground_rle(world.grid.ground_codes()) if full else None,
+    }
+
+
+def _journal_path(path: str) -> str:
+    return f"{path}.journal"
+
+
+def _write_slots(path: str, layout: SaveLayout, state: bytes, regions: dict):
+    """Переписывает на месте состояние и слоты регионов."""
+    with open(path, "r+b") as f:
+        if f.read(HEADER.size) != layout.header():
+            raise ValueError("Файл сохранения не соответствует текущему миру")
+        f.seek(layout.state_offset)
+        f.write(state)
+        for index, data in regions.items():
+            f.seek(layout.regions_offset + index * layout.slot_size)
+            f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _pack_journal(layout: SaveLayout, state: bytes, regions: dict) -> bytes:
+    parts = [JOURNAL_MAGIC, layout.header(), JOURNAL_COUNT.pack(len(regions)), state]
+    for index, data in regions.items():
+        parts.append(JOURNAL_COUNT.pack(index))
+        parts.append(data)
+    body = b"".join(parts)
+    return body + JOURNAL_CRC.pack(zlib.crc32(body))
+
+
+def _unpack_journal(blob: bytes):
+    """(layout, состояние, {индекс: слот}) или None, если журнал неполный."""
+    body = blob[:-JOURNAL_CRC.size]
+    if (len(blob) < len(JOURNAL_MAGIC) + HEADER.size + JOURNAL_COUNT.size + STATE.size
+            + JOURNAL_CRC.size
+            or not blob.startswith(JOURNAL_MAGIC)
+            or JOURNAL_CRC.unpack_from(blob, len(body))[0] != zlib.crc32(body)):
+        return None
+
+    offset = len(JOURNAL_MAGIC)
+    (_, _, width, height, tile_size, region_size, _, _) = HEADER.unpack_from(body, offset)
+    if not region_size:
+        return None
+    layout = SaveLayout(width, height, tile_size, region_size)
+    offset += HEADER.size
+    (count,) = JOURNAL_COUNT.unpack_from(body, offset)
+    offset += JOURNAL_COUNT.size
+    state = body[offset:offset + STATE.size]
+    offset += STATE.size
+
+    regions = {}
+    for _ in range(count):
+        (index,) = JOURNAL_COUNT.unpack_from(body, offset)
+        offset += JOURNAL_COUNT.size
+        regions[index] = body[offset:offset + layout.slot_size]
+        offset += layout.slot_size
+    if offset != len(body) or any(index >= layout.region_count for index in regions):
+        return None
+    return layout, state, regions
+
+
+def recover_journal(path: str) -> bool:
+    """Дописывает в файл журнал оборванного инкрементального сохранения.
+
+    True — журнал был целым и применён. Недописанный журнал удаляется:
+    пока он пишется, сам файл не меняется.
+    """
+    journal_path = _journal_path(path)
+    try:
+        with open(journal_path, "rb") as f:
+            blob = f.read()
+    except FileNotFoundError:
+        return False
+
+    entry = _unpack_journal(blob)
+    applied = False
+    if entry is not None:
+        try:
+            _write_slots(path, *entry)
+            applied = True
+        except (OSError, ValueError):
+            # журнал от другого мира или файла нет — применять не к чему
+            pass
+    os.remove(journal_path)
+    return applied
+
+
+def write_snapshot(path: str, snapshot: dict):
+    layout = snapshot["layout"]
+    header = layout.header()
+
+    if snapshot["full"]:
+        # полный снимок заменяет файл целиком — старый журнал к нему не относится
+        try:
+            os.remove(_journal_path(path))
+        except FileNotFoundError:
+            pass
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(header)
+            f.write(snapshot["state"])
+            for index in range(layout.region_count):
+                f.write(snapshot["regions"][index])
+            f.write(snapshot["ground"])
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        return
+
+    # инкрементально: состояние и изменённые регионы пишутся на место,
+    # но сначала — в журнал, чтобы оборванная запись не смешала старое и новое
+    with open(path, "rb") as f:
+        if f.read(HEADER.size) != header:
+            raise ValueError("Файл сохранения не соответствует текущему миру")
+    journal_path = _journal_path(path)
+    with open(journal_path, "wb") as f:
+        f.write(_pack_journal(layout, snapshot["state"], snapshot["regions"]))
+        f.flush()
+        os.fsync(f.fileno())
+    _write_slots(path, layout, snapshot["state"], snapshot["regions"])
+    os.remove(journal_path)
+
+
+def save_game(engine, path: str):
+    """Синхронное полное сохранение."""
+    write_snapshot(path, take_snapshot(engine, layout_for(engine.world)))
+
+
+# --- загрузка ---
+
+def load_game(engine, path: str, backend: str = "objects", catch_up: bool = False):
+    """Загружает сохранение в engine.
+
+    catch_up=True догоняет время, прошедшее с момента записи (Engine.skip_time).
+    Повреждённый или обрезанный файл — ValueError, мир engine не трогается.
+    """
+    recover_journal(path)
+    with open(path, "rb") as f:
+        blob = f.read()
+
+    try:
+        (magic, version, width, height, tile_size, region_size,
+         regions_offset, ground_offset) = HEADER.unpack_from(blob, 0)
+    except struct.error:
+        raise ValueError("Файл сохранения обрезан") from None
+    if magic != MAGIC or version != FORMAT_VERSION:
+        raise ValueError(f"Неподдерживаемое сохранение: {magic!r} v{version}")
+    if not (width and height and tile_size and region_size):
+        raise ValueError("Повреждённый заголовок сохранения")
+
+    layout = SaveLayout(width, height, tile_size, region_size)
+    if (regions_offset, ground_offset) != (layout.regions_offset, layout.ground_offset):
+        raise ValueError("Повреждённый заголовок сохранения")
+    if len(blob) < ground_offset:
+        raise ValueError("Файл сохранения обрезан")
+
+    (global_time, time_of_day, day_length, sim_time, player_x, player_y,
+     seeds_wheat, seeds_tomato, harvest_wheat, harvest_tomato,
+     selected_seed, saved_at) = STATE.unpack_from(blob, layout.state_offset)
+    times = (global_time, time_of_day, day_length, sim_time, player_x, player_y, saved_at)
+    if not all(map(math.isfinite, times)) or day_length <= 0.0:
+        raise ValueError("Повреждённое состояние в сохранении")
+    if selected_seed >= len(CROP_TYPES):
+        raise ValueError(f"Неизвестные семена в сохранении: {selected_seed}")
+
+    codes = decode_ground_rle(blob[ground_offset:], width * height)
+    if codes.max() >= len(GROUND_TYPES):
+        raise ValueError("Неизвестный биом в сохранении")
+
+    rs = region_size
+    regions = []
+    for index in range(layout.region_count):
+        start = regions_offset + index * layout.slot_size
+        records = np.frombuffer(blob, dtype=TILE_RECORD, count=rs * rs, offset=start)
+        records = records.reshape(rs, rs)
+
+        x0, y0, x1, y1 = layout.region_bounds(index)
+        records = records[:y1 - y0, :x1 - x0]
+        if (records["state"].max() >= len(TILE_STATES)
+                or records["crop"].max() >= len(CROP_TYPES)
+                or records["stage"].max() > MAX_GROWTH_STAGE
+                or not np.isfinite(records["deadline"]).all()):
+            raise ValueError(f"Повреждённый регион {index} в сохранении")
+        regions.append((x0, y0, records))
+
+    world = World(width, height, tile_size, backend=backend, generate=False)
+    world.sim_time = sim_time
+    world.grid.set_ground_codes(codes.reshape(height, width))
+    for x0, y0, records in regions:
+        world.grid.set_region_codes(x0, y0, records["state"], records["crop"], records["stage"])
+        for ly, lx in zip(*np.nonzero(records["deadline"] > 0.0)):
+            world.set_growth_deadline(x0 + int(lx), y0 + int(ly), float(records["deadline"][ly, lx]))
+
+    player = Player(player_x, player_y)
+    inventory = Inventory()
+    inventory.seeds_wheat = seeds_wheat
+    inventory.seeds_tomato = seeds_tomato
+    inventory.harvest_wheat = harvest_wheat
+    inventory.harvest_tomato = harvest_tomato
+    inventory.selected_seed = CROP_TYPES[selected_seed]
+
+    engine.install_world(world, player, inventory)
+    engine.global_time = global_time
+    engine.time_of_day = time_of_day
+    engine.day_length = day_length
+
+    if catch_up:
+        engine.skip_time(max(0.0, time.time() - saved_at))
+
+
+# --- автосейв ---
+
+class AutoSaver:
+    """Периодическое сохранение в фоновом потоке.
+
+    Снимок (O(изменённых регионов)) снимается в главном потоке, запись на
+    диск идёт в отдельном потоке. Первое сохранение мира полное, дальше
+    пишутся только регионы, изменённые с прошлой записи (по журналу мира).
+    """
+
+    def __init__(self, engine, path: str, interval: float = 30.0):
+        self.engine = engine
+        self.path = path
+        self.interval = interval
+
+        self._elapsed = 0.0
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="autosave")
+        self._pending = None
+
+        self._world = None
+        self._layout = None
+        self._cursor = None
+        self._needs_full = True
+
+    def _attach(self):
+        world = self.engine.world
+        if world is self._world:
+            return
+        # новый мир (загрузка, новая игра) — читаем его журнал и пишем целиком
+        if self._cursor is not None:
+            self._cursor.close()
+        self._world = world
+        self._layout = layout_for(world)
+        self._cursor = world.journal.subscribe()
+        self._needs_full = True
+
+    def _dirty_regions(self):
+        """Регионы, задетые изменениями с прошлого сохранения."""
+        batch = self._cursor.read()
+        rs = self._layout.region_size
+        regions = (batch.ys // rs) * self._layout.regions_x + batch.xs // rs
+        return set(np.unique(regions).tolist())
+
+    def _collect(self):
+        """Проверяет результат предыдущей записи; при ошибке следующая — полная."""
+        if self._pending is None:
+            return
+        if self._pending.exception() is not None:
+            self._needs_full = True
+        self._pending = None
+
+    def update(self, frame_dt: float):
+        self._elapsed += frame_dt
+        if self._elapsed >= self.interval and self.save():
+            self._elapsed = 0.0
+
+    def save(self, wait: bool = False) -> bool:
+        """Запускает сохранение. False — предыдущая запись ещё идёт."""
+        if self._pending is not None and not self._pending.done():
+            if not wait:
+                return False
+            self._pending.exception()
+        self._collect()
+        self._attach()
+
+        if self._needs_full:
+            regions = None
+            self._cursor.skip()
+        else:
+            regions = self._dirty_regions()
+        snapshot = take_snapshot(self.engine, self._layout, regions)
+        self._needs_full = False
+
+        self._pending = self._executor.submit(write_snapshot, self.path, snapshot)
+        if wait:
+            self._pending.exception()
+            self._collect()
+        return True
+
+    def close(self, final_save: bool = True):
+        if final_save:
+            self.save(wait=True)
+        self._executor.shutdown(wait=True)
+        if self._cursor is not None:
+            self._cursor.close()
+            self._cursor = None
@@ -1,5 +1,7 @@
 import random
 
+import numpy as np
+
 # Количество фаз роста
 MAX_GROWTH_STAGE = 5
 
@@ -21,3 +23,17 @@ def roll_harvest_amount() -> int:
         if r <= threshold:
             return amount
     return 1
+
+
+def roll_harvest_amounts(count: int) -> np.ndarray:
+    """count бросков урожая за раз (int64), с тем же распределением.
+
+    Генератор NumPy засевается одним числом из random, поэтому результат
+    воспроизводится через random.seed, как и у roll_harvest_amount().
+    """
+    rng = np.random.default_rng(random.getrandbits(64))
+    thresholds = np.array([threshold for threshold, _ in HARVEST_DISTRIBUTION])
+    amounts = np.array([amount for _, amount in HARVEST_DISTRIBUTION], dtype=np.int64)
+    # r <= threshold, как в roll_harvest_amount
+    index = np.searchsorted(thresholds, rng.random(count), side="left")
+    return amounts[np.minimum(index, len(amounts) - 1)]
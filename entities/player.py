@@ -24,6 +24,10 @@ class Player:
         if keys[pygame.K_d] or keys[pygame.K_RIGHT]:
             dx += 1.0
 
+        self.move(dt, world, dx, dy)
+
+    def move(self, dt: float, world, dx: float, dy: float):
+        """Шаг в направлении (dx, dy) без клавиатуры (сервер, боты)."""
         moving = dx != 0.0 or dy != 0.0
         if moving:
             # нормализация вектора
@@ -35,8 +39,9 @@ class Player:
             self.x += dx * self.speed * dt
             self.y += dy * self.speed * dt
 
-            self.x = max(0.0, min(self.x, world.width_px - 1.0))
-            self.y = max(0.0, min(self.y, world.height_px - 1.0))
+            if world.bounded:
+                self.x = max(0.0, min(self.x, world.width_px - 1.0))
+                self.y = max(0.0, min(self.y, world.height_px - 1.0))
 
             self.is_moving = True
             self.anim_time += dt
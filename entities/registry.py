@@ -0,0 +1,18 @@
+"""Реестр кодов тайла: биомы, состояния клетки и культуры.
+
+Тайл, массивы ArrayTileGrid, журнал изменений, сохранения и протокол
+сервера хранят маленькие целые коды — индексы в этих кортежах. Порядок
+фиксирован: коды уже лежат в файлах сохранений, новые значения — только
+в конец.
+"""
+
+GROUND_TYPES = ("grass", "dry_grass", "meadow", "sand")
+TILE_STATES = ("ground", "soil", "crop")
+CROP_TYPES = (None, "wheat", "tomato")
+
+GROUND_CODES = {name: code for code, name in enumerate(GROUND_TYPES)}
+STATE_CODES = {name: code for code, name in enumerate(TILE_STATES)}
+CROP_CODES = {name: code for code, name in enumerate(CROP_TYPES)}
+
+STATE_GROUND, STATE_SOIL, STATE_CROP = range(len(TILE_STATES))
+NO_CROP = CROP_CODES[None]
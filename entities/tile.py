@@ -1,24 +1,70 @@
+from .registry import (
+    CROP_CODES,
+    CROP_TYPES,
+    GROUND_CODES,
+    GROUND_TYPES,
+    NO_CROP,
+    STATE_CODES,
+    STATE_GROUND,
+    STATE_SOIL,
+    TILE_STATES,
+)
+
+
 class Tile:
-    """Один тайл карты: биом + состояние (земля, грядка, растение)."""
+    """Один тайл карты: биом + состояние (земля, грядка, растение).
+
+    Поля — коды из entities.registry; на карте 1000x1000 миллион тайлов,
+    поэтому без __dict__. Строковые ground_type / type / crop_type
+    оставлены для совместимости, в горячих циклах сравниваются коды.
+    """
+
+    __slots__ = ("ground", "state", "crop", "growth_stage", "growth_timer")
 
     def __init__(self, ground_type: str = "grass"):
         # Базовый тип поверхности: обычная трава, сухая трава и т.п.
         # Не меняется при копке / посадке.
-        self.ground_type = ground_type  # "grass" | "dry_grass"
+        self.ground = GROUND_CODES[ground_type]
 
         # Текущее состояние клетки:
-        # "ground" — нет грядки, просто поверхность
-        # "soil"   — вскопанная грядка
-        # "crop"   — растущая культура
-        self.type = "ground"
+        # STATE_GROUND — нет грядки, просто поверхность
+        # STATE_SOIL   — вскопанная грядка
+        # STATE_CROP   — растущая культура
+        self.state = STATE_GROUND
 
-        self.crop_type = None  # "wheat" | "tomato" | None
+        self.crop = NO_CROP
         self.growth_stage = 0
         self.growth_timer = 0.0
 
+    # --- строковый интерфейс ---
+
+    @property
+    def ground_type(self):
+        return GROUND_TYPES[self.ground]
+
+    @ground_type.setter
+    def ground_type(self, value):
+        self.ground = GROUND_CODES[value]
+
+    @property
+    def type(self):
+        return TILE_STATES[self.state]
+
+    @type.setter
+    def type(self, value):
+        self.state = STATE_CODES[value]
+
+    @property
+    def crop_type(self):
+        return CROP_TYPES[self.crop]
+
+    @crop_type.setter
+    def crop_type(self, value):
+        self.crop = CROP_CODES[value]
+
     def reset_crop(self):
         # После сбора возвращаемся к состоянию "soil", но не трогаем ground_type.
-        self.type = "soil"
-        self.crop_type = None
+        self.state = STATE_SOIL
+        self.crop = NO_CROP
         self.growth_stage = 0
         self.growth_timer = 0.0
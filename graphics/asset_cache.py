@@ -0,0 +1,178 @@
+import hashlib
+import json
+import os
+import struct
+
+import pygame
+
+from entities.crop import MAX_GROWTH_STAGE
+from . import sprite_generator
+from .sprite_generator import (
+    DEFAULT_SEED,
+    create_grass_tile,
+    create_dry_grass_tile,
+    create_meadow_tile,
+    create_sand_tile,
+    create_soil_tile,
+    create_crop_sprites,
+)
+
+
+# Формат файла атласа:
+#   MAGIC | uint32 длина заголовка | JSON-заголовок | сырые RGBA-пиксели атласа
+MAGIC = b"FEA1"
+FORMAT_VERSION = 1
+
+CROP_TYPES = ("wheat", "tomato")
+
+# имена спрайтов в атласе: тайлы и фазы культур ("wheat/1", ...)
+SPRITE_NAMES = ("grass", "dry_grass", "meadow", "sand", "soil") + tuple(
+    f"{crop_type}/{stage}"
+    for crop_type in CROP_TYPES
+    for stage in range(1, MAX_GROWTH_STAGE + 1)
+)
+
+
+def default_cache_dir() -> str:
+    return os.environ.get(
+        "FARM_ENGINE_CACHE",
+        os.path.join(os.path.expanduser("~"), ".cache", "farm_engine"),
+    )
+
+
+def generator_fingerprint() -> str:
+    """Хэш кода генератора и раскладки атласа.
+
+    Любая правка sprite_generator.py или asset_cache.py сбрасывает кэш.
+    """
+    h = hashlib.sha1()
+    h.update(f"{FORMAT_VERSION}:{pygame.version.ver}:".encode())
+    for module_path in (sprite_generator.__file__, __file__):
+        with open(module_path, "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()[:16]
+
+
+def load_sprites(tile_size: int, seed: int = DEFAULT_SEED, cache_dir=None):
+    """Спрайты тайлов и культур: из кэша на диске или сгенерированные заново.
+
+    Возвращает словарь {"grass", "dry_grass", "meadow", "sand", "soil", "crops",
+    "atlas", "atlas_rects"}, где "crops" — {crop_type: [None, stage1, ..., stageN]},
+    как у create_crop_sprites. Все спрайты — подповерхности одного атласа
+    "atlas"; "atlas_rects" — {имя: Rect в атласе} для пакетного Surface.blits.
+    """
+    cache_dir = default_cache_dir() if cache_dir is None else cache_dir
+    key = f"{generator_fingerprint()}-ts{tile_size}-s{seed}"
+    path = os.path.join(cache_dir, f"sprites-{key}.atlas")
+
+    packed = _read_atlas(path, key)
+    if packed is None:
+        packed = _pack(_generate(tile_size, seed))
+        _write_atlas(path, key, *packed)
+    atlas, rects = packed
+
+    if pygame.display.get_surface() is not None:
+        atlas = atlas.convert_alpha()
+    named = {name: atlas.subsurface(rect) for name, rect in rects.items()}
+
+    crops = {crop_type: [None] * (MAX_GROWTH_STAGE + 1) for crop_type in CROP_TYPES}
+    for crop_type in CROP_TYPES:
+        for stage in range(1, MAX_GROWTH_STAGE + 1):
+            crops[crop_type][stage] = named[f"{crop_type}/{stage}"]
+
+    return {
+        "grass": named["grass"],
+        "dry_grass": named["dry_grass"],
+        "meadow": named["meadow"],
+        "sand": named["sand"],
+        "soil": named["soil"],
+        "crops": crops,
+        "atlas": atlas,
+        "atlas_rects": rects,
+    }
+
+
+def _generate(tile_size: int, seed: int):
+    named = {
+        "grass": create_grass_tile(tile_size, seed),
+        "dry_grass": create_dry_grass_tile(tile_size, seed),
+        "meadow": create_meadow_tile(tile_size, seed),
+        "sand": create_sand_tile(tile_size, seed),
+        "soil": create_soil_tile(tile_size, seed),
+    }
+    crops = create_crop_sprites(tile_size, seed)
+    for crop_type in CROP_TYPES:
+        for stage in range(1, MAX_GROWTH_STAGE + 1):
+            named[f"{crop_type}/{stage}"] = crops[crop_type][stage]
+    return named
+
+
+# --- атлас ---
+
+def _pack(named):
+    """(атлас, {имя: Rect}): все спрайты в одной горизонтальной полосе."""
+    width = sum(surf.get_width() for surf in named.values())
+    height = max(surf.get_height() for surf in named.values())
+    atlas = pygame.Surface((width, height), pygame.SRCALPHA)
+
+    rects = {}
+    x = 0
+    for name, surf in named.items():
+        w, h = surf.get_size()
+        atlas.blit(surf, (x, 0))
+        rects[name] = pygame.Rect(x, 0, w, h)
+        x += w
+    return atlas, rects
+
+
+def _write_atlas(path: str, key: str, atlas, rects):
+    width, height = atlas.get_size()
+    header = json.dumps({
+        "key": key,
+        "size": [width, height],
+        "rects": {name: list(rect) for name, rect in rects.items()},
+    }).encode()
+    data = pygame.image.tobytes(atlas, "RGBA")
+
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(MAGIC)
+            f.write(struct.pack("<I", len(header)))
+            f.write(header)
+            f.write(data)
+        os.replace(tmp_path, path)
+    except OSError:
+        # кэш — только ускорение, без него игра работает как раньше
+        pass
+
+
+def _read_atlas(path: str, key: str):
+    try:
+        with open(path, "rb") as f:
+            blob = f.read()
+    except OSError:
+        return None
+
+    try:
+        if blob[:4] != MAGIC:
+            return None
+        (header_len,) = struct.unpack_from("<I", blob, 4)
+        header = json.loads(blob[8:8 + header_len])
+        if header["key"] != key:
+            return None
+        width, height = header["size"]
+        data = blob[8 + header_len:]
+        if len(data) != width * height * 4:
+            return None
+        atlas = pygame.image.frombytes(data, (width, height), "RGBA")
+        rects = {name: pygame.Rect(rect) for name, rect in header["rects"].items()}
+    except (ValueError, KeyError, TypeError, struct.error):
+        return None
+
+    # атлас другой раскладки (нет нужного спрайта или он за краем) — промах кэша
+    bounds = atlas.get_rect()
+    if any(name not in rects or not bounds.contains(rects[name]) for name in SPRITE_NAMES):
+        return None
+    return atlas, {name: rects[name] for name in SPRITE_NAMES}
@@ -0,0 +1,67 @@
+"""Спрайты, заранее масштабированные под уровни зума.
+
+Мир рисуется сразу в разрешении окна: тайлы, культуры и герой берутся
+уже масштабированными под текущий уровень, без smoothscale всего кадра.
+Каждый спрайт фильтруется из исходника один раз на размер, поэтому
+резкость не хуже, чем у масштабирования кадра, а соседние тайлы не
+смешиваются на стыках. Полупрозрачные спрайты масштабируются
+с предумноженной альфой (без тёмной каймы) и рисуются с
+BLEND_PREMULTIPLIED.
+"""
+from collections import OrderedDict
+
+import pygame
+
+
+class MipLevel:
+    """Спрайты одного уровня зума: (имя, размер) -> Surface."""
+
+    __slots__ = ("scale", "_sprites")
+
+    def __init__(self, scale: float):
+        self.scale = scale
+        self._sprites = {}
+
+    def sprite(self, name, source, size, opaque: bool = False):
+        """source, масштабированный до size; opaque — копировать без альфы.
+
+        Непрозрачный спрайт возвращается в формате экрана без альфы,
+        остальные — с предумноженной альфой (blit с BLEND_PREMULTIPLIED).
+        """
+        key = (name, size)
+        surf = self._sprites.get(key)
+        if surf is None:
+            if opaque:
+                surf = pygame.transform.smoothscale(source, size)
+                if pygame.display.get_surface() is not None:
+                    surf = surf.convert()
+            else:
+                # copy(): premul_alpha не учитывает шаг строк подповерхности атласа
+                surf = pygame.transform.smoothscale(source.copy().premul_alpha(), size)
+            self._sprites[key] = surf
+        return surf
+
+    def __len__(self):
+        return len(self._sprites)
+
+
+class MipCache:
+    """LRU уровней зума: держит не больше max_levels наборов спрайтов."""
+
+    def __init__(self, max_levels: int = 4):
+        self.max_levels = max_levels
+        self._levels = OrderedDict()  # scale -> MipLevel
+
+    def level(self, scale: float) -> MipLevel:
+        level = self._levels.get(scale)
+        if level is None:
+            level = MipLevel(scale)
+            self._levels[scale] = level
+            while len(self._levels) > self.max_levels:
+                self._levels.popitem(last=False)
+        else:
+            self._levels.move_to_end(scale)
+        return level
+
+    def clear(self):
+        self._levels.clear()
@@ -1,38 +1,57 @@
 import math
 import random
+
+import numpy as np
 import pygame
 
 from entities.crop import MAX_GROWTH_STAGE
 
 
-def _smooth_noise(surface, passes: int = 1):
-    """Лёгкое сглаживание, чтобы убрать жёсткие пиксели."""
-    w, h = surface.get_size()
-    for _ in range(passes):
-        for y in range(h):
-            for x in range(w):
-                r, g, b, a = surface.get_at((x, y))
-                acc_r = r
-                acc_g = g
-                acc_b = b
-                count = 1
-                for dy in (-1, 0, 1):
-                    for dx in (-1, 0, 1):
-                        if dx == 0 and dy == 0:
-                            continue
-                        nx = x + dx
-                        ny = y + dy
-                        if 0 <= nx < w and 0 <= ny < h:
-                            nr, ng, nb, na = surface.get_at((nx, ny))
-                            acc_r += nr
-                            acc_g += ng
-                            acc_b += nb
-                            count += 1
-                surface.set_at((x, y), (acc_r // count, acc_g // count, acc_b // count, a))
-
-
-
-def _make_grass_like_tile(tile_size: int, top_color, bottom_color, noise_strength: float = 0.35) -> pygame.Surface:
+# Базовый seed процедурной графики; вместе с tile_size однозначно
+# определяет все сгенерированные спрайты.
+DEFAULT_SEED = 0
+
+
+def _random_floats(rng: random.Random, count: int) -> np.ndarray:
+    """count значений rng.random() одним вызовом NumPy.
+
+    random.Random и RandomState используют один и тот же MT19937 и одну
+    формулу 53-битного float, поэтому после копирования состояния
+    последовательности совпадают бит в бит.
+    """
+    state = rng.getstate()[1]
+    np_rng = np.random.RandomState()
+    np_rng.set_state(("MT19937", np.array(state[:624], dtype=np.uint32), state[624]))
+    return np_rng.random_sample(count)
+
+
+def _tileable_noise(rng: random.Random, size: int) -> np.ndarray:
+    """Бесшовный шум size x size из области 2*size x 2*size.
+
+    Значения идут в том же порядке (построчно), что и у rng.random(),
+    поэтому текстура для заданного seed не меняется.
+    """
+    big = size * 2
+    noise = _random_floats(rng, big * big).reshape(big, big)
+    # усредняем 4 значения шума – так текстура будет тайлиться
+    return (
+        noise[:size, :size] +
+        noise[:size, size:] +
+        noise[size:, :size] +
+        noise[size:, size:]
+    ) * 0.25
+
+
+def _blend(top_color, bottom_color, v: np.ndarray) -> np.ndarray:
+    """Смешивание двух цветов по коэффициенту v (массив), результат (..., 3)."""
+    top = np.asarray(top_color, dtype=np.float64)
+    bottom = np.asarray(bottom_color, dtype=np.float64)
+    v = v[..., None]
+    return (top * (1.0 - v) + bottom * v).astype(np.uint8)
+
+
+def _make_grass_like_tile(tile_size: int, top_color, bottom_color, noise_strength: float = 0.35,
+                          seed: int = DEFAULT_SEED) -> pygame.Surface:
     """Генератор бесшовной травы без мыльных градиентов.
 
     Делаем тайл на основе тайлового шума:
@@ -52,76 +71,68 @@ def _make_grass_like_tile(tile_size: int, top_color, bottom_color, noise_strengt
 
     # детерминированный генератор, чтобы при каждом запуске
     # трава выглядела одинаково
-    seed = (top_color[0] * 17 + top_color[1] * 31 + top_color[2] * 13 +
-            bottom_color[0] * 23 + bottom_color[1] * 7 + bottom_color[2] * 29)
-    rng = random.Random(seed)
+    color_seed = (top_color[0] * 17 + top_color[1] * 31 + top_color[2] * 13 +
+                  bottom_color[0] * 23 + bottom_color[1] * 7 + bottom_color[2] * 29)
+    rng = random.Random(color_seed + seed)
+
+    v = _tileable_noise(rng, size)  # индексы [y, x]
+
+    # слегка сужаем диапазон, чтобы трава не была "кислотной"
+    v = np.clip(0.5 + (v - 0.5) * noise_strength * 2.0, 0.0, 1.0)
 
-    # предварительно генерируем шум на области 2*size x 2*size
-    big_w = size * 2
-    big_h = size * 2
-    noise = [[rng.random() for _ in range(big_w)] for _ in range(big_h)]
-
-    for y in range(size):
-        for x in range(size):
-            # усредняем 4 значения шума – так текстура будет тайлиться
-            v = (
-                noise[y][x] +
-                noise[y][x + size] +
-                noise[y + size][x] +
-                noise[y + size][x + size]
-            ) * 0.25
-
-            # слегка сужаем диапазон, чтобы трава не была "кислотной"
-            v = 0.5 + (v - 0.5) * noise_strength * 2.0
-            if v < 0.0:
-                v = 0.0
-            elif v > 1.0:
-                v = 1.0
-
-            r = int(top_color[0] * (1.0 - v) + bottom_color[0] * v)
-            g = int(top_color[1] * (1.0 - v) + bottom_color[1] * v)
-            b = int(top_color[2] * (1.0 - v) + bottom_color[2] * v)
-
-            surf.set_at((x, y), (r, g, b, 255))
+    # surfarray индексируется как [x, y]
+    pygame.surfarray.pixels3d(surf)[...] = _blend(top_color, bottom_color, v.T)
+    pygame.surfarray.pixels_alpha(surf)[...] = 255
 
     return surf
 
 
-def create_grass_tile(tile_size: int) -> pygame.Surface:
+def create_grass_tile(tile_size: int, seed: int = DEFAULT_SEED) -> pygame.Surface:
     """Обычная трава с большим количеством оттенков зелёного."""
     top = (60, 138, 72)
     bottom = (28, 90, 50)
-    return _make_grass_like_tile(tile_size, top, bottom, noise_strength=0.18)
+    return _make_grass_like_tile(tile_size, top, bottom, noise_strength=0.18, seed=seed)
 
 
-def create_dry_grass_tile(tile_size: int) -> pygame.Surface:
+def create_dry_grass_tile(tile_size: int, seed: int = DEFAULT_SEED) -> pygame.Surface:
     """Сухая трава — более жёлто-коричневый биом."""
     top = (168, 150, 86)
     bottom = (124, 104, 62)
-    return _make_grass_like_tile(tile_size, top, bottom, noise_strength=0.20)
+    return _make_grass_like_tile(tile_size, top, bottom, noise_strength=0.20, seed=seed)
+
+
+def create_meadow_tile(tile_size: int, seed: int = DEFAULT_SEED) -> pygame.Surface:
+    """Влажный луг — сочная яркая зелень."""
+    top = (88, 170, 78)
+    bottom = (40, 118, 58)
+    return _make_grass_like_tile(tile_size, top, bottom, noise_strength=0.24, seed=seed)
 
 
-def create_soil_tile(tile_size: int) -> pygame.Surface:
+def create_sand_tile(tile_size: int, seed: int = DEFAULT_SEED) -> pygame.Surface:
+    """Песок в самых сухих и жарких местах."""
+    top = (222, 204, 150)
+    bottom = (190, 168, 116)
+    return _make_grass_like_tile(tile_size, top, bottom, noise_strength=0.14, seed=seed)
+
+
+def create_soil_tile(tile_size: int, seed: int = DEFAULT_SEED) -> pygame.Surface:
     """Грядка: тёмная земля с аккуратной травой по периметру."""
     surf = pygame.Surface((tile_size, tile_size), pygame.SRCALPHA)
+    rng = random.Random(seed)
 
     # базовый вертикальный градиент земли
     top = (118, 78, 52)
     bottom = (72, 44, 28)
-    for y in range(tile_size):
-        t = y / max(1, tile_size - 1)
-        r = int(top[0] * (1 - t) + bottom[0] * t)
-        g = int(top[1] * (1 - t) + bottom[1] * t)
-        b = int(top[2] * (1 - t) + bottom[2] * t)
+    ys = np.arange(tile_size, dtype=np.float64)
+    t = ys / max(1, tile_size - 1)
+    rows = _blend(top, bottom, t).astype(np.float64)
 
-        # небольшой шум по X, чтобы убрать идеальные полосы
-        n = math.sin(2.5 * math.pi * (y / tile_size)) * 0.06
-        k = 1.0 + n
-        rr = max(0, min(255, int(r * k)))
-        gg = max(0, min(255, int(g * k)))
-        bb = max(0, min(255, int(b * k)))
+    # небольшой шум по X, чтобы убрать идеальные полосы
+    k = 1.0 + np.sin(2.5 * math.pi * (ys / tile_size)) * 0.06
+    rows = np.clip((rows * k[:, None]).astype(np.int64), 0, 255)
 
-        pygame.draw.line(surf, (rr, gg, bb), (0, y), (tile_size, y))
+    pygame.surfarray.pixels3d(surf)[...] = rows[None, :, :].astype(np.uint8)
+    pygame.surfarray.pixels_alpha(surf)[...] = 255
 
     # борозды
     for y in range(5, tile_size, 7):
@@ -143,28 +154,28 @@ def create_soil_tile(tile_size: int) -> pygame.Surface:
     def draw_edge(side: str):
         count = 6
         for _ in range(count):
-            color = random.choice(grass_colors)
-            length = random.randint(5, 9)
+            color = rng.choice(grass_colors)
+            length = rng.randint(5, 9)
             thickness = 2
 
             if side == "top":
-                x = random.randint(2, tile_size - 3)
-                y2 = random.randint(3, 5)
+                x = rng.randint(2, tile_size - 3)
+                y2 = rng.randint(3, 5)
                 y1 = y2 + length
                 pygame.draw.line(surf, color, (x, y1), (x, y2), thickness)
             elif side == "bottom":
-                x = random.randint(2, tile_size - 3)
-                y1 = tile_size - random.randint(4, 6)
+                x = rng.randint(2, tile_size - 3)
+                y1 = tile_size - rng.randint(4, 6)
                 y2 = y1 - length
                 pygame.draw.line(surf, color, (x, y1), (x, y2), thickness)
             elif side == "left":
-                y = random.randint(4, tile_size - 4)
-                x2 = random.randint(3, 5)
+                y = rng.randint(4, tile_size - 4)
+                x2 = rng.randint(3, 5)
                 x1 = x2 + length
                 pygame.draw.line(surf, color, (x1, y), (x2, y), thickness)
             elif side == "right":
-                y = random.randint(4, tile_size - 4)
-                x1 = tile_size - random.randint(4, 6)
+                y = rng.randint(4, tile_size - 4)
+                x1 = tile_size - rng.randint(4, 6)
                 x2 = x1 - length
                 pygame.draw.line(surf, color, (x1, y), (x2, y), thickness)
 
@@ -224,7 +235,7 @@ def _draw_wheat_stage(surface: pygame.Surface, tile_size: int, stage: int):
             pygame.draw.ellipse(surface, head_color, rect)
 
 
-def _draw_tomato_stage(surface: pygame.Surface, tile_size: int, stage: int):
+def _draw_tomato_stage(surface: pygame.Surface, tile_size: int, stage: int, rng: random.Random):
     """Куст томатов с 5 фазами роста."""
     base_y = tile_size - 3
     center_x = tile_size // 2
@@ -258,9 +269,9 @@ def _draw_tomato_stage(surface: pygame.Surface, tile_size: int, stage: int):
 
         max_tomatoes = 1 + (stage - 3) * 2  # 1, 3, 5 плодов на 3/4/5 стадиях
         for _ in range(max_tomatoes):
-            dx = random.randint(-crown_w // 4, crown_w // 4)
-            dy = random.randint(-crown_h // 4, crown_h // 4)
-            radius = random.randint(3, 5)  # помидор значительно меньше головы героя
+            dx = rng.randint(-crown_w // 4, crown_w // 4)
+            dy = rng.randint(-crown_h // 4, crown_h // 4)
+            radius = rng.randint(3, 5)  # помидор значительно меньше головы героя
             cx = center_x + dx
             cy = crown_rect.centery + dy
             rect = pygame.Rect(0, 0, radius * 2, radius * 2)
@@ -273,8 +284,9 @@ def _draw_tomato_stage(surface: pygame.Surface, tile_size: int, stage: int):
             pygame.draw.ellipse(surface, tomato_highlight, hl)
 
 
-def create_crop_sprites(tile_size: int):
+def create_crop_sprites(tile_size: int, seed: int = DEFAULT_SEED):
     """Создаём HD-спрайты культур с 5 фазами роста."""
+    rng = random.Random(seed)
     crops = {
         "wheat": [None] * (MAX_GROWTH_STAGE + 1),
         "tomato": [None] * (MAX_GROWTH_STAGE + 1),
@@ -286,7 +298,7 @@ def create_crop_sprites(tile_size: int):
             if crop_type == "wheat":
                 _draw_wheat_stage(surf, tile_size, stage)
             else:
-                _draw_tomato_stage(surf, tile_size, stage)
+                _draw_tomato_stage(surf, tile_size, stage, rng)
             crops[crop_type][stage] = surf
 
     return crops
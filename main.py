@@ -1,27 +1,86 @@
+import argparse
+import logging
+import os
+import random
+
 import pygame
 
 from core.engine import Engine
 from core.input_handler import InputHandler
+from core.replay import InputRecorder
+from core.savegame import AutoSaver, load_game
+
+
+RENDER_FPS = 60
+SIM_RATE = 60.0
+
+SAVE_PATH = "savegame.fes"
+AUTOSAVE_INTERVAL = 30.0
+
+log = logging.getLogger("farm_engine")
 
 
-def main():
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Farm Engine")
+    parser.add_argument("--record", metavar="PATH",
+                        help="записать сессию с новой игры (см. bench.replay_bench)")
+    parser.add_argument("--seed", type=int, help="зерно random для записываемой сессии")
+    args = parser.parse_args(argv)
+
     pygame.init()
     pygame.display.set_caption("Farm Engine — v0.4")
 
     window_size = (1280, 720)
     screen = pygame.display.set_mode(window_size)
 
+    # запись начинается с новой игры и засеянного random
+    seed = args.seed if args.seed is not None else random.getrandbits(63)
+    if args.record:
+        random.seed(seed)
+
     clock = pygame.time.Clock()
-    engine = Engine(screen)
+    engine = Engine(screen, sim_rate=SIM_RATE)
     input_handler = InputHandler(engine)
 
+    recorder = None
+    autosaver = None
+    if args.record:
+        # запись не трогает сохранение: своя новая игра, без автосейва
+        recorder = InputRecorder(args.record, engine, seed)
+    else:
+        # продолжаем сохранённую игру, время вне игры догоняется
+        if os.path.exists(SAVE_PATH):
+            try:
+                load_game(engine, SAVE_PATH, catch_up=True)
+            except (OSError, ValueError) as e:
+                log.warning("Не удалось загрузить %s: %s", SAVE_PATH, e)
+        autosaver = AutoSaver(engine, SAVE_PATH, AUTOSAVE_INTERVAL)
+
+    profiler = engine.profiler
+
     running = True
     while running:
-        dt = clock.tick(60) / 1000.0
-        running = input_handler.process_events()
-        engine.update(dt)
+        # рендер — с частотой кадров, симуляция — фиксированным шагом engine.sim_dt
+        frame_dt = clock.tick(RENDER_FPS) / 1000.0
+        profiler.begin_frame()
+        with profiler.phase("events"):
+            events = pygame.event.get()
+            keys = pygame.key.get_pressed()
+            running = input_handler.process_events(events)
+            # после обработки: рекордер пишет и смену размера экрана
+            if recorder is not None:
+                recorder.record_frame(frame_dt, events, keys)
+        engine.tick(frame_dt, keys)
+        if autosaver is not None:
+            autosaver.update(frame_dt)
         engine.render()
+        profiler.end_frame()
 
+    if recorder is not None:
+        recorder.close()
+    if autosaver is not None:
+        autosaver.close()
+    engine.close()
     pygame.quit()
 
 
@@ -0,0 +1,44 @@
+"""Запуск сервера ферм:
+
+    python -m server --unix /tmp/farm.sock
+    python -m server --host 127.0.0.1 --port 7878 --tick-rate 20 --world 32x32
+"""
+import argparse
+import asyncio
+import os
+
+from .host import FarmServer
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless-сервер ферм")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7878)
+    parser.add_argument("--unix", help="слушать Unix-сокет вместо TCP")
+    parser.add_argument("--tick-rate", type=float, default=20.0)
+    parser.add_argument("--world", default="32x32", help="размер карты каждой фермы")
+    parser.add_argument("--backend", default="objects", choices=("objects", "numpy"))
+    args = parser.parse_args(argv)
+
+    width, height = (int(v) for v in args.world.lower().split("x"))
+    server = FarmServer(args.tick_rate, (width, height), backend=args.backend)
+
+    async def serve():
+        if args.unix:
+            if os.path.exists(args.unix):
+                os.unlink(args.unix)
+            await server.listen_unix(args.unix)
+            print(f"Сервер ферм: {args.unix}")
+        else:
+            await server.listen_tcp(args.host, args.port)
+            print(f"Сервер ферм: {args.host}:{args.port}")
+        await server.run()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""Клиент сервера ферм и бот для проверки без игры.
+
+    python -m server.client --unix /tmp/farm.sock --farm alice --seconds 30
+
+Бот ходит по ферме и копает / сажает / собирает тайл под собой,
+печатая инвентарь раз в секунду.
+"""
+import argparse
+import asyncio
+import random
+
+from entities.crop import MAX_GROWTH_STAGE
+
+from .protocol import decode, encode
+
+
+# снимок большой фермы (биомы + тайлы) — одна длинная строка
+READ_LIMIT = 16 * 1024 * 1024
+
+
+class FarmClient:
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.state = None  # последний снимок фермы с наложенными изменениями
+
+    @classmethod
+    async def connect(cls, host: str = "127.0.0.1", port: int = 7878, path=None):
+        if path is not None:
+            reader, writer = await asyncio.open_unix_connection(path, limit=READ_LIMIT)
+        else:
+            reader, writer = await asyncio.open_connection(host, port, limit=READ_LIMIT)
+        return cls(reader, writer)
+
+    async def send(self, op: str, **fields):
+        fields["op"] = op
+        self.writer.write(encode(fields))
+        await self.writer.drain()
+
+    async def recv(self) -> dict:
+        line = await self.reader.readline()
+        if not line:
+            raise ConnectionError("Сервер закрыл соединение")
+        message = decode(line)
+        self._apply(message)
+        return message
+
+    def _apply(self, message: dict):
+        op = message["op"]
+        if op == "joined":
+            self.state = message
+            self.state["tiles"] = {(x, y): rest for x, y, *rest in message["tiles"]}
+        elif op == "state" and self.state is not None:
+            for key in ("player", "action", "inventory"):
+                self.state[key] = message[key]
+            for x, y, *rest in message.get("tiles", ()):
+                self.state["tiles"][(x, y)] = rest
+
+    async def join(self, farm_id: str) -> dict:
+        await self.send("join", farm=farm_id)
+        while True:
+            message = await self.recv()
+            if message["op"] == "joined":
+                return message
+            if message["op"] == "error":
+                raise ConnectionError(message["reason"])
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+def bot_command(state: dict, rng: random.Random):
+    """Следующая команда бота по известному состоянию фермы (или None)."""
+    if state["action"] is not None:
+        return None
+    ts = state["tile_size"]
+    tx, ty = int(state["player"][0] // ts), int(state["player"][1] // ts)
+    tile_type, crop, stage = state["tiles"].get((tx, ty), ("ground", None, 0))
+
+    if rng.random() < 0.2:
+        return "move", {"dx": rng.choice((-1, 0, 1)), "dy": rng.choice((-1, 0, 1))}
+    if tile_type == "crop" and stage >= MAX_GROWTH_STAGE:
+        return "harvest", {"x": tx, "y": ty}
+    if tile_type == "soil":
+        return "plant", {"x": tx, "y": ty, "crop": rng.choice(("wheat", "tomato"))}
+    if tile_type == "ground":
+        return "dig", {"x": tx, "y": ty}
+    return None
+
+
+async def run_bot(client: FarmClient, farm_id: str, seconds: float, seed: int = 0, verbose=True):
+    rng = random.Random(seed)
+    await client.join(farm_id)
+    loop = asyncio.get_running_loop()
+    end = loop.time() + seconds
+    next_report = loop.time() + 1.0
+    next_command = loop.time()
+
+    while loop.time() < end:
+        try:
+            await asyncio.wait_for(client.recv(), timeout=0.25)
+        except asyncio.TimeoutError:
+            pass
+
+        now = loop.time()
+        if now >= next_command:
+            next_command = now + 0.5
+            command = bot_command(client.state, rng)
+            if command is not None:
+                await client.send(command[0], **command[1])
+        if verbose and now >= next_report:
+            next_report = now + 1.0
+            print(farm_id, client.state["player"], client.state["inventory"])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Бот-клиент сервера ферм")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7878)
+    parser.add_argument("--unix", help="путь к Unix-сокету вместо TCP")
+    parser.add_argument("--farm", default="demo")
+    parser.add_argument("--seconds", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    async def session():
+        client = await FarmClient.connect(args.host, args.port, args.unix)
+        try:
+            await run_bot(client, args.farm, args.seconds, args.seed)
+        finally:
+            await client.close()
+
+    asyncio.run(session())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+from entities.player import Player
+from ui.inventory import Inventory
+from world.actions import FarmActions
+from world.map import World
+
+
+class Farm:
+    """Одна ферма без экрана: World + Player + Inventory и текущее действие.
+
+    Правила действий общие с Engine (world.actions.FarmActions). Вместо
+    клавиатуры герой держит направление движения из последней команды move.
+    """
+
+    def __init__(self, farm_id: str, world_size=(32, 32), tile_size: int = 48,
+                 backend: str = "objects", seed: int = 0):
+        self.farm_id = farm_id
+        self.world = World(world_size[0], world_size[1], tile_size, backend=backend, seed=seed)
+        self.player = Player(*self.world.spawn_point())
+        self.inventory = Inventory()
+
+        self.actions = FarmActions(self.world, self.player, self.inventory)
+        self.move_dir = (0.0, 0.0)
+
+        # изменения тайлов с прошлого снимка — из журнала мира
+        self._cursor = self.world.journal.subscribe()
+        self._sent = None
+
+    @property
+    def current_action(self):
+        return self.actions.current
+
+    # --- команды клиента ---
+
+    def move(self, dx: float, dy: float):
+        # как клавиши: по каждой оси -1, 0 или 1
+        self.move_dir = (float(max(-1, min(1, dx))), float(max(-1, min(1, dy))))
+
+    def start_action(self, kind: str, tile_x: int, tile_y: int, crop_type=None):
+        """Начинает действие; возвращает None или причину отказа."""
+        return self.actions.start(kind, tile_x, tile_y, crop_type)
+
+    # --- симуляция ---
+
+    def update(self, dt: float):
+        if not self.actions.update(dt):
+            self.player.move(dt, self.world, *self.move_dir)
+        self.world.update(dt)
+
+    # --- состояние для клиентов ---
+
+    def _tile_entries(self, tiles):
+        result = []
+        for x, y in tiles:
+            tile = self.world.get_tile(x, y)
+            result.append([x, y, tile.type, tile.crop_type, tile.growth_stage])
+        return result
+
+    def _header(self) -> dict:
+        player = self.player
+        inv = self.inventory
+        action = self.current_action
+        return {
+            "player": [round(player.x, 2), round(player.y, 2)],
+            "action": None if action is None else {
+                "kind": action["kind"],
+                "x": action["tile_x"],
+                "y": action["tile_y"],
+                "progress": round(min(1.0, action["elapsed"] / action["duration"]), 3),
+            },
+            "inventory": {
+                "seeds_wheat": inv.seeds_wheat,
+                "seeds_tomato": inv.seeds_tomato,
+                "harvest_wheat": inv.harvest_wheat,
+                "harvest_tomato": inv.harvest_tomato,
+            },
+        }
+
+    def snapshot(self) -> dict:
+        """Полное состояние для нового клиента: биомы и все тронутые тайлы."""
+        world = self.world
+        message = {
+            "op": "joined",
+            "farm": self.farm_id,
+            "width": world.width,
+            "height": world.height,
+            "tile_size": world.tile_size,
+            "ground": world.grid.ground_codes().tolist(),
+            "tiles": self._tile_entries(world.find_tiles(state="soil") + world.find_tiles(state="crop")),
+        }
+        message.update(self._header())
+        return message
+
+    def take_update(self):
+        """Сообщение об изменениях с прошлого вызова или None, если ничего не изменилось."""
+        header = self._header()
+        if not self._cursor.pending and header == self._sent:
+            return None
+        self._sent = header
+        changed = self._cursor.read().tiles()
+
+        message = {"op": "state", "farm": self.farm_id, "time": round(self.world.sim_time, 3)}
+        message.update(header)
+        if changed:
+            message["tiles"] = self._tile_entries(changed)
+        return message
@@ -0,0 +1,220 @@
+import asyncio
+import time
+import zlib
+
+from .farm import Farm
+from .protocol import MAX_LINE, ProtocolError, decode, encode
+
+
+# клиент, который не успевает читать, отключается
+MAX_WRITE_BUFFER = 1024 * 1024
+
+
+class FarmServer:
+    """Headless-сервер: много ферм на одном цикле asyncio.
+
+    Все фермы тикают с фиксированным шагом 1 / tick_rate в одной задаче;
+    после тика подписчики фермы получают её изменения. Фермы создаются
+    при первом join; ферма без подписчиков удаляется через idle_timeout
+    секунд игрового времени. Ферм не больше max_farms: при переполнении
+    новая вытесняет дольше всех простаивающую, а если простаивающих нет,
+    join отклоняется.
+    """
+
+    def __init__(self, tick_rate: float = 20.0, world_size=(32, 32), tile_size: int = 48,
+                 backend: str = "objects", max_farms: int = 1024, idle_timeout: float = 60.0):
+        self.tick_dt = 1.0 / tick_rate
+        self.world_size = world_size
+        self.tile_size = tile_size
+        self.backend = backend
+        self.max_farms = max_farms
+        self.idle_timeout = idle_timeout
+
+        self.farms = {}        # farm_id -> Farm
+        self.subscribers = {}  # farm_id -> список send(bytes)
+        self._idle_since = {}  # farm_id -> время сервера, когда ушёл последний подписчик
+
+        self.ticks = 0
+        self.overruns = 0      # тиков, не уложившихся в свой шаг
+        self.last_tick_ms = 0.0
+        self._servers = []
+        self._running = False
+
+    # --- фермы ---
+
+    @property
+    def clock(self) -> float:
+        return self.ticks * self.tick_dt
+
+    def create_farm(self, farm_id: str):
+        """Ферма farm_id; None — ферм уже max_farms и все с подписчиками."""
+        farm = self.farms.get(farm_id)
+        if farm is None:
+            if len(self.farms) >= self.max_farms:
+                if not self._idle_since:
+                    return None
+                self.drop_farm(min(self._idle_since, key=self._idle_since.get))
+            # зерно карты — из id: одна и та же ферма всегда с одной картой
+            seed = zlib.crc32(farm_id.encode("utf-8"))
+            farm = Farm(farm_id, self.world_size, self.tile_size, self.backend, seed)
+            self.farms[farm_id] = farm
+            self.subscribers[farm_id] = []
+            self._idle_since[farm_id] = self.clock
+        return farm
+
+    def drop_farm(self, farm_id: str):
+        farm = self.farms.pop(farm_id)
+        del self.subscribers[farm_id]
+        self._idle_since.pop(farm_id, None)
+        farm.world.close()
+
+    def subscribe(self, farm_id: str, send):
+        """send(bytes) будет получать изменения фермы после каждого тика.
+
+        None — ферму не создать (см. create_farm).
+        """
+        farm = self.create_farm(farm_id)
+        if farm is None:
+            return None
+        self.subscribers[farm_id].append(send)
+        self._idle_since.pop(farm_id, None)
+        return farm
+
+    def unsubscribe(self, farm_id: str, send):
+        subscribers = self.subscribers.get(farm_id)
+        if subscribers and send in subscribers:
+            subscribers.remove(send)
+            if not subscribers:
+                self._idle_since[farm_id] = self.clock
+
+    def handle_message(self, farm: Farm, message: dict):
+        """Применяет команду клиента к ферме; возвращает ответ или None."""
+        op = message["op"]
+        try:
+            if op == "move":
+                farm.move(float(message.get("dx", 0)), float(message.get("dy", 0)))
+                return None
+            if op in ("dig", "plant", "harvest"):
+                reason = farm.start_action(op, int(message["x"]), int(message["y"]),
+                                           message.get("crop"))
+                if reason is None:
+                    return None
+                return {"op": "rejected", "request": op, "reason": reason}
+        except (KeyError, TypeError, ValueError, OverflowError) as e:
+            return {"op": "error", "reason": f"Некорректные поля {op}: {e}"}
+        if op == "ping":
+            return {"op": "pong", "time": farm.world.sim_time}
+        return {"op": "error", "reason": f"Неизвестная команда: {op}"}
+
+    # --- тик ---
+
+    def tick(self, dt: float):
+        for farm_id, farm in self.farms.items():
+            farm.update(dt)
+            message = farm.take_update()
+            if message is None:
+                continue
+            subscribers = self.subscribers[farm_id]
+            if subscribers:
+                data = encode(message)
+                for send in list(subscribers):
+                    send(data)
+        self.ticks += 1
+
+        clock = self.clock
+        for farm_id in [farm_id for farm_id, since in self._idle_since.items()
+                        if clock - since >= self.idle_timeout]:
+            self.drop_farm(farm_id)
+
+    async def run(self):
+        """Цикл тиков с фиксированным шагом; отставание не догоняется."""
+        loop = asyncio.get_running_loop()
+        self._running = True
+        next_tick = loop.time()
+        while self._running:
+            t0 = time.perf_counter()
+            self.tick(self.tick_dt)
+            self.last_tick_ms = (time.perf_counter() - t0) * 1000.0
+
+            next_tick += self.tick_dt
+            delay = next_tick - loop.time()
+            if delay < 0.0:
+                self.overruns += 1
+                next_tick = loop.time()
+                delay = 0.0
+            await asyncio.sleep(delay)
+
+    def stop(self):
+        self._running = False
+        for server in self._servers:
+            server.close()
+
+    # --- сеть ---
+
+    async def listen_tcp(self, host: str = "127.0.0.1", port: int = 7878):
+        server = await asyncio.start_server(self._serve, host, port, limit=MAX_LINE)
+        self._servers.append(server)
+        return server
+
+    async def listen_unix(self, path: str):
+        server = await asyncio.start_unix_server(self._serve, path, limit=MAX_LINE)
+        self._servers.append(server)
+        return server
+
+    async def _serve(self, reader, writer):
+        farm = None
+
+        def send(data: bytes):
+            if writer.is_closing():
+                return
+            if writer.transport.get_write_buffer_size() > MAX_WRITE_BUFFER:
+                writer.close()
+                return
+            writer.write(data)
+
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (asyncio.LimitOverrunError, ValueError):
+                    send(encode({"op": "error", "reason": "Слишком длинная строка"}))
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+
+                try:
+                    message = decode(line)
+                except ProtocolError as e:
+                    send(encode({"op": "error", "reason": str(e)}))
+                    continue
+
+                if message["op"] == "join":
+                    farm_id = message.get("farm")
+                    if not isinstance(farm_id, str) or not farm_id:
+                        send(encode({"op": "error", "reason": "join без id фермы"}))
+                        continue
+                    joined = self.subscribe(farm_id, send)
+                    if joined is None:
+                        send(encode({"op": "error", "reason": "Сервер заполнен"}))
+                        continue
+                    # старую подписку снимаем после новой: её ферма не вытесняется
+                    if farm is not None:
+                        self.unsubscribe(farm.farm_id, send)
+                    farm = joined
+                    send(encode(farm.snapshot()))
+                    continue
+                if farm is None:
+                    send(encode({"op": "error", "reason": "Сначала join"}))
+                    continue
+
+                reply = self.handle_message(farm, message)
+                if reply is not None:
+                    send(encode(reply))
+        except ConnectionError:
+            pass
+        finally:
+            if farm is not None:
+                self.unsubscribe(farm.farm_id, send)
+            writer.close()
@@ -0,0 +1,52 @@
+"""Протокол сервера ферм: JSON-объекты, по одному на строку (UTF-8).
+
+Клиент -> сервер:
+    {"op": "join", "farm": "<id>"}                      подключиться к ферме
+    {"op": "move", "dx": -1..1, "dy": -1..1}            направление ходьбы
+    {"op": "dig" | "harvest", "x": tx, "y": ty}         действие над тайлом
+    {"op": "plant", "x": tx, "y": ty, "crop": "wheat"}
+    {"op": "ping"}
+
+Сервер -> клиент:
+    {"op": "joined", ...}    полный снимок фермы (Farm.snapshot)
+    {"op": "state", ...}     изменения за тик (Farm.take_update)
+    {"op": "rejected", "request": op, "reason": ...}
+    {"op": "error", "reason": ...}
+    {"op": "pong", "time": ...}
+"""
+import json
+import math
+
+
+# длиннее строки — ошибка протокола (клиент шлёт только короткие команды)
+MAX_LINE = 64 * 1024
+
+
+class ProtocolError(ValueError):
+    pass
+
+
+def encode(message: dict) -> bytes:
+    return json.dumps(message, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+def _finite_float(text: str) -> float:
+    value = float(text)
+    if not math.isfinite(value):
+        raise ValueError(f"Нечисловое значение: {text}")
+    return value
+
+
+def _reject_constant(name: str):
+    raise ValueError(f"Нечисловое значение: {name}")
+
+
+def decode(line: bytes) -> dict:
+    # NaN и Infinity json принимает, но координатами и направлением они быть не могут
+    try:
+        message = json.loads(line, parse_float=_finite_float, parse_constant=_reject_constant)
+    except (UnicodeDecodeError, ValueError) as e:
+        raise ProtocolError(f"Некорректный JSON: {e}") from None
+    if not isinstance(message, dict) or not isinstance(message.get("op"), str):
+        raise ProtocolError("Ожидался объект с полем op")
+    return message
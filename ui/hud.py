@@ -11,6 +11,10 @@ class HUD:
         self.margin = 12
         self.height = 120
 
+        # готовый слой панели и ключ, по которому он был нарисован
+        self._layer = None
+        self._layer_key = None
+
     def _draw_panel_background(self, surface: pygame.Surface, rect: pygame.Rect):
         # Градиент коричневого
         top_color = (40, 26, 16)
@@ -78,16 +82,37 @@ class HUD:
         text_rect = text_surf.get_rect(center=rect.center)
         surface.blit(text_surf, text_rect)
 
-    def draw(self, screen: pygame.Surface, inventory):
+    def layer_key(self, screen: pygame.Surface, inventory):
+        """(ключ содержимого панели, её прямоугольник на экране)."""
         sw, sh = screen.get_size()
         panel_rect = pygame.Rect(self.margin, sh - self.height - self.margin,
                                  sw - self.margin * 2, self.height)
+        return (id(inventory), inventory.version, panel_rect.size), panel_rect
 
-        self._draw_panel_background(screen, panel_rect)
+    def draw(self, screen: pygame.Surface, inventory):
+        # Панель перерисовывается только при изменении инвентаря или окна,
+        # в остальных кадрах — один blit готового слоя.
+        key, panel_rect = self.layer_key(screen, inventory)
+        if key != self._layer_key:
+            self._layer = self._render_layer(panel_rect.size, inventory)
+            self._layer_key = key
+        screen.blit(self._layer, panel_rect.topleft)
+
+        # Сохраняем, чтобы обработчик кликов знал области (в координатах экрана)
+        self.wheat_button_rect = self._wheat_rect.move(panel_rect.topleft)
+        self.tomato_button_rect = self._tomato_rect.move(panel_rect.topleft)
+
+    def _render_layer(self, size, inventory) -> pygame.Surface:
+        layer = pygame.Surface(size)
+        if pygame.display.get_surface() is not None:
+            layer = layer.convert()
+        panel_rect = layer.get_rect()
+
+        self._draw_panel_background(layer, panel_rect)
 
         # Заголовок
         title_surf = self.font_title.render("Инвентарь", True, (250, 230, 200))
-        screen.blit(title_surf, (panel_rect.x + 12, panel_rect.y + 8))
+        layer.blit(title_surf, (panel_rect.x + 12, panel_rect.y + 8))
 
         # Текст слева
         text_x = panel_rect.x + 12
@@ -97,7 +122,7 @@ class HUD:
         def draw_line(caption, value):
             nonlocal text_y
             surf = self.font_text.render(f"{caption}: {value}", True, (240, 220, 200))
-            screen.blit(surf, (text_x, text_y))
+            layer.blit(surf, (text_x, text_y))
             text_y += line_h
 
         draw_line("Семена пшеницы", inventory.seeds_wheat)
@@ -118,21 +143,22 @@ class HUD:
         tomato_rect = pygame.Rect(btn_x, btn_y2, button_width, button_height)
 
         self._draw_button(
-            screen,
+            layer,
             wheat_rect,
             "Семена пшеницы",
             inventory.selected_seed == "wheat",
         )
         self._draw_button(
-            screen,
+            layer,
             tomato_rect,
             "Семена томатов",
             inventory.selected_seed == "tomato",
         )
 
-        # Сохраняем, чтобы обработчик кликов знал области
-        self.wheat_button_rect = wheat_rect
-        self.tomato_button_rect = tomato_rect
+        # области кнопок относительно панели
+        self._wheat_rect = wheat_rect
+        self._tomato_rect = tomato_rect
+        return layer
 
     def handle_click(self, pos, inventory):
         if hasattr(self, "wheat_button_rect") and self.wheat_button_rect.collidepoint(pos):
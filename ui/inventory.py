@@ -1,5 +1,9 @@
 class Inventory:
     def __init__(self):
+        # счётчик изменений: растёт при любой записи в поля инвентаря,
+        # по нему HUD и другие кэши понимают, что пора перерисоваться
+        self.version = 0
+
         # стартовые значения
         self.seeds_wheat = 4
         self.seeds_tomato = 4
@@ -9,6 +13,11 @@ class Inventory:
         # выбранный тип семян ("wheat" или "tomato")
         self.selected_seed = "wheat"
 
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if name != "version":
+            object.__setattr__(self, "version", self.version + 1)
+
     # --- семена ---
 
     def can_plant(self, crop_type: str) -> bool:
@@ -18,6 +27,24 @@ class Inventory:
             return self.seeds_tomato > 0
         return False
 
+    def seed_count(self, crop_type: str) -> int:
+        if crop_type == "wheat":
+            return self.seeds_wheat
+        elif crop_type == "tomato":
+            return self.seeds_tomato
+        return 0
+
+    def use_seeds(self, crop_type: str, count: int) -> int:
+        """Списывает до count семян, возвращает сколько списано."""
+        count = min(count, self.seed_count(crop_type))
+        if count <= 0:
+            return 0
+        if crop_type == "wheat":
+            self.seeds_wheat -= count
+        elif crop_type == "tomato":
+            self.seeds_tomato -= count
+        return count
+
     def use_seed(self, crop_type: str) -> bool:
         if not self.can_plant(crop_type):
             return False
@@ -0,0 +1,61 @@
+import pygame
+
+
+class ProfilerOverlay:
+    """Полупрозрачная панель с графиками времени фаз кадра."""
+
+    def __init__(self, samples: int = 120):
+        self.font = pygame.font.SysFont("arial", 12)
+        self.samples = samples
+
+        # геометрия
+        self.margin = 8
+        self.row_h = 22
+        self.label_w = 150
+        self.graph_w = samples
+        self.budget = 1.0 / 60.0  # полная высота графика кадра
+
+        self._panel = None
+
+    def rect(self, profiler) -> pygame.Rect:
+        """Область экрана, которую занимает панель."""
+        width = self.label_w + self.graph_w + 12
+        height = 8 + self.row_h * (len(profiler.PHASES) + 1)
+        return pygame.Rect(self.margin, self.margin, width, height)
+
+    def draw(self, screen: pygame.Surface, profiler):
+        names = ("frame",) + profiler.PHASES
+        width, height = self.rect(profiler).size
+
+        if self._panel is None or self._panel.get_size() != (width, height):
+            self._panel = pygame.Surface((width, height), pygame.SRCALPHA)
+        panel = self._panel
+        panel.fill((8, 10, 18, 190))
+
+        for row, name in enumerate(names):
+            values = profiler.recent(name, self.samples)
+            top = 4 + row * self.row_h
+
+            avg = sum(values) / len(values) if values else 0.0
+            peak = max(values) if values else 0.0
+            label = self.font.render(name, True, (225, 230, 240))
+            panel.blit(label, (6, top + 4))
+            timing = self.font.render(f"{avg * 1000:.2f} / {peak * 1000:.2f} ms", True, (170, 180, 200))
+            panel.blit(timing, (84, top + 4))
+
+            graph = pygame.Rect(self.label_w, top + 2, self.graph_w, self.row_h - 4)
+            pygame.draw.rect(panel, (30, 34, 52), graph)
+            if len(values) < 2:
+                continue
+
+            # кадр меряем от бюджета 60 FPS, фазы — от собственного пика
+            scale = max(self.budget if name == "frame" else peak, 1e-6)
+            x0 = graph.right - len(values)
+            points = [
+                (x0 + i, graph.bottom - 1 - min(1.0, v / scale) * (graph.height - 2))
+                for i, v in enumerate(values)
+            ]
+            color = (240, 120, 90) if name == "frame" and peak > self.budget else (110, 210, 140)
+            pygame.draw.lines(panel, color, False, points)
+
+        screen.blit(panel, (self.margin, self.margin))
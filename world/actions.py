@@ -0,0 +1,196 @@
+"""Правила действий героя над тайлами — общие для Engine и server.Farm.
+
+Одиночное действие — только в радиусе interact_range_tiles от героя,
+массовое — в area_range_tiles. Копка и сбор идут по таймеру
+(ACTION_DURATIONS), одиночная посадка мгновенная; пока действие идёт,
+герой стоит. Модуль не зависит от pygame.
+"""
+import math
+
+import numpy as np
+
+from entities.registry import CROP_TYPES
+
+
+# длительность действий героя, сек (посадка мгновенная)
+ACTION_DURATIONS = {"dig": 1.5, "plant": 0.0, "harvest": 2.0}
+
+ACTIONS = ("dig", "plant", "harvest")
+
+
+class FarmActions:
+    """Текущее действие героя и проверки, можно ли его начать.
+
+    current — None или словарь: kind, tile_x, tile_y, elapsed, duration;
+    у массового действия ещё area (обрезанный прямоугольник), mask и
+    crop_type. Методы start* возвращают None или причину отказа:
+    "busy", "out_of_range", "unknown_action", "unknown_crop", "not_allowed".
+    """
+
+    def __init__(self, world, player, inventory, interact_range_tiles: float = 3.0,
+                 area_range_tiles: float = 12.0, area_seconds_per_tile: float = 0.1):
+        self.world = world
+        self.player = player
+        self.inventory = inventory
+        self.current = None
+
+        self.interact_range_tiles = interact_range_tiles
+        # массовые действия дотягиваются дальше одиночных: поле целиком —
+        # одно действие, но не вся карта с места
+        self.area_range_tiles = area_range_tiles
+        # длительность массового действия: базовая + за каждый тайл
+        self.area_seconds_per_tile = area_seconds_per_tile
+
+    # --- досягаемость ---
+
+    def tile_in_range(self, tile_x: int, tile_y: int) -> bool:
+        ts = self.world.tile_size
+        px, py = self.player.pos
+        dist = math.hypot(px - (tile_x + 0.5) * ts, py - (tile_y + 0.5) * ts)
+        return dist <= self.interact_range_tiles * ts
+
+    def area_in_range(self, area):
+        """(x0, y0, x1, y1, mask) — часть area в радиусе массовых действий, или None.
+
+        Критерий как у tile_in_range, но с area_range_tiles: центр тайла
+        не дальше этого радиуса от героя. Прямоугольник обрезан по
+        тайлам в радиусе, mask — аргумент *_area мира.
+        """
+        ts = self.world.tile_size
+        px, py = self.player.pos
+        reach = self.area_range_tiles
+        x0, y0, x1, y1 = area
+        x0 = max(x0, math.ceil(px / ts - reach - 0.5))
+        y0 = max(y0, math.ceil(py / ts - reach - 0.5))
+        x1 = min(x1, math.floor(px / ts + reach - 0.5) + 1)
+        y1 = min(y1, math.floor(py / ts + reach - 0.5) + 1)
+        if x0 >= x1 or y0 >= y1:
+            return None
+        centers_x = (np.arange(x0, x1) + 0.5) * ts - px
+        centers_y = (np.arange(y0, y1) + 0.5) * ts - py
+        mask = np.hypot(centers_x[None, :], centers_y[:, None]) <= reach * ts
+        ys, xs = np.nonzero(mask)
+        if not len(xs):
+            return None
+        # углы прямоугольника могли выпасть из круга — обрезаем и их
+        mask = mask[ys.min():ys.max() + 1, xs.min():xs.max() + 1]
+        return (x0 + int(xs.min()), y0 + int(ys.min()),
+                x0 + int(xs.max()) + 1, y0 + int(ys.max()) + 1, mask)
+
+    def count_area(self, kind: str, reachable, crop_type=None) -> int:
+        """Сколько тайлов reachable (из area_in_range) затронет действие kind.
+
+        Для посадки с crop_type — не больше, чем есть семян.
+        """
+        count = self.world.count_area(kind, *reachable)
+        if kind == "plant" and crop_type is not None:
+            count = min(count, self.inventory.seed_count(crop_type))
+        return count
+
+    # --- начало действия ---
+
+    def start(self, kind: str, tile_x: int, tile_y: int, crop_type=None):
+        """Действие над одним тайлом; посадка выполняется сразу."""
+        world = self.world
+        if self.current is not None:
+            return "busy"
+        if kind not in ACTIONS:
+            return "unknown_action"
+        if not world.in_bounds(tile_x, tile_y) or not self.tile_in_range(tile_x, tile_y):
+            return "out_of_range"
+
+        if kind == "plant":
+            if crop_type not in CROP_TYPES[1:]:
+                return "unknown_crop"
+            return None if world.plant(tile_x, tile_y, crop_type, self.inventory) else "not_allowed"
+
+        allowed = world.can_dig(tile_x, tile_y) if kind == "dig" else world.can_harvest(tile_x, tile_y)
+        if not allowed:
+            return "not_allowed"
+        self.current = {
+            "kind": kind,
+            "tile_x": tile_x,
+            "tile_y": tile_y,
+            "elapsed": 0.0,
+            "duration": ACTION_DURATIONS[kind],
+        }
+        return None
+
+    def start_area(self, kind: str, area, crop_type=None):
+        """Массовое действие над прямоугольником с одним таймером прогресса.
+
+        Затрагиваются только тайлы в радиусе area_range_tiles (area_in_range):
+        действие хранит обрезанный прямоугольник и маску, полоска прогресса
+        стоит над их центром.
+        """
+        if self.current is not None:
+            return "busy"
+        if kind not in ACTIONS:
+            return "unknown_action"
+        if kind == "plant" and crop_type not in CROP_TYPES[1:]:
+            return "unknown_crop"
+        reachable = self.area_in_range(area)
+        if reachable is None:
+            return "out_of_range"
+        count = self.count_area(kind, reachable, crop_type)
+        if not count:
+            return "not_allowed"
+
+        x0, y0, x1, y1, mask = reachable
+        self.current = {
+            "kind": kind,
+            # полоска прогресса — над центром затрагиваемых тайлов
+            "tile_x": (x0 + x1 - 1) // 2,
+            "tile_y": (y0 + y1 - 1) // 2,
+            "area": (x0, y0, x1, y1),
+            "mask": mask,
+            "crop_type": crop_type,
+            "elapsed": 0.0,
+            "duration": ACTION_DURATIONS[kind] + self.area_seconds_per_tile * count,
+        }
+        return None
+
+    # --- ход времени ---
+
+    def update(self, dt: float) -> bool:
+        """Продвигает таймер; True — действие шло, и герой в этот шаг стоит."""
+        action = self.current
+        if action is None:
+            return False
+        action["elapsed"] += dt
+        if action["elapsed"] >= action["duration"]:
+            self.finish()
+        return True
+
+    def advance(self, seconds: float):
+        """Пропуск времени: действие либо завершается, либо продвигается."""
+        action = self.current
+        if action is None:
+            return
+        if seconds >= action["duration"] - action["elapsed"]:
+            self.finish()
+        else:
+            action["elapsed"] += seconds
+
+    def finish(self):
+        action = self.current
+        if action is None:
+            return
+        self.current = None
+        world = self.world
+        kind = action["kind"]
+        area = action.get("area")
+
+        if area is not None:
+            # тайлы, выбранные при старте (герой стоит, пока идёт действие)
+            mask = action["mask"]
+            if kind == "dig":
+                world.dig_area(*area, mask=mask)
+            elif kind == "plant":
+                world.plant_area(*area, action["crop_type"], self.inventory, mask=mask)
+            elif kind == "harvest":
+                world.harvest_area(*area, self.inventory, mask=mask)
+        elif kind == "dig":
+            world.dig(action["tile_x"], action["tile_y"])
+        elif kind == "harvest":
+            world.harvest(action["tile_x"], action["tile_y"], self.inventory)
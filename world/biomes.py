@@ -0,0 +1,94 @@
+"""Генерация биомов: детерминированный value noise на массивах NumPy.
+
+Значение шума в узле решётки — хеш (seed, ix, iy), а не очередное число
+генератора, поэтому результат в точке не зависит от размера и положения
+окна: World целиком и чанки StreamingWorld получают одну и ту же
+бесшовную карту из одного зерна.
+"""
+import numpy as np
+
+from .grid import GROUND_TYPES
+
+
+# масштабы шума в тайлах: влажность — островки, жара — крупные зоны
+MOISTURE_SCALE = 24.0
+HEAT_SCALE = 56.0
+OCTAVES = 3
+
+_GRASS = GROUND_TYPES.index("grass")
+_DRY_GRASS = GROUND_TYPES.index("dry_grass")
+_MEADOW = GROUND_TYPES.index("meadow")
+_SAND = GROUND_TYPES.index("sand")
+
+_MASK64 = (1 << 64) - 1
+
+
+def _hash_unit(seed: int, ix: np.ndarray, iy: np.ndarray) -> np.ndarray:
+    """Псевдослучайные числа [0, 1) для узлов решётки (перемешивание splitmix64)."""
+    h = (
+        ix.astype(np.int64).view(np.uint64) * np.uint64(0x9E3779B97F4A7C15)
+        ^ iy.astype(np.int64).view(np.uint64) * np.uint64(0xC2B2AE3D27D4EB4F)
+        ^ np.uint64(seed & _MASK64)
+    )
+    h ^= h >> np.uint64(30)
+    h *= np.uint64(0xBF58476D1CE4E5B9)
+    h ^= h >> np.uint64(27)
+    h *= np.uint64(0x94D049BB133111EB)
+    h ^= h >> np.uint64(31)
+    return (h >> np.uint64(40)).astype(np.float32) * np.float32(1.0 / (1 << 24))
+
+
+def _axis(start: int, count: int, scale: float):
+    """Узел решётки слева и сглаженная доля до него для каждой клетки оси."""
+    pos = (np.arange(start, start + count, dtype=np.float64) + 0.5) / scale
+    cell = np.floor(pos).astype(np.int64)
+    t = (pos - cell).astype(np.float32)
+    return cell, t * t * (3.0 - 2.0 * t)
+
+
+def value_noise(seed: int, x0: int, y0: int, width: int, height: int, scale: float) -> np.ndarray:
+    """Value noise (height, width) в [0, 1) для окна карты с углом (x0, y0)."""
+    cx, tx = _axis(x0, width, scale)
+    cy, ty = _axis(y0, height, scale)
+
+    # узлы, покрывающие окно, + интерполяция сначала по x, потом по y
+    lx = np.arange(cx[0], cx[-1] + 2)
+    ly = np.arange(cy[0], cy[-1] + 2)
+    lattice = _hash_unit(seed, lx[None, :], ly[:, None])
+
+    ix = cx - cx[0]
+    rows = lattice[:, ix] + (lattice[:, ix + 1] - lattice[:, ix]) * tx
+    iy = cy - cy[0]
+    top = rows[iy]
+    return top + (rows[iy + 1] - top) * ty[:, None]
+
+
+def fractal_noise(seed: int, x0: int, y0: int, width: int, height: int,
+                  scale: float, octaves: int = OCTAVES) -> np.ndarray:
+    """Сумма октав value noise, нормированная в [0, 1)."""
+    total = np.zeros((height, width), dtype=np.float32)
+    amplitude = 1.0
+    norm = 0.0
+    for octave in range(octaves):
+        total += amplitude * value_noise(seed + octave * 7919, x0, y0, width, height, scale)
+        norm += amplitude
+        amplitude *= 0.5
+        scale /= 2.0
+    total *= np.float32(1.0 / norm)
+    return total
+
+
+def generate_ground(seed: int, x0: int, y0: int, width: int, height: int) -> np.ndarray:
+    """Коды GROUND_TYPES (height, width, uint8) для окна карты.
+
+    Влажность делит карту на сухую траву, траву и луг, а в самых сухих
+    и жарких местах появляется песок.
+    """
+    moisture = fractal_noise(seed * 2 + 1, x0, y0, width, height, MOISTURE_SCALE)
+    heat = fractal_noise(seed * 2 + 2, x0, y0, width, height, HEAT_SCALE)
+
+    codes = np.full((height, width), _GRASS, dtype=np.uint8)
+    codes[moisture < 0.42] = _DRY_GRASS
+    codes[moisture > 0.62] = _MEADOW
+    codes[(moisture < 0.36) & (heat > 0.58)] = _SAND
+    return codes
@@ -0,0 +1,64 @@
+import os
+
+import numpy as np
+
+from entities.registry import STATE_CROP
+
+from .map import World
+
+
+class ChunkStore:
+    """Выгруженные чанки потокового мира на диске: по файлу .npz на чанк.
+
+    Сохраняются только чанки, которые менялись после генерации, —
+    нетронутые дешевле сгенерировать заново по тому же зерну.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, cx: int, cy: int) -> str:
+        return os.path.join(self.directory, f"chunk_{cx}_{cy}.npz")
+
+    def __contains__(self, key) -> bool:
+        return os.path.exists(self._path(*key))
+
+    def save(self, cx: int, cy: int, world: World):
+        states, crops, stages = world.grid.region_codes(0, 0, world.width, world.height)
+        deadlines = np.zeros(states.shape, dtype=np.float64)
+        for y, x in zip(*np.nonzero(states == STATE_CROP)):
+            deadline = world.growth_deadline(int(x), int(y))
+            if deadline is not None:
+                deadlines[y, x] = deadline
+
+        path = self._path(cx, cy)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez_compressed(
+                f,
+                ground=world.grid.ground_codes(),
+                state=states,
+                crop=crops,
+                stage=stages,
+                deadline=deadlines,
+                sim_time=np.float64(world.sim_time),
+            )
+        os.replace(tmp_path, path)
+
+    def load(self, cx: int, cy: int, tile_size: int, backend: str = "objects"):
+        """World чанка или None, если чанк не сохранялся."""
+        path = self._path(cx, cy)
+        if not os.path.exists(path):
+            return None
+
+        with np.load(path) as data:
+            height, width = data["state"].shape
+            world = World(width, height, tile_size, backend=backend, generate=False)
+            world.sim_time = float(data["sim_time"])
+            world.grid.set_ground_codes(data["ground"])
+            world.grid.set_region_codes(0, 0, data["state"], data["crop"], data["stage"])
+            deadlines = data["deadline"]
+            for y, x in zip(*np.nonzero(deadlines > 0.0)):
+                world.set_growth_deadline(int(x), int(y), float(deadlines[y, x]))
+        return world
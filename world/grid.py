@@ -0,0 +1,288 @@
+import os
+
+import numpy as np
+
+# Коды полей тайла — из общего реестра (реэкспорт для старых импортов)
+from entities.registry import (
+    CROP_CODES,
+    CROP_TYPES,
+    GROUND_CODES,
+    GROUND_TYPES,
+    NO_CROP,
+    STATE_CODES,
+    STATE_CROP,
+    STATE_GROUND,
+    STATE_SOIL,
+    TILE_STATES,
+)
+from entities.tile import Tile
+
+
+class ObjectTileGrid:
+    """Классическое хранилище: список строк с объектами Tile."""
+
+    def __init__(self, width: int, height: int, ground_type: str = "grass"):
+        self.width = width
+        self.height = height
+        self.tiles = [
+            [Tile(ground_type) for _ in range(width)]
+            for _ in range(height)
+        ]
+
+    def get(self, x: int, y: int):
+        return self.tiles[y][x]
+
+    def stages_at(self, xs, ys):
+        return np.array([self.tiles[y][x].growth_stage for x, y in zip(xs, ys)], dtype=np.int64)
+
+    def set_growth(self, xs, ys, stages, timers):
+        for x, y, stage, timer in zip(xs, ys, stages, timers):
+            tile = self.tiles[y][x]
+            tile.growth_stage = int(stage)
+            tile.growth_timer = float(timer)
+
+    def ground_codes(self):
+        """Слой биомов как массив кодов (height, width)."""
+        return np.array(
+            [[tile.ground for tile in row] for row in self.tiles],
+            dtype=np.uint8,
+        ).reshape(self.height, self.width)
+
+    def set_ground_codes(self, codes):
+        for row, row_codes in zip(self.tiles, codes.tolist()):
+            for tile, code in zip(row, row_codes):
+                tile.ground = code
+
+    def region_codes(self, x0: int, y0: int, x1: int, y1: int):
+        """(state, crop_type, growth_stage) прямоугольника как массивы uint8."""
+        shape = (y1 - y0, x1 - x0)
+        states = np.zeros(shape, dtype=np.uint8)
+        crops = np.zeros(shape, dtype=np.uint8)
+        stages = np.zeros(shape, dtype=np.uint8)
+        for y in range(y0, y1):
+            for x in range(x0, x1):
+                tile = self.tiles[y][x]
+                states[y - y0, x - x0] = tile.state
+                crops[y - y0, x - x0] = tile.crop
+                stages[y - y0, x - x0] = tile.growth_stage
+        return states, crops, stages
+
+    def set_region_codes(self, x0: int, y0: int, states, crops, stages):
+        rows = zip(states.tolist(), crops.tolist(), stages.tolist())
+        for y, (row_states, row_crops, row_stages) in enumerate(rows, y0):
+            row = self.tiles[y]
+            for x, state, crop, stage in zip(range(x0, x0 + len(row_states)),
+                                             row_states, row_crops, row_stages):
+                tile = row[x]
+                tile.state = state
+                tile.crop = crop
+                tile.growth_stage = stage
+                tile.growth_timer = 0.0
+
+    def count(self, state=None, crop_type=None, ground_type=None) -> int:
+        return len(self.find(state, crop_type, ground_type))
+
+    def find(self, state=None, crop_type=None, ground_type=None):
+        """Список (x, y) тайлов, подходящих под все заданные условия."""
+        state = None if state is None else STATE_CODES[state]
+        crop = None if crop_type is None else CROP_CODES[crop_type]
+        ground = None if ground_type is None else GROUND_CODES[ground_type]
+        result = []
+        for y, row in enumerate(self.tiles):
+            for x, tile in enumerate(row):
+                if state is not None and tile.state != state:
+                    continue
+                if crop is not None and tile.crop != crop:
+                    continue
+                if ground is not None and tile.ground != ground:
+                    continue
+                result.append((x, y))
+        return result
+
+
+class TileView:
+    """Вид на одну клетку ArrayTileGrid с интерфейсом Tile."""
+
+    __slots__ = ("_grid", "_x", "_y")
+
+    def __init__(self, grid, x: int, y: int):
+        self._grid = grid
+        self._x = x
+        self._y = y
+
+    # коды — как у Tile
+
+    @property
+    def ground(self):
+        return int(self._grid.ground_type[self._y, self._x])
+
+    @ground.setter
+    def ground(self, value):
+        self._grid.ground_type[self._y, self._x] = value
+
+    @property
+    def state(self):
+        return int(self._grid.state[self._y, self._x])
+
+    @state.setter
+    def state(self, value):
+        self._grid.state[self._y, self._x] = value
+
+    @property
+    def crop(self):
+        return int(self._grid.crop_type[self._y, self._x])
+
+    @crop.setter
+    def crop(self, value):
+        self._grid.crop_type[self._y, self._x] = value
+
+    # строковый интерфейс
+
+    @property
+    def ground_type(self):
+        return GROUND_TYPES[self._grid.ground_type[self._y, self._x]]
+
+    @ground_type.setter
+    def ground_type(self, value):
+        self._grid.ground_type[self._y, self._x] = GROUND_CODES[value]
+
+    @property
+    def type(self):
+        return TILE_STATES[self._grid.state[self._y, self._x]]
+
+    @type.setter
+    def type(self, value):
+        self._grid.state[self._y, self._x] = STATE_CODES[value]
+
+    @property
+    def crop_type(self):
+        return CROP_TYPES[self._grid.crop_type[self._y, self._x]]
+
+    @crop_type.setter
+    def crop_type(self, value):
+        self._grid.crop_type[self._y, self._x] = CROP_CODES[value]
+
+    @property
+    def growth_stage(self):
+        return int(self._grid.growth_stage[self._y, self._x])
+
+    @growth_stage.setter
+    def growth_stage(self, value):
+        self._grid.growth_stage[self._y, self._x] = value
+
+    @property
+    def growth_timer(self):
+        return float(self._grid.growth_timer[self._y, self._x])
+
+    @growth_timer.setter
+    def growth_timer(self, value):
+        self._grid.growth_timer[self._y, self._x] = value
+
+    def reset_crop(self):
+        self.state = STATE_SOIL
+        self.crop = NO_CROP
+        self.growth_stage = 0
+        self.growth_timer = 0.0
+
+
+class ArrayTileGrid:
+    """Хранилище "структура массивов": по типизированному NumPy-массиву на поле.
+
+    При memmap_dir массивы отображаются в файлы на диске (np.memmap),
+    что позволяет держать очень большие карты без расхода RAM.
+    """
+
+    FIELDS = (
+        ("ground_type", np.uint8),
+        ("state", np.uint8),
+        ("crop_type", np.uint8),
+        ("growth_stage", np.uint8),
+        ("growth_timer", np.float32),
+    )
+
+    def __init__(self, width: int, height: int, ground_type: str = "grass", memmap_dir=None):
+        self.width = width
+        self.height = height
+        self.memmap_dir = memmap_dir
+        if memmap_dir is not None:
+            os.makedirs(memmap_dir, exist_ok=True)
+
+        for name, dtype in self.FIELDS:
+            setattr(self, name, self._allocate(name, dtype))
+
+        self.ground_type[:] = GROUND_CODES[ground_type]
+        self.state[:] = STATE_GROUND
+
+    def _allocate(self, name: str, dtype):
+        shape = (self.height, self.width)
+        if self.memmap_dir is None:
+            return np.zeros(shape, dtype=dtype)
+        path = os.path.join(self.memmap_dir, f"{name}.bin")
+        arr = np.memmap(path, dtype=dtype, mode="w+", shape=shape)
+        arr[:] = 0
+        return arr
+
+    def get(self, x: int, y: int):
+        return TileView(self, x, y)
+
+    def flush(self):
+        """Сбрасывает изменения memmap-массивов на диск."""
+        if self.memmap_dir is None:
+            return
+        for name, _ in self.FIELDS:
+            getattr(self, name).flush()
+
+    # --- векторные операции по всей карте ---
+
+    def stages_at(self, xs, ys):
+        return self.growth_stage[ys, xs].astype(np.int64)
+
+    def set_growth(self, xs, ys, stages, timers):
+        self.growth_stage[ys, xs] = stages
+        self.growth_timer[ys, xs] = timers
+
+    def ground_codes(self):
+        return np.array(self.ground_type)
+
+    def set_ground_codes(self, codes):
+        self.ground_type[:] = codes
+
+    def region_codes(self, x0: int, y0: int, x1: int, y1: int):
+        return (
+            np.array(self.state[y0:y1, x0:x1]),
+            np.array(self.crop_type[y0:y1, x0:x1]),
+            np.array(self.growth_stage[y0:y1, x0:x1]),
+        )
+
+    def set_region_codes(self, x0: int, y0: int, states, crops, stages):
+        h, w = states.shape
+        self.state[y0:y0 + h, x0:x0 + w] = states
+        self.crop_type[y0:y0 + h, x0:x0 + w] = crops
+        self.growth_stage[y0:y0 + h, x0:x0 + w] = stages
+        self.growth_timer[y0:y0 + h, x0:x0 + w] = 0.0
+
+    def mask(self, state=None, crop_type=None, ground_type=None):
+        """Булева маска (height, width) тайлов под заданные условия."""
+        result = np.ones((self.height, self.width), dtype=bool)
+        if state is not None:
+            result &= self.state == STATE_CODES[state]
+        if crop_type is not None:
+            result &= self.crop_type == CROP_CODES[crop_type]
+        if ground_type is not None:
+            result &= self.ground_type == GROUND_CODES[ground_type]
+        return result
+
+    def count(self, state=None, crop_type=None, ground_type=None) -> int:
+        return int(np.count_nonzero(self.mask(state, crop_type, ground_type)))
+
+    def find(self, state=None, crop_type=None, ground_type=None):
+        ys, xs = np.nonzero(self.mask(state, crop_type, ground_type))
+        return list(zip(xs.tolist(), ys.tolist()))
+
+
+def make_grid(width: int, height: int, backend: str = "objects", memmap_dir=None):
+    if backend == "objects":
+        return ObjectTileGrid(width, height)
+    if backend == "numpy":
+        return ArrayTileGrid(width, height, memmap_dir=memmap_dir)
+    raise ValueError(f"Неизвестный backend сетки: {backend!r}")
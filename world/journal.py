@@ -0,0 +1,196 @@
+"""Журнал изменений мира для инкрементальных потребителей.
+
+World дописывает в журнал компактные записи (x, y, поле, новое значение):
+поле — индекс в FIELDS, значение — код из TILE_STATES / CROP_TYPES или
+фаза роста. Записи сгруппированы по тикам (World.update / advance).
+
+Каждый потребитель (сохранения, сетевая синхронизация, миникарта)
+держит свой курсор и читает только записи с прошлого чтения — работа
+O(изменений), а не O(карты). Записи, которые прочли все курсоры,
+выбрасываются; без курсоров журнал ничего не хранит.
+"""
+import weakref
+from array import array
+
+import numpy as np
+
+
+FIELDS = ("state", "crop_type", "growth_stage")
+STATE, CROP_TYPE, GROWTH_STAGE = range(len(FIELDS))
+
+# меньше прочитанного хвоста не сжимаем — сдвиг массивов дороже
+COMPACT_MIN = 4096
+
+
+class ChangeBatch:
+    """Записи между двумя чтениями курсора: столбцы NumPy одной длины.
+
+    ticks — пары (тик, индекс первой записи тика в пачке).
+    """
+
+    __slots__ = ("xs", "ys", "fields", "values", "ticks")
+
+    def __init__(self, xs, ys, fields, values, ticks):
+        self.xs = xs
+        self.ys = ys
+        self.fields = fields
+        self.values = values
+        self.ticks = ticks
+
+    def __len__(self):
+        return len(self.xs)
+
+    def tiles(self):
+        """Уникальные (x, y) изменённых тайлов."""
+        if not len(self.xs):
+            return []
+        pairs = np.unique(np.stack((self.xs, self.ys), axis=1), axis=0)
+        return [tuple(p) for p in pairs.tolist()]
+
+
+class JournalCursor:
+    """Позиция одного потребителя в журнале."""
+
+    def __init__(self, journal):
+        self._journal = journal
+        self.position = journal.end
+
+    @property
+    def pending(self) -> int:
+        return self._journal.end - self.position
+
+    def read(self) -> ChangeBatch:
+        """Все записи с прошлого чтения; курсор сдвигается в конец журнала."""
+        batch = self._journal._slice(self.position)
+        self.position = self._journal.end
+        self._journal._compact()
+        return batch
+
+    def skip(self):
+        """Пропустить накопленное (потребитель перестроился целиком)."""
+        self.position = self._journal.end
+        self._journal._compact()
+
+    def close(self):
+        self._journal._cursors.discard(self)
+        self._journal._compact()
+
+
+class ChangeJournal:
+    def __init__(self):
+        self.tick = 0
+        self._base = 0  # номер первой хранимой записи
+        self._xs = array("i")
+        self._ys = array("i")
+        self._fields = array("B")
+        self._values = array("i")
+        self._tick_starts = []  # (номер первой записи, тик)
+        # брошенный без close() курсор не держит журнал
+        self._cursors = weakref.WeakSet()
+
+    @property
+    def end(self) -> int:
+        return self._base + len(self._xs)
+
+    @property
+    def active(self) -> bool:
+        return bool(self._cursors)
+
+    def subscribe(self) -> JournalCursor:
+        """Новый курсор; он увидит записи, сделанные после подписки."""
+        cursor = JournalCursor(self)
+        self._cursors.add(cursor)
+        return cursor
+
+    def offset(self, ox: int, oy: int):
+        """Журнал со сдвигом координат (чанки StreamingWorld пишут в общий журнал)."""
+        return _OffsetJournal(self, ox, oy)
+
+    # --- запись ---
+
+    def begin_tick(self):
+        self.tick += 1
+
+    def _mark_tick(self):
+        if not self._tick_starts or self._tick_starts[-1][1] != self.tick:
+            self._tick_starts.append((self.end, self.tick))
+
+    def append(self, x: int, y: int, field: int, value: int):
+        if not self._cursors:
+            return
+        self._mark_tick()
+        self._xs.append(x)
+        self._ys.append(y)
+        self._fields.append(field)
+        self._values.append(value)
+
+    def extend(self, xs, ys, field: int, values):
+        """Пачка записей одного поля (массивы NumPy одной длины)."""
+        if not self._cursors or not len(xs):
+            return
+        self._mark_tick()
+        self._xs.frombytes(np.asarray(xs, dtype=np.int32).tobytes())
+        self._ys.frombytes(np.asarray(ys, dtype=np.int32).tobytes())
+        self._fields.frombytes(np.full(len(xs), field, dtype=np.uint8).tobytes())
+        self._values.frombytes(np.asarray(values, dtype=np.int32).tobytes())
+
+    # --- чтение и сжатие ---
+
+    def _tick_spans(self):
+        """(первая запись, запись после последней, тик) для каждого тика в журнале."""
+        starts = self._tick_starts
+        for n, (seq, tick) in enumerate(starts):
+            following = starts[n + 1][0] if n + 1 < len(starts) else self.end
+            yield seq, following, tick
+
+    def _slice(self, start: int) -> ChangeBatch:
+        i = start - self._base
+        return ChangeBatch(
+            np.frombuffer(self._xs[i:], dtype=np.int32),
+            np.frombuffer(self._ys[i:], dtype=np.int32),
+            np.frombuffer(self._fields[i:], dtype=np.uint8),
+            np.frombuffer(self._values[i:], dtype=np.int32),
+            [(tick, max(0, seq - start)) for seq, following, tick in self._tick_spans()
+             if following > start],
+        )
+
+    def _compact(self):
+        if self._cursors:
+            done = min(cursor.position for cursor in self._cursors) - self._base
+        else:
+            done = len(self._xs)
+        if done <= 0 or (done < COMPACT_MIN and done < len(self._xs)):
+            return
+        base = self._base + done
+        # тики, от которых что-то осталось; начало первого — не раньше новой базы
+        self._tick_starts = [
+            (max(seq, base), tick) for seq, following, tick in self._tick_spans()
+            if following > base
+        ]
+        del self._xs[:done]
+        del self._ys[:done]
+        del self._fields[:done]
+        del self._values[:done]
+        self._base = base
+
+
+class _OffsetJournal:
+    """Запись в общий журнал со сдвигом координат; тиками управляет владелец."""
+
+    def __init__(self, journal: ChangeJournal, ox: int, oy: int):
+        self._journal = journal
+        self._ox = ox
+        self._oy = oy
+
+    @property
+    def active(self) -> bool:
+        return self._journal.active
+
+    def begin_tick(self):
+        pass
+
+    def append(self, x: int, y: int, field: int, value: int):
+        self._journal.append(x + self._ox, y + self._oy, field, value)
+
+    def extend(self, xs, ys, field: int, values):
+        self._journal.extend(np.asarray(xs) + self._ox, np.asarray(ys) + self._oy, field, values)
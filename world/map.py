@@ -1,75 +1,160 @@
-import random
+import heapq
 
-from entities.tile import Tile
-from entities.crop import MAX_GROWTH_STAGE, GROWTH_STAGE_TIME, roll_harvest_amount
+import numpy as np
+
+from entities.crop import (
+    MAX_GROWTH_STAGE,
+    GROWTH_STAGE_TIME,
+    roll_harvest_amount,
+    roll_harvest_amounts,
+)
+from .biomes import generate_ground
+from .grid import (
+    CROP_CODES,
+    CROP_TYPES,
+    NO_CROP,
+    STATE_CROP,
+    STATE_GROUND,
+    STATE_SOIL,
+    make_grid,
+)
+from .journal import CROP_TYPE, GROWTH_STAGE, STATE, ChangeJournal
+
+
+def area_from_tiles(tiles):
+    """(x0, y0, x1, y1, mask) для произвольного набора тайлов (x, y) — аргументы *_area."""
+    xs = np.fromiter((x for x, _ in tiles), dtype=np.int64)
+    ys = np.fromiter((y for _, y in tiles), dtype=np.int64)
+    if not len(xs):
+        return 0, 0, 0, 0, None
+    x0, y0 = int(xs.min()), int(ys.min())
+    x1, y1 = int(xs.max()) + 1, int(ys.max()) + 1
+    mask = np.zeros((y1 - y0, x1 - x0), dtype=bool)
+    mask[ys - y0, xs - x0] = True
+    return x0, y0, x1, y1, mask
 
 
 class World:
-    def __init__(self, width: int, height: int, tile_size: int):
+    # карта конечна и целиком в памяти (см. StreamingWorld)
+    bounded = True
+
+    def __init__(self, width: int, height: int, tile_size: int,
+                 backend: str = "objects", memmap_dir=None, generate: bool = True,
+                 seed: int = 0):
         self.width = width
         self.height = height
         self.tile_size = tile_size
+        self.seed = seed
 
         self.width_px = self.width * self.tile_size
         self.height_px = self.height * self.tile_size
 
-        # Базово заполняем обычной травой
-        self.tiles = [
-            [Tile("grass") for _ in range(self.width)]
-            for _ in range(self.height)
-        ]
+        # Базово заполняем обычной травой.
+        # backend="numpy" — массивы по полям (и memmap для огромных карт).
+        self.grid = make_grid(self.width, self.height, backend, memmap_dir)
 
-        # Генерируем островки сухой травы как другой биом
-        self._generate_dry_grass_patches()
+        # Биомы из зерна: одинаковый seed — одинаковая карта
+        # (generate=False — биомы придут из сохранения)
+        if generate:
+            self.grid.set_ground_codes(generate_ground(seed, 0, 0, self.width, self.height))
 
-    # --- генерация биомов ---
+        # Подписчики на изменения тайлов (например, кэш чанков рендера):
+        # пары (callback(x, y), area_callback(x0, y0, x1, y1) или None)
+        self._tile_listeners = []
+        # Журнал изменений (x, y, поле, значение) для потребителей с курсорами
+        self.journal = ChangeJournal()
 
-    def _generate_dry_grass_patches(self):
-        patches = max(4, (self.width * self.height) // 150)
-        for _ in range(patches):
-            cx = random.randint(0, self.width - 1)
-            cy = random.randint(0, self.height - 1)
-            radius = random.randint(3, 7)
-
-            for y in range(max(0, cy - radius), min(self.height, cy + radius + 1)):
-                for x in range(max(0, cx - radius), min(self.width, cx + radius + 1)):
-                    if (x - cx) ** 2 + (y - cy) ** 2 <= radius ** 2:
-                        self.tiles[y][x].ground_type = "dry_grass"
+        # Планировщик роста: вместо обхода всей карты держим очередь
+        # дедлайнов следующей фазы для растущих культур.
+        self.sim_time = 0.0
+        # тайл адресуется плоским индексом y * width + x
+        self._growth_queue = []      # куча (deadline, index)
+        self._growth_deadlines = {}  # index -> актуальный дедлайн
 
     # --- доступ к тайлам ---
 
+    def spawn_point(self):
+        return self.width_px // 2, self.height_px // 2
+
+    def stream_around(self, px: float, py: float):
+        """Вся карта уже загружена — подгружать нечего."""
+
+    def close(self):
+        """Мир целиком в памяти — освобождать нечего."""
+
     def in_bounds(self, x: int, y: int) -> bool:
         return 0 <= x < self.width and 0 <= y < self.height
 
     def get_tile(self, x: int, y: int):
         if not self.in_bounds(x, y):
             return None
-        return self.tiles[y][x]
+        return self.grid.get(x, y)
+
+    def count_tiles(self, state=None, crop_type=None, ground_type=None) -> int:
+        """Количество тайлов с заданным состоянием / культурой / биомом."""
+        return self.grid.count(state, crop_type, ground_type)
+
+    def find_tiles(self, state=None, crop_type=None, ground_type=None):
+        """Координаты (x, y) всех тайлов под заданные условия."""
+        return self.grid.find(state, crop_type, ground_type)
+
+    # --- уведомления об изменениях ---
+
+    def add_tile_listener(self, callback, area_callback=None):
+        """callback(x, y) вызывается после каждого изменения тайла.
+
+        area_callback(x0, y0, x1, y1) — об изменении прямоугольника целиком
+        (массовые операции); без него callback зовётся для каждого тайла.
+        """
+        self._tile_listeners.append((callback, area_callback))
+
+    def _tile_changed(self, x: int, y: int):
+        for callback, _ in self._tile_listeners:
+            callback(x, y)
+
+    def _journal_tile(self, x: int, y: int, tile):
+        journal = self.journal
+        if not journal.active:
+            return
+        journal.append(x, y, STATE, tile.state)
+        journal.append(x, y, CROP_TYPE, tile.crop)
+        journal.append(x, y, GROWTH_STAGE, tile.growth_stage)
+
+    def _area_changed(self, x0: int, y0: int, x1: int, y1: int):
+        for callback, area_callback in self._tile_listeners:
+            if area_callback is not None:
+                area_callback(x0, y0, x1, y1)
+                continue
+            for y in range(y0, y1):
+                for x in range(x0, x1):
+                    callback(x, y)
 
     # --- логика грядок и роста ---
 
     def can_dig(self, x: int, y: int) -> bool:
         tile = self.get_tile(x, y)
         # Копать можно только по "чистой" поверхности (трава / сухая трава)
-        return tile is not None and tile.type == "ground"
+        return tile is not None and tile.state == STATE_GROUND
 
     def dig(self, x: int, y: int) -> bool:
         if not self.can_dig(x, y):
             return False
         tile = self.get_tile(x, y)
-        tile.type = "soil"
-        tile.crop_type = None
+        tile.state = STATE_SOIL
+        tile.crop = NO_CROP
         tile.growth_stage = 0
         tile.growth_timer = 0.0
+        self._journal_tile(x, y, tile)
+        self._tile_changed(x, y)
         return True
 
     def can_plant(self, x: int, y: int, crop_type: str, inventory) -> bool:
         tile = self.get_tile(x, y)
         if tile is None:
             return False
-        if tile.type not in ("soil", "crop"):
+        if tile.state == STATE_GROUND:
             return False
-        if tile.crop_type is not None and tile.growth_stage > 0:
+        if tile.crop != NO_CROP and tile.growth_stage > 0:
             return False
         if not inventory.can_plant(crop_type):
             return False
@@ -79,19 +164,22 @@ class World:
         if not self.can_plant(x, y, crop_type, inventory):
             return False
         tile = self.get_tile(x, y)
-        tile.type = "crop"
-        tile.crop_type = crop_type
+        tile.state = STATE_CROP
+        tile.crop = CROP_CODES[crop_type]
         tile.growth_stage = 1
         tile.growth_timer = 0.0
         inventory.use_seed(crop_type)
+        self._schedule_growth(x, y)
+        self._journal_tile(x, y, tile)
+        self._tile_changed(x, y)
         return True
 
     def can_harvest(self, x: int, y: int) -> bool:
         tile = self.get_tile(x, y)
         return (
             tile is not None
-            and tile.type == "crop"
-            and tile.crop_type is not None
+            and tile.state == STATE_CROP
+            and tile.crop != NO_CROP
             and tile.growth_stage >= MAX_GROWTH_STAGE
         )
 
@@ -105,19 +193,229 @@ class World:
 
         # поле остаётся вспаханным
         tile.reset_crop()
+        self._cancel_growth(y * self.width + x)
+        self._journal_tile(x, y, tile)
+        self._tile_changed(x, y)
         return True
 
+    # --- массовые операции над прямоугольником ---
+    #
+    # Прямоугольник полуоткрытый: [x0, x1) x [y0, y1), обрезается по карте.
+    # mask (bool, форма (y1 - y0, x1 - x0)) выбирает тайлы внутри него,
+    # см. area_from_tiles. Слушатели получают одно уведомление на операцию.
+
+    def _area_codes(self, x0, y0, x1, y1, mask):
+        cx0, cy0 = max(0, x0), max(0, y0)
+        cx1, cy1 = min(self.width, x1), min(self.height, y1)
+        if cx0 >= cx1 or cy0 >= cy1:
+            return None
+        if mask is not None:
+            mask = mask[cy0 - y0:cy1 - y0, cx0 - x0:cx1 - x0]
+        states, crops, stages = self.grid.region_codes(cx0, cy0, cx1, cy1)
+        return cx0, cy0, cx1, cy1, mask, states, crops, stages
+
+    @staticmethod
+    def _area_selection(action: str, states, crops, stages, mask):
+        """Тайлы, к которым применимо действие (логика can_dig / can_plant / can_harvest)."""
+        if action == "dig":
+            selection = states == STATE_GROUND
+        elif action == "plant":
+            selection = (states != STATE_GROUND) & ~((crops != NO_CROP) & (stages > 0))
+        elif action == "harvest":
+            selection = (states == STATE_CROP) & (crops != NO_CROP) & (stages >= MAX_GROWTH_STAGE)
+        else:
+            raise ValueError(f"Неизвестное действие: {action!r}")
+        if mask is not None:
+            selection &= mask
+        return selection
+
+    def count_area(self, action: str, x0: int, y0: int, x1: int, y1: int, mask=None) -> int:
+        """Сколько тайлов прямоугольника затронет action ("dig", "plant", "harvest")."""
+        area = self._area_codes(x0, y0, x1, y1, mask)
+        if area is None:
+            return 0
+        return int(np.count_nonzero(self._area_selection(action, *area[5:], area[4])))
+
+    def _commit_area(self, x0, y0, selection, states, crops, stages) -> int:
+        ys, xs = np.nonzero(selection)
+        if not len(xs):
+            return 0
+        self.grid.set_region_codes(x0, y0, states, crops, stages)
+        if self.journal.active:
+            for field, codes in ((STATE, states), (CROP_TYPE, crops), (GROWTH_STAGE, stages)):
+                self.journal.extend(xs + x0, ys + y0, field, codes[ys, xs])
+        self._area_changed(x0 + int(xs.min()), y0 + int(ys.min()),
+                           x0 + int(xs.max()) + 1, y0 + int(ys.max()) + 1)
+        return len(xs)
+
+    def dig_area(self, x0: int, y0: int, x1: int, y1: int, mask=None) -> int:
+        """Вскапывает все подходящие тайлы прямоугольника; возвращает их число."""
+        area = self._area_codes(x0, y0, x1, y1, mask)
+        if area is None:
+            return 0
+        x0, y0, _, _, mask, states, crops, stages = area
+        selection = self._area_selection("dig", states, crops, stages, mask)
+        states[selection] = STATE_SOIL
+        crops[selection] = NO_CROP
+        stages[selection] = 0
+        return self._commit_area(x0, y0, selection, states, crops, stages)
+
+    def plant_area(self, x0: int, y0: int, x1: int, y1: int, crop_type: str, inventory,
+                   mask=None) -> int:
+        """Сажает crop_type, пока хватает семян (построчно сверху вниз)."""
+        area = self._area_codes(x0, y0, x1, y1, mask)
+        if area is None:
+            return 0
+        x0, y0, _, _, mask, states, crops, stages = area
+        selection = self._area_selection("plant", states, crops, stages, mask)
+
+        flat = np.flatnonzero(selection)
+        planted = flat[:inventory.seed_count(crop_type)]
+        selection = np.zeros_like(selection)
+        selection.flat[planted] = True
+        if not len(planted):
+            return 0
+
+        states[selection] = STATE_CROP
+        crops[selection] = CROP_CODES[crop_type]
+        stages[selection] = 1
+        inventory.use_seeds(crop_type, len(planted))
+
+        # дедлайны всем посаженным — одной пачкой
+        ys, xs = np.divmod(planted, states.shape[1])
+        indices = (ys + y0) * self.width + (xs + x0)
+        self._schedule_many(indices, self.sim_time + GROWTH_STAGE_TIME)
+
+        return self._commit_area(x0, y0, selection, states, crops, stages)
+
+    def harvest_area(self, x0: int, y0: int, x1: int, y1: int, inventory, mask=None) -> int:
+        """Собирает весь созревший урожай прямоугольника, броски урожая — одной пачкой."""
+        area = self._area_codes(x0, y0, x1, y1, mask)
+        if area is None:
+            return 0
+        x0, y0, _, _, mask, states, crops, stages = area
+        selection = self._area_selection("harvest", states, crops, stages, mask)
+
+        harvested = crops[selection]
+        amounts = roll_harvest_amounts(len(harvested))
+        for code in np.unique(harvested).tolist():
+            inventory.add_harvest(CROP_TYPES[code], int(amounts[harvested == code].sum()))
+
+        # поле остаётся вспаханным
+        states[selection] = STATE_SOIL
+        crops[selection] = NO_CROP
+        stages[selection] = 0
+        ys, xs = np.nonzero(selection)
+        for index in ((ys + y0) * self.width + (xs + x0)).tolist():
+            self._cancel_growth(index)
+        return self._commit_area(x0, y0, selection, states, crops, stages)
+
+    # --- планировщик роста ---
+
+    # Хранилище дедлайнов трогают только методы этого раздела
+    # (ParallelWorld держит дедлайны в общем массиве).
+
+    def _schedule_growth(self, x: int, y: int):
+        self.set_growth_deadline(x, y, self.sim_time + GROWTH_STAGE_TIME)
+
+    def _schedule_many(self, indices, deadline: float):
+        """Один дедлайн сразу многим тайлам (плоские индексы), куча собирается заново."""
+        indices = indices.tolist()
+        self._growth_deadlines.update(dict.fromkeys(indices, deadline))
+        self._growth_queue.extend((deadline, index) for index in indices)
+        heapq.heapify(self._growth_queue)
+
+    def _cancel_growth(self, index: int):
+        self._growth_deadlines.pop(index, None)
+
+    def growth_deadline(self, x: int, y: int):
+        """Время симуляции следующей смены фазы или None, если тайл не растёт."""
+        return self._growth_deadlines.get(y * self.width + x)
+
+    def set_growth_deadline(self, x: int, y: int, deadline: float):
+        """Назначает дедлайн следующей фазы (восстановление из сохранения)."""
+        index = y * self.width + x
+        self._growth_deadlines[index] = deadline
+        heapq.heappush(self._growth_queue, (deadline, index))
+
+    def growth_timer(self, x: int, y: int) -> float:
+        """Сколько секунд культура провела в текущей фазе."""
+        deadline = self.growth_deadline(x, y)
+        if deadline is None:
+            tile = self.get_tile(x, y)
+            return tile.growth_timer if tile is not None else 0.0
+        return GROWTH_STAGE_TIME - (deadline - self.sim_time)
+
     def update(self, dt: float):
-        for row in self.tiles:
-            for tile in row:
-                if (
-                    tile.type == "crop"
-                    and tile.crop_type is not None
-                    and 1 <= tile.growth_stage < MAX_GROWTH_STAGE
-                ):
-                    tile.growth_timer += dt
-                    if tile.growth_timer >= GROWTH_STAGE_TIME:
-                        tile.growth_timer = 0.0
-                        tile.growth_stage = min(
-                            MAX_GROWTH_STAGE, tile.growth_stage + 1
-                        )
+        # Обрабатываем только тайлы, у которых наступил дедлайн фазы.
+        # tile.growth_timer обнуляется при смене фазы, текущее значение
+        # таймера между сменами даёт growth_timer(x, y).
+        self.sim_time += dt
+        self.journal.begin_tick()
+        queue = self._growth_queue
+        while queue and queue[0][0] <= self.sim_time:
+            deadline, index = heapq.heappop(queue)
+            if self._growth_deadlines.get(index) != deadline:
+                continue  # культуру уже собрали или перепосадили
+
+            y, x = divmod(index, self.width)
+            tile = self.grid.get(x, y)
+            tile.growth_timer = 0.0
+            tile.growth_stage = min(MAX_GROWTH_STAGE, tile.growth_stage + 1)
+            if tile.growth_stage < MAX_GROWTH_STAGE:
+                self._schedule_growth(x, y)
+            else:
+                del self._growth_deadlines[index]
+            self.journal.append(x, y, GROWTH_STAGE, tile.growth_stage)
+            self._tile_changed(x, y)
+
+    def advance(self, seconds: float):
+        """Перематывает рост на seconds секунд за один вызов, без покадровых update().
+
+        Новая фаза и дедлайн каждой растущей культуры считаются в
+        замкнутой форме: фаза сменяется ровно каждые GROWTH_STAGE_TIME
+        секунд от предыдущей смены (предел update() при dt -> 0).
+        Стоимость — O(число растущих культур), независимо от seconds.
+        """
+        if seconds <= 0:
+            return
+        self.sim_time += seconds
+        self.journal.begin_tick()
+        now = self.sim_time
+
+        growing = self._growth_deadlines
+        if not growing:
+            return
+
+        count = len(growing)
+        indices = np.fromiter(growing.keys(), dtype=np.int64, count=count)
+        deadlines = np.fromiter(growing.values(), dtype=np.float64, count=count)
+        due = deadlines <= now
+        if not due.any():
+            return
+
+        indices = indices[due]
+        due_deadlines = deadlines[due]
+        ys, xs = np.divmod(indices, self.width)
+
+        stages = self.grid.stages_at(xs, ys)
+        steps = 1 + np.floor((now - due_deadlines) / GROWTH_STAGE_TIME).astype(np.int64)
+        new_stages = np.minimum(MAX_GROWTH_STAGE, stages + steps)
+        # дедлайн следующей фазы отсчитывается от момента последней смены
+        new_deadlines = due_deadlines + (new_stages - stages) * GROWTH_STAGE_TIME
+
+        self.grid.set_growth(xs, ys, new_stages, np.zeros(len(xs)))
+        self.journal.extend(xs, ys, GROWTH_STAGE, new_stages)
+
+        done = new_stages >= MAX_GROWTH_STAGE
+        growing.update(zip(indices[~done].tolist(), new_deadlines[~done].tolist()))
+        for index in indices[done].tolist():
+            del growing[index]
+
+        if self._tile_listeners:
+            for x, y in zip(xs.tolist(), ys.tolist()):
+                self._tile_changed(x, y)
+
+        # очередь собираем заново — заодно выбрасываем устаревшие записи
+        self._growth_queue = list(zip(growing.values(), growing.keys()))
+        heapq.heapify(self._growth_queue)
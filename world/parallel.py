@@ -0,0 +1,222 @@
+"""Параллельный рост для огромных карт: горизонтальные полосы в пуле процессов.
+
+Фазы, таймеры и дедлайны роста лежат в multiprocessing.shared_memory.
+Процессы пула обновляют свои полосы строк прямо в общих массивах,
+главный процесс раздаёт задания и рассылает уведомления слушателям.
+Шаг полосы — векторная запись World.update() / World.advance(), поэтому
+состояние карты после шага совпадает с последовательным обновлением
+тайл в тайл.
+
+Для каждой полосы помнится ближайший дедлайн: полосы, где ничего не
+созрело, в тике не участвуют, и спокойный тик почти бесплатен.
+"""
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from entities.crop import MAX_GROWTH_STAGE, GROWTH_STAGE_TIME
+from .journal import GROWTH_STAGE
+from .map import World
+
+
+# поля ArrayTileGrid, которые пишут процессы пула
+SHARED_FIELDS = ("growth_stage", "growth_timer")
+
+# больше изменений в полосе — слушатели получают один прямоугольник
+AREA_NOTIFY_THRESHOLD = 1024
+
+# в процессе пула: имя поля -> массив на общей памяти
+_worker_arrays = {}
+_worker_blocks = []
+
+
+def _attach_worker(specs):
+    """initializer пула: открывает общие блоки по именам."""
+    for field, (block_name, dtype, shape) in specs.items():
+        block = shared_memory.SharedMemory(name=block_name)
+        _worker_blocks.append(block)
+        _worker_arrays[field] = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+
+def _step_rows(arrays, y0, y1, now, closed_form, notify_limit):
+    """Шаг роста строк [y0, y1) на месте.
+
+    closed_form=False — как World.update(): созревшие культуры проходят
+    одну фазу, следующий дедлайн — now + GROWTH_STAGE_TIME.
+    closed_form=True — как World.advance(): сразу все пропущенные фазы.
+
+    Возвращает (индексы изменённых тайлов или None, если их больше
+    notify_limit; их рамка (x0, y0, x1, y1) или None; ближайший дедлайн полосы).
+    """
+    deadlines = arrays["deadline"][y0:y1].reshape(-1)
+    stages = arrays["growth_stage"][y0:y1].reshape(-1)
+    timers = arrays["growth_timer"][y0:y1].reshape(-1)
+
+    index = np.flatnonzero(deadlines <= now)
+    if len(index):
+        due = deadlines[index]
+        old = stages[index].astype(np.int64)
+        if closed_form:
+            steps = 1 + np.floor((now - due) / GROWTH_STAGE_TIME).astype(np.int64)
+            new = np.minimum(MAX_GROWTH_STAGE, old + steps)
+            # дедлайн следующей фазы отсчитывается от момента последней смены
+            new_deadlines = due + (new - old) * GROWTH_STAGE_TIME
+        else:
+            new = np.minimum(MAX_GROWTH_STAGE, old + 1)
+            new_deadlines = np.full(len(index), now + GROWTH_STAGE_TIME)
+        new_deadlines[new >= MAX_GROWTH_STAGE] = math.inf
+
+        stages[index] = new
+        timers[index] = 0.0
+        deadlines[index] = new_deadlines
+
+    next_deadline = float(deadlines.min()) if len(deadlines) else math.inf
+    if not len(index):
+        return None, None, next_deadline
+
+    width = arrays["deadline"].shape[1]
+    ys, xs = np.divmod(index, width)
+    box = (int(xs.min()), y0 + int(ys[0]), int(xs.max()) + 1, y0 + int(ys[-1]) + 1)
+    changed = index + y0 * width if len(index) <= notify_limit else None
+    return changed, box, next_deadline
+
+
+def _run_band(y0, y1, now, closed_form, notify_limit):
+    return _step_rows(_worker_arrays, y0, y1, now, closed_form, notify_limit)
+
+
+class ParallelWorld(World):
+    """World (backend numpy), рост которого считается полосами в пуле процессов.
+
+    workers=0 — те же полосы в главном процессе, без пула (базовая линия
+    для бенчмарка и машины с одним ядром). bands — число полос
+    (по умолчанию 4 на процесс: так нагрузка ровнее, а спокойные полосы
+    пропускаются). close() обязателен: он останавливает пул и освобождает
+    общую память, мир после него остаётся рабочим, но однопоточным.
+    """
+
+    def __init__(self, width: int, height: int, tile_size: int, workers=None, bands=None,
+                 generate: bool = True, seed: int = 0):
+        super().__init__(width, height, tile_size, backend="numpy", generate=generate, seed=seed)
+        self.workers = os.cpu_count() if workers is None else workers
+
+        if bands is None:
+            bands = 4 * max(1, self.workers)
+        self.band_rows = -(-height // min(bands, height))
+        self.bands = [(y0, min(height, y0 + self.band_rows)) for y0 in range(0, height, self.band_rows)]
+        # ближайший дедлайн полосы; устаревший (слишком ранний) — лишь лишний проход
+        self._band_next = np.full(len(self.bands), math.inf)
+
+        # дедлайны — плотный массив, inf — тайл не растёт
+        self._blocks = []
+        self._arrays = {"deadline": self._share("deadline", np.full((height, width), math.inf))}
+        for field in SHARED_FIELDS:
+            array = self._share(field, getattr(self.grid, field))
+            setattr(self.grid, field, array)
+            self._arrays[field] = array
+
+        self._pool = None
+        if self.workers > 0:
+            specs = {
+                field: (block.name, array.dtype, array.shape)
+                for (field, array), block in zip(self._arrays.items(), self._blocks)
+            }
+            self._pool = ProcessPoolExecutor(self.workers, initializer=_attach_worker,
+                                             initargs=(specs,))
+
+    def _share(self, field: str, source: np.ndarray) -> np.ndarray:
+        block = shared_memory.SharedMemory(create=True, size=max(1, source.nbytes))
+        self._blocks.append(block)
+        array = np.ndarray(source.shape, dtype=source.dtype, buffer=block.buf)
+        array[:] = source
+        return array
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+        if not self._blocks:
+            return
+        # массивы переезжают в обычную память, блоки можно отпускать
+        self._arrays = {field: np.array(array) for field, array in self._arrays.items()}
+        for field in SHARED_FIELDS:
+            setattr(self.grid, field, self._arrays[field])
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks = []
+
+    # --- хранилище дедлайнов ---
+
+    def _schedule_many(self, indices, deadline: float):
+        self._arrays["deadline"].reshape(-1)[indices] = deadline
+        bands = np.unique(indices // self.width // self.band_rows)
+        self._band_next[bands] = np.minimum(self._band_next[bands], deadline)
+
+    def _cancel_growth(self, index: int):
+        self._arrays["deadline"].reshape(-1)[index] = math.inf
+
+    def growth_deadline(self, x: int, y: int):
+        deadline = float(self._arrays["deadline"][y, x])
+        return deadline if deadline < math.inf else None
+
+    def set_growth_deadline(self, x: int, y: int, deadline: float):
+        self._arrays["deadline"][y, x] = deadline
+        band = y // self.band_rows
+        self._band_next[band] = min(self._band_next[band], deadline)
+
+    # --- шаг роста ---
+
+    def _step(self, closed_form: bool):
+        now = self.sim_time
+        due = np.flatnonzero(self._band_next <= now).tolist()
+        if not due:
+            return
+
+        # журналу нужны все изменённые тайлы, слушателям — до порога
+        if self.journal.active:
+            limit = math.inf
+        else:
+            limit = AREA_NOTIFY_THRESHOLD if self._tile_listeners else 0
+        if self._pool is None:
+            results = [
+                _step_rows(self._arrays, *self.bands[band], now, closed_form, limit)
+                for band in due
+            ]
+        else:
+            futures = [
+                self._pool.submit(_run_band, *self.bands[band], now, closed_form, limit)
+                for band in due
+            ]
+            results = [future.result() for future in futures]
+
+        stages = self._arrays["growth_stage"].reshape(-1)
+        for band, (changed, box, next_deadline) in zip(due, results):
+            self._band_next[band] = next_deadline
+            if box is None:
+                continue
+            if changed is not None:
+                ys, xs = np.divmod(changed, self.width)
+                self.journal.extend(xs, ys, GROWTH_STAGE, stages[changed])
+            if not self._tile_listeners:
+                continue
+            if changed is None or len(changed) > AREA_NOTIFY_THRESHOLD:
+                self._area_changed(*box)
+                continue
+            for x, y in zip(xs.tolist(), ys.tolist()):
+                self._tile_changed(x, y)
+
+    def update(self, dt: float):
+        self.sim_time += dt
+        self.journal.begin_tick()
+        self._step(closed_form=False)
+
+    def advance(self, seconds: float):
+        if seconds <= 0:
+            return
+        self.sim_time += seconds
+        self.journal.begin_tick()
+        self._step(closed_form=True)
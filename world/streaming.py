@@ -0,0 +1,290 @@
+import shutil
+import tempfile
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from .biomes import generate_ground
+from .chunk_store import ChunkStore
+from .journal import ChangeJournal
+from .map import World
+
+
+class StreamingWorld:
+    """Неограниченный мир из чанков, которые держатся в памяти только рядом с героем.
+
+    Каждый чанк — небольшой World (chunk_tiles x chunk_tiles) со своей
+    сеткой и планировщиком роста. Чанки генерируются по требованию в
+    фоновом потоке из общего зерна мира (см. world.biomes), дальние
+    выгружаются по LRU; изменённые уходят в ChunkStore и читаются оттуда
+    при возвращении. Пока чанк выгружен, рост в нём стоит — при загрузке
+    он догоняется через World.advance().
+
+    Интерфейс тайлов и грядок совпадает с World, координаты — глобальные
+    и могут быть отрицательными.
+    """
+
+    bounded = False
+
+    def __init__(self, tile_size: int, seed: int = 0, chunk_tiles: int = 32,
+                 backend: str = "objects", store_dir=None,
+                 load_radius: int = 2, max_chunks: int = 64):
+        self.tile_size = tile_size
+        self.seed = seed
+        self.chunk_tiles = chunk_tiles
+        self.chunk_px = chunk_tiles * tile_size
+        self.backend = backend
+
+        # вокруг героя держим квадрат (2r+1)^2 чанков, всего — не больше max_chunks
+        self.load_radius = load_radius
+        self.max_chunks = max(max_chunks, (2 * load_radius + 1) ** 2)
+
+        # без store_dir чанки живут во временном каталоге до close()
+        self._temp_dir = None
+        if store_dir is None:
+            store_dir = self._temp_dir = tempfile.mkdtemp(prefix="farm_chunks_")
+        self.store = ChunkStore(store_dir)
+
+        self.sim_time = 0.0
+        self._tile_listeners = []
+        # общий журнал: чанки пишут в него в глобальных координатах
+        self.journal = ChangeJournal()
+
+        self._chunks = OrderedDict()  # (cx, cy) -> World; порядок = LRU
+        self._modified = set()        # чанки, изменённые после загрузки
+        self._pending = {}            # (cx, cy) -> Future с World
+        # один поток: сохранение и повторная загрузка чанка идут по порядку
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="chunks")
+
+    # --- генерация ---
+
+    def _generate(self, cx: int, cy: int) -> World:
+        n = self.chunk_tiles
+        world = World(n, n, self.tile_size, backend=self.backend, generate=False, seed=self.seed)
+        # шум биомов задан в глобальных координатах — границы чанков бесшовны
+        world.grid.set_ground_codes(generate_ground(self.seed, cx * n, cy * n, n, n))
+        return world
+
+    def _produce(self, cx: int, cy: int) -> World:
+        """Фоновая задача: чанк из хранилища или свежесгенерированный."""
+        world = self.store.load(cx, cy, self.tile_size, self.backend)
+        if world is None:
+            world = self._generate(cx, cy)
+        return world
+
+    # --- подгрузка и выгрузка ---
+
+    def chunk_of(self, x: int, y: int):
+        n = self.chunk_tiles
+        return x // n, y // n
+
+    def stream_around(self, px: float, py: float):
+        """Принимает готовые чанки, заказывает недостающие вокруг точки и выгружает дальние."""
+        self._collect()
+
+        ccx = int(px // self.chunk_px)
+        ccy = int(py // self.chunk_px)
+        r = self.load_radius
+        wanted = [(cx, cy) for cy in range(ccy - r, ccy + r + 1) for cx in range(ccx - r, ccx + r + 1)]
+        # ближние — первыми в очередь генерации
+        wanted.sort(key=lambda key: max(abs(key[0] - ccx), abs(key[1] - ccy)))
+
+        for key in wanted:
+            if key in self._chunks:
+                self._chunks.move_to_end(key)
+            elif key not in self._pending:
+                self._pending[key] = self._executor.submit(self._produce, *key)
+
+        while len(self._chunks) > self.max_chunks:
+            self._evict(next(iter(self._chunks)))
+
+    def preload(self, px: float, py: float):
+        """Синхронно загружает окрестность точки (старт игры, телепорт)."""
+        self.stream_around(px, py)
+        for future in list(self._pending.values()):
+            future.result()
+        self._collect()
+
+    def _collect(self):
+        for key, future in list(self._pending.items()):
+            if future.done():
+                del self._pending[key]
+                self._install(key, future.result())
+
+    def _install(self, key, world: World):
+        n = self.chunk_tiles
+        x0, y0 = key[0] * n, key[1] * n
+
+        def forward(x, y):
+            self._modified.add(key)
+            self._tile_changed(x0 + x, y0 + y)
+
+        def forward_area(ax0, ay0, ax1, ay1):
+            self._modified.add(key)
+            self._area_changed(x0 + ax0, y0 + ay0, x0 + ax1, y0 + ay1)
+
+        world.add_tile_listener(forward, forward_area)
+        world.journal = self.journal.offset(x0, y0)
+        self._chunks[key] = world
+        # догоняем рост за время, пока чанк был выгружен
+        world.advance(self.sim_time - world.sim_time)
+        world.sim_time = self.sim_time
+
+    def _evict(self, key):
+        world = self._chunks.pop(key)
+        if key in self._modified:
+            self._modified.discard(key)
+            self._executor.submit(self.store.save, key[0], key[1], world)
+
+    @property
+    def loaded_chunks(self) -> int:
+        return len(self._chunks)
+
+    def close(self):
+        """Сбрасывает изменённые чанки в хранилище и останавливает фоновый поток.
+
+        Временное хранилище (мир создан без store_dir) удаляется целиком.
+        """
+        # ещё не начатые генерация и загрузка не нужны: чанки всё равно выбросим
+        for future in self._pending.values():
+            future.cancel()
+        self._pending.clear()
+        if self._temp_dir is None:
+            for key in list(self._modified):
+                self._evict(key)
+        self._executor.shutdown(wait=True)
+        if self._temp_dir is not None:
+            shutil.rmtree(self._temp_dir, ignore_errors=True)
+
+    # --- доступ к тайлам ---
+
+    def spawn_point(self):
+        half = self.chunk_px / 2
+        return half, half
+
+    def _locate(self, x: int, y: int):
+        """(World чанка, локальные x, y); World = None, если чанк не загружен."""
+        n = self.chunk_tiles
+        cx, cy = x // n, y // n
+        return self._chunks.get((cx, cy)), x - cx * n, y - cy * n
+
+    def in_bounds(self, x: int, y: int) -> bool:
+        return self.chunk_of(x, y) in self._chunks
+
+    def get_tile(self, x: int, y: int):
+        world, lx, ly = self._locate(x, y)
+        return None if world is None else world.grid.get(lx, ly)
+
+    def count_tiles(self, state=None, crop_type=None, ground_type=None) -> int:
+        """Как World.count_tiles, но только по загруженным чанкам."""
+        return sum(w.count_tiles(state, crop_type, ground_type) for w in self._chunks.values())
+
+    def find_tiles(self, state=None, crop_type=None, ground_type=None):
+        n = self.chunk_tiles
+        result = []
+        for (cx, cy), world in self._chunks.items():
+            result.extend(
+                (cx * n + x, cy * n + y)
+                for x, y in world.find_tiles(state, crop_type, ground_type)
+            )
+        return result
+
+    # --- уведомления об изменениях ---
+
+    def add_tile_listener(self, callback, area_callback=None):
+        """Как World.add_tile_listener, координаты глобальные."""
+        self._tile_listeners.append((callback, area_callback))
+
+    def _tile_changed(self, x: int, y: int):
+        for callback, _ in self._tile_listeners:
+            callback(x, y)
+
+    def _area_changed(self, x0: int, y0: int, x1: int, y1: int):
+        for callback, area_callback in self._tile_listeners:
+            if area_callback is not None:
+                area_callback(x0, y0, x1, y1)
+                continue
+            for y in range(y0, y1):
+                for x in range(x0, x1):
+                    callback(x, y)
+
+    # --- логика грядок и роста ---
+
+    def can_dig(self, x: int, y: int) -> bool:
+        world, lx, ly = self._locate(x, y)
+        return world is not None and world.can_dig(lx, ly)
+
+    def dig(self, x: int, y: int) -> bool:
+        world, lx, ly = self._locate(x, y)
+        return world is not None and world.dig(lx, ly)
+
+    def can_plant(self, x: int, y: int, crop_type: str, inventory) -> bool:
+        world, lx, ly = self._locate(x, y)
+        return world is not None and world.can_plant(lx, ly, crop_type, inventory)
+
+    def plant(self, x: int, y: int, crop_type: str, inventory) -> bool:
+        world, lx, ly = self._locate(x, y)
+        return world is not None and world.plant(lx, ly, crop_type, inventory)
+
+    def can_harvest(self, x: int, y: int) -> bool:
+        world, lx, ly = self._locate(x, y)
+        return world is not None and world.can_harvest(lx, ly)
+
+    def harvest(self, x: int, y: int, inventory) -> bool:
+        world, lx, ly = self._locate(x, y)
+        return world is not None and world.harvest(lx, ly, inventory)
+
+    def growth_timer(self, x: int, y: int) -> float:
+        world, lx, ly = self._locate(x, y)
+        return 0.0 if world is None else world.growth_timer(lx, ly)
+
+    def _per_chunk(self, x0, y0, x1, y1, mask, operation) -> int:
+        """Разрезает прямоугольник по загруженным чанкам, operation(world, lx0, ly0, lx1, ly1, mask)."""
+        n = self.chunk_tiles
+        total = 0
+        for cy in range(y0 // n, (y1 - 1) // n + 1):
+            for cx in range(x0 // n, (x1 - 1) // n + 1):
+                world = self._chunks.get((cx, cy))
+                if world is None:
+                    continue
+                ox, oy = cx * n, cy * n
+                sx0, sy0 = max(x0, ox), max(y0, oy)
+                sx1, sy1 = min(x1, ox + n), min(y1, oy + n)
+                part = None if mask is None else mask[sy0 - y0:sy1 - y0, sx0 - x0:sx1 - x0]
+                total += operation(world, sx0 - ox, sy0 - oy, sx1 - ox, sy1 - oy, part)
+        return total
+
+    def count_area(self, action: str, x0: int, y0: int, x1: int, y1: int, mask=None) -> int:
+        return self._per_chunk(x0, y0, x1, y1, mask,
+                               lambda w, *area: w.count_area(action, *area))
+
+    def dig_area(self, x0: int, y0: int, x1: int, y1: int, mask=None) -> int:
+        return self._per_chunk(x0, y0, x1, y1, mask, lambda w, *area: w.dig_area(*area))
+
+    def plant_area(self, x0: int, y0: int, x1: int, y1: int, crop_type: str, inventory,
+                   mask=None) -> int:
+        return self._per_chunk(
+            x0, y0, x1, y1, mask,
+            lambda w, ax0, ay0, ax1, ay1, part: w.plant_area(ax0, ay0, ax1, ay1, crop_type,
+                                                             inventory, part),
+        )
+
+    def harvest_area(self, x0: int, y0: int, x1: int, y1: int, inventory, mask=None) -> int:
+        return self._per_chunk(
+            x0, y0, x1, y1, mask,
+            lambda w, ax0, ay0, ax1, ay1, part: w.harvest_area(ax0, ay0, ax1, ay1, inventory, part),
+        )
+
+    def update(self, dt: float):
+        # растут только загруженные чанки
+        self.sim_time += dt
+        self.journal.begin_tick()
+        for world in self._chunks.values():
+            world.update(dt)
+
+    def advance(self, seconds: float):
+        if seconds <= 0:
+            return
+        self.sim_time += seconds
+        self.journal.begin_tick()
+        for world in self._chunks.values():
+            world.advance(seconds)